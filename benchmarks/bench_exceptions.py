@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for the error path: converting httpx errors to areq exceptions.
+
+Reports, per error class, the cost of finding the converter by walking
+``mapper`` with isinstance (the previous dispatch) against the cached
+per-class lookup, the cost of a full conversion, and the extra cost of
+touching ``.request``/``.response``. The last row measures failed requests
+per second through a Session over an httpx.MockTransport that refuses every
+connection.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_exceptions.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+import areq
+from areq import exceptions
+
+REQUEST = httpx.Request("GET", "https://example.com/bench", headers={"x-a": "1"})
+RESPONSE = httpx.Response(503, content=b"x" * 1024, request=REQUEST)
+ERRORS = {
+    "HTTPStatusError": httpx.HTTPStatusError("503", request=REQUEST, response=RESPONSE),
+    "ConnectError": httpx.ConnectError("refused", request=REQUEST),
+    "ReadTimeout": httpx.ReadTimeout("timed out", request=REQUEST),
+    "RemoteProtocolError": httpx.RemoteProtocolError("closed", request=REQUEST),
+    "InvalidURL": httpx.InvalidURL("bad url"),
+}
+
+
+def linear_lookup(error):
+    for error_type, converter in exceptions.mapper.items():
+        if isinstance(error, error_type):
+            return converter
+    return areq.AreqException
+
+
+def per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def touch(error):
+    converted = areq.convert_httpx_to_areq_exception(error)
+    converted.request, converted.response
+
+
+async def failed_requests_per_second(iterations: int) -> float:
+    def refuse(request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    async with areq.Session(transport=httpx.MockTransport(refuse)) as session:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            try:
+                await session.get("http://bench.local/")
+            except areq.AreqConnectionError:
+                pass
+        return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    print(
+        f"{'error':>20} {'linear us':>10} {'cached us':>10} "
+        f"{'convert us':>11} {'+wrappers us':>13}"
+    )
+    for name, error in ERRORS.items():
+        error_type = type(error)
+        linear = per_call(lambda: linear_lookup(error), n)
+        cached = per_call(lambda: exceptions._converter_for(error_type), n)
+        convert = per_call(lambda: areq.convert_httpx_to_areq_exception(error), n)
+        wrapped = per_call(lambda: touch(error), n)
+        print(
+            f"{name:>20} {linear * 1e6:>10.3f} {cached * 1e6:>10.3f} "
+            f"{convert * 1e6:>11.2f} {wrapped * 1e6:>13.2f}"
+        )
+
+    rate = asyncio.run(failed_requests_per_second(min(n, 5000)))
+    print(f"\nSession over a refusing transport: {rate:,.0f} failed requests/s")
+
+
+if __name__ == "__main__":
+    main()
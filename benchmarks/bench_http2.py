@@ -0,0 +1,71 @@
+"""
+Compares an HTTP/1.1 connection pool with HTTP/2 multiplexing.
+
+Fires many concurrent requests at a slow endpoint of the local benchmark server
+and reports throughput, latency and how many TCP connections each mode opened.
+Requires the ``h2`` package.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_http2.py [--requests N] [--delay-ms N]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import areq
+from server import BenchmarkServer
+
+
+async def run(session: areq.Session, url: str, count: int) -> dict:
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        response = await session.get(url)
+        latencies.append(time.perf_counter() - start)
+        return response.http_version
+
+    start = time.perf_counter()
+    versions = await asyncio.gather(*[one() for _ in range(count)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "http_version": sorted(set(versions)),
+        "requests_per_second": round(count / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def main(args):
+    results = {}
+    with BenchmarkServer() as server:
+        url = f"{server.url}/delay?ms={args.delay_ms}"
+        modes = {
+            "h1_pool": areq.Session(
+                max_connections=args.h1_connections,
+                max_keepalive_connections=args.h1_connections,
+            ),
+            # Cleartext HTTP/2 with prior knowledge; over https the protocol is
+            # negotiated with ALPN and http2=True alone is enough.
+            "h2_multiplexed": areq.Session(http2=True, http1=False),
+        }
+        for name, session in modes.items():
+            async with session:
+                await run(session, url, 10)  # warm up the pool
+                before = server.connections
+                result = await run(session, url, args.requests)
+                result["tcp_connections"] = server.connections - before
+                results[name] = result
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--delay-ms", type=int, default=20)
+    parser.add_argument("--h1-connections", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
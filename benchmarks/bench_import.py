@@ -0,0 +1,62 @@
+"""
+Startup benchmark: the cold-start cost of ``import areq``.
+
+Every sample runs in a fresh interpreter. Reports the median wall time of the
+import statement alone, and of the import plus the first touch of the public
+API (which loads httpx and requests), against importing httpx and requests
+directly. Pass --importtime to print the ``python -X importtime`` breakdown of
+``import areq``.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_import.py [--samples N] [--importtime]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    "import areq": "import areq",
+    "import areq; areq.Session": "import areq; areq.Session",
+    "import httpx": "import httpx",
+    "import requests": "import requests",
+}
+TIMER = "import time; _t = time.perf_counter(); {code}; print(time.perf_counter() - _t)"
+
+
+def sample(code: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(code=code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'case':>28} {'median ms':>10} {'min ms':>8}")
+    for name, code in CASES.items():
+        times = [sample(code) for _ in range(args.samples)]
+        print(
+            f"{name:>28} {statistics.median(times) * 1000:>10.2f} {min(times) * 1000:>8.2f}"
+        )
+
+    if args.importtime:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import areq"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        print(result.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark for JSON decoding of response bodies.
+
+For a small document and multi-MB ones, reports the time to parse with
+requests.Response.json (text decoding plus stdlib json) and AreqResponse.json
+(straight from bytes, orjson when installed). The stall columns are the
+longest event-loop iteration observed while a parse runs next to a ticking
+coroutine, which is what other requests on the loop feel: inline, in a thread
+and in a process pool through AreqResponse.ajson(executor=...). Parsers hold
+the GIL, so only free-threaded builds see the thread column drop.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_json.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import httpx
+
+import areq
+from areq import models
+
+REQUEST = httpx.Request("GET", "https://example.com/bench.json")
+
+
+def document(items: int) -> bytes:
+    rows = [
+        {
+            "id": i,
+            "name": f"item {i}",
+            "price": i * 1.25,
+            "tags": ["a", "b"],
+            "ok": True,
+        }
+        for i in range(items)
+    ]
+    return json.dumps({"items": rows}).encode()
+
+
+DOCUMENTS = {
+    "small (200 B)": json.dumps(
+        {"id": 1, "title": "areq", "tags": ["a", "b", "c"]}
+    ).encode(),
+    "1 MB": document(12_000),
+    "8 MB": document(100_000),
+}
+
+
+def response(content: bytes) -> areq.AreqResponse:
+    return areq.AreqResponse(httpx.Response(200, content=content, request=REQUEST))
+
+
+def per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+async def max_stall(parse) -> float:
+    """Longest gap between loop iterations while ``parse()`` is awaited."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            worst = max(worst, now - last)
+            last = now
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    await parse()
+    done = True
+    await task
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    print(f"orjson: {'yes' if models.orjson is not None else 'no (stdlib json)'}")
+    print(
+        f"{'document':>14} {'requests ms':>12} {'json() ms':>10} "
+        f"{'stall inline ms':>16} {'stall thread ms':>16} {'stall process ms':>17}"
+    )
+    threads = ThreadPoolExecutor(1)
+    processes = ProcessPoolExecutor(1)
+    processes.submit(int).result()  # Start the worker outside the measurements.
+    for name, content in DOCUMENTS.items():
+        iterations = args.iterations * (1000 if len(content) < 1024 else 1)
+        r = response(content)
+        baseline = per_call(lambda: super(areq.AreqResponse, r).json(), iterations)
+        fast = per_call(r.json, iterations)
+
+        async def inline():
+            r.json()
+
+        stalls = [
+            asyncio.run(max_stall(parse))
+            for parse in (
+                inline,
+                lambda: r.ajson(executor=threads),
+                lambda: r.ajson(executor=processes),
+            )
+        ]
+        print(
+            f"{name:>14} {baseline * 1e3:>12.3f} {fast * 1e3:>10.3f} "
+            + " ".join(f"{stall * 1e3:>16.2f}" for stall in stalls)
+        )
+    threads.shutdown()
+    processes.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Throughput of a Session answering from a recorded cassette.
+
+Records a handful of exchanges against the local benchmark server, then
+replays them through areq.ReplayTransport with no network, sequentially and
+with concurrent callers, and optionally with the recorded latency.
+
+Usage:
+    cd benchmarks
+    PYTHONPATH=../src python bench_replay.py [--requests N] [--latency X]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import areq
+from server import BenchmarkServer
+
+ROUTES = ["/json", "/bytes?size=4096", "/headers?count=20", "/status/404"]
+
+
+async def record(base_url: str, path: Path) -> None:
+    async with areq.Session(transport=areq.RecordingTransport(path)) as session:
+        for route in ROUTES:
+            await session.get(base_url + route)
+
+
+async def replay(
+    base_url: str, path: Path, requests: int, concurrency: int, latency: float
+) -> float:
+    transport = areq.ReplayTransport(path, latency=latency)
+    urls = [base_url + ROUTES[i % len(ROUTES)] for i in range(requests)]
+    async with areq.Session(transport=transport) as session:
+        start = time.perf_counter()
+        if concurrency == 1:
+            for url in urls:
+                await session.get(url)
+        else:
+            await areq.map(urls, concurrency=concurrency, session=session)
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.jsonl.gz"
+        with BenchmarkServer() as server:
+            asyncio.run(record(server.url, path))
+        # The server is gone: everything below is answered from the cassette.
+        for concurrency in (1, 100):
+            rate = asyncio.run(
+                replay(server.url, path, args.requests, concurrency, args.latency)
+            )
+            print(f"concurrency {concurrency:>4}: {rate:>10,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for AreqResponse construction.
+
+Measures the time and the memory allocated to wrap an already-read
+httpx.Response in an AreqResponse, which every areq call pays once.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_response.py [--iterations N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import httpx
+
+import areq
+
+BODY_SIZES = [0, 1024, 64 * 1024, 1024 * 1024]
+HEADER_COUNT = 20
+
+
+def make_httpx_response(body_size: int) -> httpx.Response:
+    headers = {f"x-header-{i}": f"value-{i}" for i in range(HEADER_COUNT)}
+    headers["content-type"] = "application/octet-stream"
+    return httpx.Response(
+        status_code=200,
+        content=b"x" * body_size,
+        headers=headers,
+        request=httpx.Request("GET", "https://example.com/bench"),
+    )
+
+
+def time_construction(httpx_response: httpx.Response, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        areq.AreqResponse(httpx_response)
+    return (time.perf_counter() - start) / iterations
+
+
+def allocated_bytes(httpx_response: httpx.Response, iterations: int) -> float:
+    responses = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(iterations):
+        responses.append(areq.AreqResponse(httpx_response))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    total = sum(stat.size_diff for stat in stats)
+    return total / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'body':>10} {'us/response':>12} {'bytes/response':>15}")
+    for body_size in BODY_SIZES:
+        httpx_response = make_httpx_response(body_size)
+        per_call = time_construction(httpx_response, args.iterations)
+        per_alloc = allocated_bytes(httpx_response, min(args.iterations, 2000))
+        print(f"{body_size:>10} {per_call * 1e6:>12.2f} {per_alloc:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
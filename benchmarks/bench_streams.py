@@ -0,0 +1,111 @@
+"""
+Benchmark for the NDJSON and Server-Sent Events parsers.
+
+Feeds a body in small chunks, as a slow network would, and compares
+AreqResponse.iter_ndjson() and areq.eventsource.iter_events() with what they
+replace: buffering the whole body and splitting the text, and iter_lines()
+(decode_unicode=True) followed by json.loads() per line.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_streams.py [--records N] [--chunk-size N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+import areq
+from areq.eventsource import iter_events
+
+REQUEST = httpx.Request("GET", "https://example.com/stream")
+
+
+def response(body: bytes, chunk_size: int) -> areq.AreqResponse:
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    httpx_response = httpx.Response(200, stream=httpx.ByteStream(b""), request=REQUEST)
+    httpx_response.stream = _ChunkStream(chunks)
+    return areq.AreqResponse(httpx_response)
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+async def ndjson_buffered(r: areq.AreqResponse) -> int:
+    text = (await r.aread()).decode()
+    return len([json.loads(line) for line in text.splitlines() if line])
+
+
+async def ndjson_iter_lines(r: areq.AreqResponse) -> int:
+    count = 0
+    async for line in r.iter_lines(decode_unicode=True):
+        if line:
+            json.loads(line)
+            count += 1
+    return count
+
+
+async def ndjson_parser(r: areq.AreqResponse) -> int:
+    return len([record async for record in r.iter_ndjson()])
+
+
+async def sse_buffered(r: areq.AreqResponse) -> int:
+    text = (await r.aread()).decode()
+    return len([block for block in text.split("\n\n") if block])
+
+
+async def sse_parser(r: areq.AreqResponse) -> int:
+    return len([event async for event in iter_events(r)])
+
+
+def measure(parse, body: bytes, chunk_size: int, repeat: int) -> float:
+    """Best of ``repeat`` runs, in seconds."""
+
+    async def run_once() -> float:
+        r = response(body, chunk_size)
+        start = time.perf_counter()
+        await parse(r)
+        return time.perf_counter() - start
+
+    return min(asyncio.run(run_once()) for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = [
+        {"id": i, "name": f"record {i}", "tags": ["a", "b"]}
+        for i in range(args.records)
+    ]
+    ndjson = "".join(json.dumps(record) + "\n" for record in records).encode()
+    events = "".join(
+        f"id: {i}\nevent: update\ndata: {json.dumps(record)}\n\n"
+        for i, record in enumerate(records)
+    ).encode()
+    print(f"{args.records} records, {args.chunk_size} byte chunks")
+    for name, parse, body in (
+        ("ndjson buffered + splitlines", ndjson_buffered, ndjson),
+        ("ndjson iter_lines + json.loads", ndjson_iter_lines, ndjson),
+        ("ndjson iter_ndjson()", ndjson_parser, ndjson),
+        ("sse buffered + split (no fields)", sse_buffered, events),
+        ("sse iter_events()", sse_parser, events),
+    ):
+        print(
+            f"{name:>34}: {measure(parse, body, args.chunk_size, args.repeat) * 1e3:>9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Offline benchmark suite comparing areq with httpx and requests.
+
+Every client runs every scenario against the local benchmark server (or, with
+--mock, an in-process httpx.MockTransport that isolates client overhead). Each
+(client, scenario) case runs in a fresh process so peak RSS is attributable to
+that case alone. Results are printed, and written as JSON for regression
+tracking with --output.
+
+Clients:
+    areq.get             module-level function over the shared default session
+    areq.Session         explicit pooled session
+    httpx+areq_response  reused httpx.AsyncClient wrapped by create_areq_response
+    httpx                reused httpx.AsyncClient, raw responses
+    requests             requests.Session (synchronous, always sequential)
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_suite.py [--requests N]
+        [--concurrency N] [--mock] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+
+import httpx
+import requests
+
+import areq
+from server import BenchmarkServer, handle
+
+CLIENTS = ["areq.get", "areq.Session", "httpx+areq_response", "httpx", "requests"]
+# Clients that cannot be pointed at a MockTransport.
+NETWORK_ONLY_CLIENTS = {"areq.get", "requests"}
+SCENARIOS = {
+    "small_json": "/json",
+    "large_body": "/bytes?size=1048576",
+    "many_headers": "/headers?count=100",
+    "http_error": "/status/500",
+    "connection_error": None,
+}
+ERRORS = (areq.AreqException, httpx.HTTPError, requests.RequestException)
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+async def _mock_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.port == 1:
+        raise httpx.ConnectError("Connection refused", request=request)
+    status, headers, body = await handle(request.method, request.url.raw_path.decode())
+    return httpx.Response(status, headers=headers, content=body)
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, int(len(sorted_values) * fraction) - 1))
+    return sorted_values[index]
+
+
+def _make_async_fetch(client_name: str, mock: bool):
+    transport = httpx.MockTransport(_mock_handler) if mock else None
+    if client_name == "areq.get":
+        return areq.get, None
+    if client_name == "areq.Session":
+        session = areq.Session(transport=transport)
+        return session.get, session.close
+    client = httpx.AsyncClient(transport=transport)
+    if client_name == "httpx":
+        return client.get, client.aclose
+
+    async def fetch(url):
+        return areq.create_areq_response(await client.get(url))
+
+    return fetch, client.aclose
+
+
+async def _run_async(client_name: str, url: str, args) -> dict:
+    fetch, close = _make_async_fetch(client_name, args.mock)
+
+    async def call():
+        try:
+            await fetch(url)
+        except ERRORS:
+            pass
+
+    for _ in range(args.warmup):
+        await call()
+
+    latencies: list[float] = []
+
+    async def worker(count: int):
+        for _ in range(count):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    per_worker = args.requests // args.concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(per_worker) for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(args.alloc_requests):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await call()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    if close is not None:
+        await close()
+    return _summary(latencies, elapsed, allocated / args.alloc_requests)
+
+
+def _run_requests(url: str, args) -> dict:
+    session = requests.Session()
+
+    def call():
+        try:
+            session.get(url)
+        except ERRORS:
+            pass
+
+    for _ in range(args.warmup):
+        call()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        call_start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(args.alloc_requests):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    session.close()
+    return _summary(latencies, elapsed, allocated / args.alloc_requests)
+
+
+def _summary(latencies: list[float], elapsed: float, allocated: float) -> dict:
+    latencies.sort()
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "alloc_bytes_per_request": round(allocated),
+    }
+
+
+def run_case(client_name: str, scenario: str, url: str, args) -> dict:
+    """Runs one (client, scenario) case. Called in a fresh process."""
+    if client_name == "requests":
+        result = _run_requests(url, args)
+    else:
+        result = asyncio.run(_run_async(client_name, url, args))
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_bytes = rss if sys.platform == "darwin" else rss * 1024
+    result["peak_rss_mb"] = round(rss_bytes / (1024 * 1024), 1)
+    return {"client": client_name, "scenario": scenario, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--alloc-requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--mock", action="store_true", help="use httpx.MockTransport")
+    parser.add_argument("--clients", nargs="+", default=CLIENTS, choices=CLIENTS)
+    parser.add_argument(
+        "--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS)
+    )
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    clients = [c for c in args.clients if not (args.mock and c in NETWORK_ONLY_CLIENTS)]
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with BenchmarkServer() as server:
+        for scenario in args.scenarios:
+            path = SCENARIOS[scenario]
+            if path is None:
+                url = "http://127.0.0.1:1/" if args.mock else _closed_port_url()
+            else:
+                url = ("http://bench.local" if args.mock else server.url) + path
+            for client_name in clients:
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_case, (client_name, scenario, url, args))
+                results.append(result)
+                print(
+                    f"{scenario:>16} {client_name:>20} "
+                    f"{result['requests_per_second']:>9.1f} req/s "
+                    f"p50 {result['p50_ms']:>8.3f} ms p99 {result['p99_ms']:>8.3f} ms "
+                    f"{result['alloc_bytes_per_request']:>9} B/req "
+                    f"{result['peak_rss_mb']:>6.1f} MB",
+                    file=sys.stderr,
+                )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "httpx": httpx.__version__,
+            "requests": requests.__version__,
+            "requests_per_case": args.requests,
+            "concurrency": args.concurrency,
+            "mock_transport": args.mock,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
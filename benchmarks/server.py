@@ -0,0 +1,224 @@
+"""
+Local HTTP server used by the benchmarks instead of live endpoints.
+
+Speaks HTTP/1.1 (through h11) and cleartext HTTP/2 with prior knowledge
+(through h2, when installed) on the same port, and counts the TCP connections
+it accepts so benchmarks can report how many sockets a client opened.
+
+Routes:
+    /json                small JSON document
+    /bytes?size=N        N bytes of body
+    /headers?count=N     N extra response headers
+    /status/CODE         empty response with the given status
+    /delay?ms=N          small JSON document after N milliseconds
+"""
+
+import asyncio
+import json
+import multiprocessing
+from urllib.parse import parse_qs, urlsplit
+
+import h11
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:  # pragma: no cover - h2 is optional
+    h2 = None
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+SMALL_JSON = json.dumps({"id": 1, "title": "areq", "tags": ["a", "b", "c"]}).encode()
+
+
+async def handle(method: str, target: str) -> tuple[int, list[tuple[str, str]], bytes]:
+    """Returns (status, headers, body) for a request."""
+    parts = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    path = parts.path
+    headers = [("content-type", "application/json")]
+    if path == "/json":
+        return 200, headers, SMALL_JSON
+    if path == "/bytes":
+        size = int(query.get("size", 1024))
+        return 200, [("content-type", "application/octet-stream")], b"x" * size
+    if path == "/headers":
+        count = int(query.get("count", 50))
+        extra = [(f"x-bench-{i}", f"value-{i}") for i in range(count)]
+        return 200, headers + extra, SMALL_JSON
+    if path.startswith("/status/"):
+        return int(path.rsplit("/", 1)[1]), [], b""
+    if path == "/delay":
+        await asyncio.sleep(int(query.get("ms", 10)) / 1000)
+        return 200, headers, SMALL_JSON
+    return 404, [], b""
+
+
+class BenchmarkServer:
+    """
+    Runs the server in a child process, so that it neither competes for the GIL
+    with the client being measured nor shows up in its memory statistics.
+
+    Usage:
+        with BenchmarkServer() as server:
+            url = server.url + "/json"
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        context = multiprocessing.get_context("spawn")
+        self._connections = context.Value("i", 0)
+        self._ready = context.Queue()
+        self._process = context.Process(
+            target=_run, args=(host, port, self._connections, self._ready), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def connections(self) -> int:
+        """Number of TCP connections accepted so far."""
+        return self._connections.value
+
+    def __enter__(self) -> "BenchmarkServer":
+        self._process.start()
+        self.port = self._ready.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+def _run(host: str, port: int, connections, ready) -> None:
+    async def serve():
+        server = await asyncio.start_server(
+            _Server(connections).on_connection, host, port
+        )
+        ready.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+class _Server:
+    def __init__(self, connections):
+        self.connections = connections
+
+    async def on_connection(self, reader, writer) -> None:
+        with self.connections.get_lock():
+            self.connections.value += 1
+        try:
+            first = await reader.read(len(H2_PREFACE))
+            if first == H2_PREFACE and h2 is not None:
+                await self._serve_h2(reader, writer, first)
+            else:
+                await self._serve_h11(reader, writer, first)
+        except (ConnectionError, h11.RemoteProtocolError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_h11(self, reader, writer, data: bytes) -> None:
+        connection = h11.Connection(h11.SERVER)
+        connection.receive_data(data)
+        request = None
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                connection.receive_data(await reader.read(65536))
+            elif isinstance(event, h11.Request):
+                request = event
+            elif isinstance(event, h11.EndOfMessage):
+                status, headers, body = await handle(
+                    request.method.decode(), request.target.decode()
+                )
+                headers = headers + [("content-length", str(len(body)))]
+                # One write per response: separate small writes stall on
+                # Nagle's algorithm and delayed ACKs.
+                writer.write(
+                    connection.send(h11.Response(status_code=status, headers=headers))
+                    + connection.send(h11.Data(data=body))
+                    + connection.send(h11.EndOfMessage())
+                )
+                await writer.drain()
+                if connection.our_state is h11.MUST_CLOSE:
+                    return
+                connection.start_next_cycle()
+            elif isinstance(event, h11.ConnectionClosed) or event is h11.PAUSED:
+                return
+
+    async def _serve_h2(self, reader, writer, data: bytes) -> None:
+        connection = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False)
+        )
+        connection.initiate_connection()
+        requests: dict[int, list] = {}
+        pending: dict[int, bytes] = {}
+        responders: set[asyncio.Task] = set()
+
+        def flush() -> None:
+            for stream_id in list(pending):
+                body = pending[stream_id]
+                window = min(
+                    connection.local_flow_control_window(stream_id),
+                    connection.max_outbound_frame_size,
+                )
+                while body and window > 0:
+                    chunk, body = body[:window], body[window:]
+                    connection.send_data(stream_id, chunk)
+                    window = min(
+                        connection.local_flow_control_window(stream_id),
+                        connection.max_outbound_frame_size,
+                    )
+                if body:
+                    pending[stream_id] = body
+                else:
+                    connection.end_stream(stream_id)
+                    del pending[stream_id]
+            writer.write(connection.data_to_send())
+
+        async def respond(stream_id: int, headers) -> None:
+            headers = dict(headers)
+            status, response_headers, body = await handle(
+                headers[b":method"].decode(), headers[b":path"].decode()
+            )
+            connection.send_headers(
+                stream_id,
+                [(":status", str(status)), ("content-length", str(len(body)))]
+                + response_headers,
+                end_stream=not body,
+            )
+            if body:
+                pending[stream_id] = body
+            flush()
+            await writer.drain()
+
+        def start(stream_id: int) -> None:
+            task = asyncio.ensure_future(respond(stream_id, requests.pop(stream_id)))
+            responders.add(task)
+            task.add_done_callback(responders.discard)
+
+        while data:
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    requests[event.stream_id] = event.headers
+                    if event.stream_ended:
+                        start(event.stream_id)
+                elif isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    if event.stream_id in requests:
+                        start(event.stream_id)
+                elif isinstance(event, h2.events.StreamReset):
+                    pending.pop(event.stream_id, None)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            flush()
+            await writer.drain()
+            data = await reader.read(65536)
@@ -1,21 +1,207 @@
-from .api import delete, get, head, options, patch, post, put, request
-from .exceptions import (
-    AreqConnectionError,
-    AreqConnectTimeout,
-    AreqContentDecodingError,
-    AreqException,
-    AreqHTTPError,
-    AreqInvalidURL,
-    AreqMissingSchema,
-    AreqProxyError,
-    AreqReadTimeout,
-    AreqSSLError,
-    AreqTimeout,
-    AreqTooManyRedirects,
-    convert_httpx_to_areq_exception,
-    is_error_type,
+"""
+Asynchronous, requests-compatible HTTP client built on httpx.
+
+The public names below are imported on first use, so ``import areq`` stays
+cheap: httpx, requests and urllib3 are only loaded when a request is made or a
+class is touched.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .api import (
+        aclose,
+        delete,
+        get,
+        get_default_session,
+        head,
+        options,
+        patch,
+        post,
+        put,
+        request,
+        warm_up,
+    )
+    from .batch import as_completed, map
+    from .cache import (
+        BaseCacheBackend,
+        CacheEntry,
+        CacheStats,
+        HTTPCache,
+        MemoryCacheBackend,
+        SQLiteCacheBackend,
+    )
+    from .circuit import CircuitBreaker
+    from .coalesce import RequestCoalescer
+    from .deadlines import Deadline, current_deadline, deadline
+    from .dns import AiodnsResolver, BaseResolver, DNSAnswer, DNSCache, SystemResolver
+    from .downloads import DownloadResult, download
+    from .eventsource import ServerSentEvent, sse
+    from .exceptions import (
+        AreqCircuitOpen,
+        AreqConnectionError,
+        AreqConnectTimeout,
+        AreqContentDecodingError,
+        AreqContentTooLarge,
+        AreqDeadlineExceeded,
+        AreqException,
+        AreqHTTPError,
+        AreqInvalidURL,
+        AreqMissingSchema,
+        AreqProxyError,
+        AreqReadTimeout,
+        AreqSSLError,
+        AreqTimeout,
+        AreqTooManyRedirects,
+        convert_httpx_to_areq_exception,
+        is_error_type,
+    )
+    from .hedge import Hedge
+    from .hooks import (
+        CONNECTION_ACQUIRED,
+        EXCEPTION,
+        HEADERS_RECEIVED,
+        HOOK_EVENTS,
+        REQUEST_START,
+        RESPONSE_COMPLETE,
+        RequestEvent,
+        RequestTimings,
+    )
+    from .metrics import MetricsCollector
+    from .models import (
+        AreqRequest,
+        AreqResponse,
+        create_areq_request,
+        create_areq_response,
+    )
+    from .pool import OriginPoolStats, PoolStats
+    from .ratelimit import RateLimiter, TokenBucket
+    from .replay import Cassette, Exchange, RecordingTransport, ReplayTransport
+    from .retry import Retry, RetryBudget
+    from .sessions import Session
+
+# Public name -> submodule that defines it.
+_LAZY_ATTRIBUTES = {
+    "aclose": "api",
+    "delete": "api",
+    "get": "api",
+    "get_default_session": "api",
+    "head": "api",
+    "options": "api",
+    "patch": "api",
+    "post": "api",
+    "put": "api",
+    "request": "api",
+    "warm_up": "api",
+    "as_completed": "batch",
+    "map": "batch",
+    "BaseCacheBackend": "cache",
+    "CacheEntry": "cache",
+    "CacheStats": "cache",
+    "HTTPCache": "cache",
+    "MemoryCacheBackend": "cache",
+    "SQLiteCacheBackend": "cache",
+    "CircuitBreaker": "circuit",
+    "RequestCoalescer": "coalesce",
+    "Deadline": "deadlines",
+    "current_deadline": "deadlines",
+    "deadline": "deadlines",
+    "AiodnsResolver": "dns",
+    "BaseResolver": "dns",
+    "DNSAnswer": "dns",
+    "DNSCache": "dns",
+    "SystemResolver": "dns",
+    "DownloadResult": "downloads",
+    "download": "downloads",
+    "ServerSentEvent": "eventsource",
+    "sse": "eventsource",
+    "AreqCircuitOpen": "exceptions",
+    "AreqConnectionError": "exceptions",
+    "AreqConnectTimeout": "exceptions",
+    "AreqContentDecodingError": "exceptions",
+    "AreqContentTooLarge": "exceptions",
+    "AreqDeadlineExceeded": "exceptions",
+    "AreqException": "exceptions",
+    "AreqHTTPError": "exceptions",
+    "AreqInvalidURL": "exceptions",
+    "AreqMissingSchema": "exceptions",
+    "AreqProxyError": "exceptions",
+    "AreqReadTimeout": "exceptions",
+    "AreqSSLError": "exceptions",
+    "AreqTimeout": "exceptions",
+    "AreqTooManyRedirects": "exceptions",
+    "convert_httpx_to_areq_exception": "exceptions",
+    "is_error_type": "exceptions",
+    "Hedge": "hedge",
+    "CONNECTION_ACQUIRED": "hooks",
+    "EXCEPTION": "hooks",
+    "HEADERS_RECEIVED": "hooks",
+    "HOOK_EVENTS": "hooks",
+    "REQUEST_START": "hooks",
+    "RESPONSE_COMPLETE": "hooks",
+    "RequestEvent": "hooks",
+    "RequestTimings": "hooks",
+    "MetricsCollector": "metrics",
+    "AreqRequest": "models",
+    "AreqResponse": "models",
+    "create_areq_request": "models",
+    "create_areq_response": "models",
+    "OriginPoolStats": "pool",
+    "PoolStats": "pool",
+    "RateLimiter": "ratelimit",
+    "TokenBucket": "ratelimit",
+    "Cassette": "replay",
+    "Exchange": "replay",
+    "RecordingTransport": "replay",
+    "ReplayTransport": "replay",
+    "Retry": "retry",
+    "RetryBudget": "retry",
+    "Session": "sessions",
+}
+_SUBMODULES = frozenset(
+    [
+        "api",
+        "batch",
+        "cache",
+        "circuit",
+        "coalesce",
+        "deadlines",
+        "dns",
+        "downloads",
+        "eventsource",
+        "exceptions",
+        "hedge",
+        "hooks",
+        "metrics",
+        "models",
+        "pool",
+        "ratelimit",
+        "replay",
+        "retry",
+        "sessions",
+        "sync",
+        "uploads",
+    ]
 )
-from .models import AreqRequest, AreqResponse, create_areq_request, create_areq_response
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache it, so the next lookup does not go through __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
+
 
 __all__ = [
     "get",
@@ -26,6 +212,52 @@ __all__ = [
     "patch",
     "delete",
     "request",
+    "Session",
+    "get_default_session",
+    "aclose",
+    "warm_up",
+    "PoolStats",
+    "OriginPoolStats",
+    "map",
+    "as_completed",
+    "download",
+    "DownloadResult",
+    "sse",
+    "ServerSentEvent",
+    "Retry",
+    "RetryBudget",
+    "RateLimiter",
+    "TokenBucket",
+    "CircuitBreaker",
+    "Hedge",
+    "deadline",
+    "Deadline",
+    "current_deadline",
+    "DNSCache",
+    "DNSAnswer",
+    "BaseResolver",
+    "SystemResolver",
+    "AiodnsResolver",
+    "Cassette",
+    "Exchange",
+    "RecordingTransport",
+    "ReplayTransport",
+    "HTTPCache",
+    "CacheStats",
+    "CacheEntry",
+    "BaseCacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "RequestCoalescer",
+    "HOOK_EVENTS",
+    "REQUEST_START",
+    "CONNECTION_ACQUIRED",
+    "HEADERS_RECEIVED",
+    "RESPONSE_COMPLETE",
+    "EXCEPTION",
+    "RequestEvent",
+    "RequestTimings",
+    "MetricsCollector",
     "AreqResponse",
     "AreqRequest",
     "AreqException",
@@ -40,6 +272,9 @@ __all__ = [
     "AreqProxyError",
     "AreqSSLError",
     "AreqTooManyRedirects",
+    "AreqCircuitOpen",
+    "AreqContentTooLarge",
+    "AreqDeadlineExceeded",
     "create_areq_response",
     "create_areq_request",
     "is_error_type",
@@ -1,25 +1,97 @@
-from typing import Any
-
-from httpx import AsyncClient, HTTPError, InvalidURL
-from httpx import Response as HttpxResponse
+import asyncio
+import weakref
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Iterable, Optional
+
+from .dns import DNSCache, default_dns_cache
+from .models import AreqResponse
+from .sessions import Session
+
+# Shared sessions per running event loop, keyed by (http2, dns_cache). httpx
+# connections are bound to the loop that opened them, so a single global client
+# cannot be reused safely across separate asyncio.run() calls.
+_SessionKey = tuple[bool, Optional[DNSCache]]
+_default_sessions: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[_SessionKey, Session]
+] = weakref.WeakKeyDictionary()
+
+
+def _stateless_cookies() -> CookieJar:
+    # The module-level functions behave like requests.get & co: cookies set by
+    # one response must not leak into unrelated calls that share the pool.
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def get_default_session(
+    http2: bool = False, dns_cache: DNSCache | bool | None = None
+) -> Session:
+    """
+    Returns the shared Session used by the module-level functions, creating it
+    lazily on first use within the running event loop.
+
+    Args:
+        http2: Return the session that negotiates HTTP/2 (requires the ``h2``
+            package), where concurrent requests to one origin are multiplexed
+            over a single connection.
+        dns_cache: Return the session resolving hosts through this DNSCache.
+            True uses the shared default_dns_cache().
+    """
+    if dns_cache is True:
+        dns_cache = default_dns_cache()
+    key = (http2, dns_cache or None)
+    loop = asyncio.get_running_loop()
+    sessions = _default_sessions.get(loop)
+    if sessions is None:
+        sessions = _default_sessions[loop] = {}
+        _close_at_shutdown(loop)
+    session = sessions.get(key)
+    if session is None or session.is_closed:
+        session = Session(cookies=_stateless_cookies(), http2=http2, dns_cache=key[1])
+        sessions[key] = session
+    return session
+
+
+async def aclose() -> None:
+    """
+    Closes the default sessions of the running event loop, releasing their
+    connections. The next module-level call opens new ones.
+
+    Loops that stop through asyncio.run() (or anything else calling
+    loop.shutdown_asyncgens()) close their sessions themselves; call this
+    before stopping a loop by other means.
+    """
+    sessions = _default_sessions.pop(asyncio.get_running_loop(), {})
+    for session in sessions.values():
+        await session.close()
+
+
+def _close_at_shutdown(loop: asyncio.AbstractEventLoop) -> None:
+    # asyncio.run() shuts down async generators just before closing the loop,
+    # while it can still run the sessions' close().
+    shutdown_asyncgens = loop.shutdown_asyncgens
+
+    async def shutdown() -> None:
+        try:
+            await aclose()
+        finally:
+            await shutdown_asyncgens()
 
-from .exceptions import convert_httpx_to_areq_exception
-from .models import AreqResponse, create_areq_response
+    try:
+        loop.shutdown_asyncgens = shutdown  # type: ignore[method-assign]
+    except AttributeError:
+        pass  # Loop types without instance attributes rely on aclose().
 
 
-async def request(method: str, url: str, **kwargs: Any) -> AreqResponse:
-    async with AsyncClient() as client:
-        try:
-            if "allow_redirects" in kwargs:
-                kwargs["follow_redirects"] = True
-                del kwargs["allow_redirects"]
-            httpx_response: HttpxResponse = await client.request(method, url, **kwargs)
-        except (HTTPError, InvalidURL) as e:
-            raise convert_httpx_to_areq_exception(e)
-        assert httpx_response is not None  # httpx client.request() never returns None
-        response = create_areq_response(httpx_response)
-        assert response is not None  # create_areq_response never returns None
-        return response
+async def request(
+    method: str,
+    url: str,
+    *,
+    http2: bool = False,
+    dns_cache: DNSCache | bool | None = None,
+    **kwargs: Any,
+) -> AreqResponse:
+    session = get_default_session(http2=http2, dns_cache=dns_cache)
+    return await session.request(method, url, **kwargs)
 
 
 async def get(url, params=None, **kwargs):
@@ -49,3 +121,20 @@ async def patch(url, data=None, **kwargs):
 
 async def delete(url, **kwargs):
     return await request("delete", url, **kwargs)
+
+
+async def warm_up(
+    urls: str | Iterable[str],
+    connections: int = 1,
+    *,
+    http2: bool = False,
+    dns_cache: DNSCache | bool | None = None,
+    **kwargs: Any,
+) -> int:
+    """
+    Opens connections to the origins of ``urls`` in the default session, so
+    the first module-level requests after startup skip the handshakes. See
+    Session.warm_up().
+    """
+    session = get_default_session(http2=http2, dns_cache=dns_cache)
+    return await session.warm_up(urls, connections, **kwargs)
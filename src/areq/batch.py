@@ -0,0 +1,186 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
+
+from httpx import URL, InvalidURL
+
+from .api import get_default_session
+from .exceptions import AreqException
+from .models import AreqResponse
+from .sessions import Session
+
+DEFAULT_CONCURRENCY = 10
+# With per_host, how many items may be read ahead and held back while their
+# host is at its limit, so that other hosts' items further on can start.
+MAX_DEFERRED = 1000
+
+# A batch item is a URL (fetched with GET), a (method, url) pair or a
+# (method, url, kwargs) triple.
+RequestLike = str | URL | tuple
+BatchResult = AreqResponse | AreqException
+
+
+def _normalize(item: RequestLike) -> tuple[str, Any, dict[str, Any]]:
+    if isinstance(item, (str, URL)):
+        return "GET", item, {}
+    if isinstance(item, tuple) and len(item) == 2:
+        return item[0], item[1], {}
+    if isinstance(item, tuple) and len(item) == 3:
+        return item[0], item[1], dict(item[2])
+    raise TypeError(
+        "Batch items must be a URL, a (method, url) or a (method, url, kwargs) "
+        f"tuple, not {item!r}"
+    )
+
+
+async def _enumerate(
+    requests: Iterable[RequestLike] | AsyncIterable[RequestLike],
+) -> AsyncIterator[tuple[int, RequestLike]]:
+    index = 0
+    if isinstance(requests, AsyncIterable):
+        async for item in requests:
+            yield index, item
+            index += 1
+    else:
+        for item in requests:
+            yield index, item
+            index += 1
+
+
+async def as_completed(
+    requests: Iterable[RequestLike] | AsyncIterable[RequestLike],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int | None = None,
+    session: Session | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[tuple[int, BatchResult]]:
+    """
+    Sends a batch of requests with bounded concurrency, yielding results as they
+    finish.
+
+    Items are pulled from ``requests`` lazily, so at most ``concurrency`` requests
+    (and results) are held in memory at any time, however long the batch is.
+    With ``per_host``, items for a host at its limit are held back without
+    taking a concurrency slot, and up to MAX_DEFERRED of them are read ahead
+    to reach other hosts' items.
+
+    Args:
+        requests: URLs, (method, url) or (method, url, kwargs) tuples. Sync and
+            async iterables are both accepted.
+        concurrency: Maximum number of requests in flight across all hosts.
+        per_host: Maximum number of requests in flight to a single host.
+        session: Session to send the requests through. Defaults to the shared
+            default session.
+        **kwargs: Keyword arguments applied to every request; per-item kwargs
+            take precedence.
+
+    Yields:
+        (index, result) pairs, where index is the position of the item in
+        ``requests`` and result is an AreqResponse or the AreqException the
+        request failed with. Failures never abort the rest of the batch.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if per_host is not None and per_host < 1:
+        raise ValueError("per_host must be at least 1")
+
+    if session is None:
+        session = get_default_session()
+
+    async def fetch(
+        index: int, method: str, url: Any, item_kwargs: dict[str, Any]
+    ) -> tuple[int, BatchResult]:
+        request_kwargs = {**kwargs, **item_kwargs}
+        try:
+            return index, await session.request(method, url, **request_kwargs)
+        except AreqException as e:
+            return index, e
+
+    items = _enumerate(requests)
+    # Requests in flight, and the host each counts against (None without per_host).
+    running: dict[asyncio.Task, str | None] = {}
+    active: dict[str, int] = {}
+    deferred: dict[str, deque] = {}
+    held = 0
+    exhausted = False
+
+    def start(index: int, request: tuple, host: str | None) -> None:
+        running[asyncio.ensure_future(fetch(index, *request))] = host
+        if host is not None:
+            active[host] = active.get(host, 0) + 1
+
+    try:
+        while True:
+            # Hosts that finished a request take their held-back items first.
+            for host in list(deferred):
+                queue = deferred[host]
+                while queue and len(running) < concurrency and active[host] < per_host:
+                    start(*queue.popleft(), host)
+                    held -= 1
+                if not queue:
+                    del deferred[host]
+
+            while not exhausted and len(running) < concurrency and held < MAX_DEFERRED:
+                try:
+                    index, item = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                request = _normalize(item)
+                if per_host is None:
+                    start(index, request, None)
+                    continue
+                try:
+                    host = URL(request[1]).netloc.decode("ascii")
+                except InvalidURL:
+                    # Sent uncounted, so that it fails as this item's result.
+                    start(index, request, None)
+                    continue
+                if host in deferred or active.get(host, 0) >= per_host:
+                    deferred.setdefault(host, deque()).append((index, request))
+                    held += 1
+                else:
+                    start(index, request, host)
+
+            if not running:
+                return
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                host = running.pop(task)
+                if host is not None:
+                    active[host] -= 1
+                yield task.result()
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+async def map(
+    requests: Iterable[RequestLike] | AsyncIterable[RequestLike],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int | None = None,
+    session: Session | None = None,
+    **kwargs: Any,
+) -> list[BatchResult]:
+    """
+    Sends a batch of requests with bounded concurrency and returns the results
+    in input order.
+
+    Takes the same arguments as as_completed(). Use as_completed() directly for
+    large batches, where holding every response at once is not an option.
+    """
+    results: dict[int, BatchResult] = {}
+    async for index, result in as_completed(
+        requests,
+        concurrency=concurrency,
+        per_host=per_host,
+        session=session,
+        **kwargs,
+    ):
+        results[index] = result
+    return [results[index] for index in range(len(results))]
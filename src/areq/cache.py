@@ -0,0 +1,461 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable
+
+import httpx
+
+from .models import AreqResponse
+
+# Status codes a cache may store with only heuristic freshness (RFC 9110 15.1).
+HEURISTICALLY_CACHEABLE_STATUS_CODES = frozenset(
+    [200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501]
+)
+# Methods that invalidate a stored response for their URL (RFC 9111 4.4).
+INVALIDATING_METHODS = frozenset(["POST", "PUT", "PATCH", "DELETE"])
+# Hop-by-hop and body-framing headers that no longer describe the stored
+# (already decoded) body.
+_UNSTORED_HEADERS = frozenset(
+    [
+        "connection",
+        "content-encoding",
+        "content-length",
+        "keep-alive",
+        "transfer-encoding",
+    ]
+)
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+HEURISTIC_FRESHNESS_FRACTION = 0.1
+HEURISTIC_FRESHNESS_MAX = 24 * 60 * 60.0
+
+
+def parse_cache_control(values: list[str]) -> dict[str, str | None]:
+    """Parses Cache-Control header values into a {directive: argument} dict."""
+    directives: dict[str, str | None] = {}
+    for value in values:
+        for part in value.split(","):
+            name, _, argument = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: str | None) -> float | None:
+    try:
+        return float(int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CacheEntry:
+    """A stored response, with enough metadata to compute its freshness."""
+
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    stored_at: float
+    vary: dict[str, str | None] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers)
+
+    @property
+    def httpx_headers(self) -> httpx.Headers:
+        return httpx.Headers(self.headers)
+
+    def matches(self, request: httpx.Request) -> bool:
+        return all(
+            request.headers.get(name) == value for name, value in self.vary.items()
+        )
+
+    def age(self, now: float) -> float:
+        age_header = _seconds(self.httpx_headers.get("age")) or 0.0
+        return max(0.0, age_header) + max(0.0, now - self.stored_at)
+
+    def freshness_lifetime(self) -> float:
+        headers = self.httpx_headers
+        cache_control = parse_cache_control(headers.get_list("cache-control"))
+        max_age = _seconds(cache_control.get("max-age"))
+        if max_age is not None:
+            return max_age
+        date = _http_date(headers.get("date")) or self.stored_at
+        expires = _http_date(headers.get("expires"))
+        if expires is not None:
+            return max(0.0, expires - date)
+        if "expires" in headers:
+            # An invalid Expires value means "already expired".
+            return 0.0
+        last_modified = _http_date(headers.get("last-modified"))
+        if (
+            last_modified is not None
+            and self.status_code in HEURISTICALLY_CACHEABLE_STATUS_CODES
+        ):
+            return min(
+                HEURISTIC_FRESHNESS_MAX,
+                max(0.0, date - last_modified) * HEURISTIC_FRESHNESS_FRACTION,
+            )
+        return 0.0
+
+    def to_response(self, request: httpx.Request) -> AreqResponse:
+        httpx_response = httpx.Response(
+            status_code=self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+        )
+        response = AreqResponse(httpx_response)
+        response.from_cache = True
+        return response
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "url": self.url,
+                "status_code": self.status_code,
+                "headers": self.headers,
+                "stored_at": self.stored_at,
+                "vary": self.vary,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, metadata: str, content: bytes) -> "CacheEntry":
+        data = json.loads(metadata)
+        data["headers"] = [tuple(item) for item in data["headers"]]
+        return cls(content=content, **data)
+
+
+class BaseCacheBackend:
+    """Storage interface for HTTPCache. Keys are request URLs."""
+
+    async def get(self, key: str) -> CacheEntry | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(BaseCacheBackend):
+    """In-process LRU backend bounded by the total size of stored responses."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.delete(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+class SQLiteCacheBackend(BaseCacheBackend):
+    """
+    On-disk backend in a SQLite database, shareable between worker processes.
+
+    Queries run in a worker thread so disk I/O never blocks the event loop. When
+    ``max_bytes`` is set, least recently used entries are evicted beyond it.
+    """
+
+    def __init__(self, path: str, max_bytes: int | None = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS areq_cache ("
+            "key TEXT PRIMARY KEY, metadata TEXT NOT NULL, content BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+
+    def _execute(self, sql: str, *params) -> list:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _get(self, key: str) -> CacheEntry | None:
+        rows = self._execute(
+            "SELECT metadata, content FROM areq_cache WHERE key = ?", key
+        )
+        if not rows:
+            return None
+        self._execute(
+            "UPDATE areq_cache SET accessed_at = ? WHERE key = ?", time.time(), key
+        )
+        return CacheEntry.from_json(rows[0][0], rows[0][1])
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            self._delete(key)
+            return
+        self._execute(
+            "INSERT OR REPLACE INTO areq_cache VALUES (?, ?, ?, ?, ?)",
+            key,
+            entry.to_json(),
+            entry.content,
+            entry.size,
+            time.time(),
+        )
+        if self.max_bytes is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            connection = self._connection
+            (total,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM areq_cache"
+            ).fetchone()
+            if total <= self.max_bytes:
+                return
+            rows = connection.execute(
+                "SELECT key, size FROM areq_cache ORDER BY accessed_at"
+            ).fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                connection.execute("DELETE FROM areq_cache WHERE key = ?", (key,))
+                total -= size
+
+    def _delete(self, key: str) -> None:
+        self._execute("DELETE FROM areq_cache WHERE key = ?", key)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM areq_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+
+
+class HTTPCache:
+    """
+    A private HTTP cache (RFC 9111) in front of a Session.
+
+    Fresh responses are served without touching the network. Stale responses
+    with an ETag or Last-Modified validator are revalidated with a conditional
+    request, and a 304 answer is turned into the cached response. Successful
+    POST/PUT/PATCH/DELETE requests invalidate the stored response for their URL.
+
+    Usage:
+        cache = areq.HTTPCache(areq.SQLiteCacheBackend("/tmp/areq-cache.db"))
+        async with areq.Session(cache=cache) as session:
+            ...
+        print(cache.stats)
+    """
+
+    def __init__(self, backend: BaseCacheBackend | None = None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.stats = CacheStats()
+
+    @staticmethod
+    def cache_key(request: httpx.Request) -> str:
+        return str(request.url)
+
+    def _build_entry(
+        self, request: httpx.Request, response: AreqResponse
+    ) -> CacheEntry | None:
+        if request.method != "GET" or isinstance(response.content, memoryview):
+            # Bodies spilled to disk (spill_threshold) are not copied into the cache.
+            return None
+        request_cc = parse_cache_control(request.headers.get_list("cache-control"))
+        headers = response.httpx_response.headers
+        response_cc = parse_cache_control(headers.get_list("cache-control"))
+        if "no-store" in request_cc or "no-store" in response_cc:
+            return None
+        vary_names = [
+            name.strip().lower()
+            for value in headers.get_list("vary")
+            for name in value.split(",")
+            if name.strip()
+        ]
+        if "*" in vary_names or "range" in request.headers:
+            return None
+        has_explicit_policy = (
+            "max-age" in response_cc
+            or "expires" in headers
+            or "no-cache" in response_cc
+        )
+        has_validator = "etag" in headers or "last-modified" in headers
+        if not has_explicit_policy and not (
+            has_validator
+            and response.status_code in HEURISTICALLY_CACHEABLE_STATUS_CODES
+        ):
+            return None
+        return CacheEntry(
+            url=str(request.url),
+            status_code=response.status_code,
+            headers=[
+                (name, value)
+                for name, value in headers.multi_items()
+                if name.lower() not in _UNSTORED_HEADERS
+            ],
+            content=response.content,
+            stored_at=time.time(),
+            vary={name: request.headers.get(name) for name in vary_names},
+        )
+
+    @staticmethod
+    def _is_fresh(entry: CacheEntry, request_cc: dict[str, str | None]) -> bool:
+        response_cc = parse_cache_control(entry.httpx_headers.get_list("cache-control"))
+        if "no-cache" in request_cc or "no-cache" in response_cc:
+            return False
+        age = entry.age(time.time())
+        lifetime = entry.freshness_lifetime()
+        request_max_age = _seconds(request_cc.get("max-age"))
+        if request_max_age is not None and age > request_max_age:
+            return False
+        min_fresh = _seconds(request_cc.get("min-fresh")) or 0.0
+        if lifetime - age >= min_fresh and age < lifetime:
+            return True
+        if "max-stale" in request_cc and "must-revalidate" not in response_cc:
+            max_stale = _seconds(request_cc["max-stale"])
+            return max_stale is None or age - lifetime <= max_stale
+        return False
+
+    @staticmethod
+    def _conditional_request(
+        request: httpx.Request, entry: CacheEntry
+    ) -> httpx.Request | None:
+        stored = entry.httpx_headers
+        etag = stored.get("etag")
+        last_modified = stored.get("last-modified")
+        if etag is None and last_modified is None:
+            return None
+        headers = request.headers.copy()
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        return httpx.Request(
+            request.method, request.url, headers=headers, extensions=request.extensions
+        )
+
+    async def fetch(
+        self,
+        request: httpx.Request,
+        send: Callable[[httpx.Request], Awaitable[AreqResponse]],
+    ) -> AreqResponse:
+        """
+        Answers ``request`` from the cache, or with ``send`` when it cannot.
+
+        Args:
+            request: The request to answer.
+            send: Sends a request over the network.
+        """
+        key = self.cache_key(request)
+        if request.method != "GET":
+            response = await send(request)
+            if request.method in INVALIDATING_METHODS and response.status_code < 400:
+                await self.backend.delete(key)
+            return response
+
+        request_cc = parse_cache_control(request.headers.get_list("cache-control"))
+        entry = await self.backend.get(key)
+        if entry is not None and not entry.matches(request):
+            entry = None
+
+        if entry is not None:
+            if self._is_fresh(entry, request_cc):
+                self.stats.hits += 1
+                return entry.to_response(request)
+            conditional = self._conditional_request(request, entry)
+            if conditional is not None:
+                response = await send(conditional)
+                if response.status_code == 304:
+                    self.stats.revalidations += 1
+                    entry = self._refresh(entry, response)
+                    await self.backend.set(key, entry)
+                    return entry.to_response(request)
+                return await self._store(key, request, response)
+
+        self.stats.misses += 1
+        response = await send(request)
+        return await self._store(key, request, response)
+
+    @staticmethod
+    def _refresh(entry: CacheEntry, not_modified: AreqResponse) -> CacheEntry:
+        # RFC 9111 4.3.4: headers of the 304 replace the stored ones.
+        headers = entry.httpx_headers
+        for name, value in not_modified.httpx_response.headers.items():
+            if name.lower() not in _UNSTORED_HEADERS:
+                headers[name] = value
+        return CacheEntry(
+            url=entry.url,
+            status_code=entry.status_code,
+            headers=list(headers.multi_items()),
+            content=entry.content,
+            stored_at=time.time(),
+            vary=entry.vary,
+        )
+
+    async def _store(
+        self, key: str, request: httpx.Request, response: AreqResponse
+    ) -> AreqResponse:
+        entry = self._build_entry(request, response)
+        if entry is not None:
+            await self.backend.set(key, entry)
+        return response
@@ -0,0 +1,236 @@
+import asyncio
+import inspect
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Collection, Hashable, Iterable, Type
+
+import httpx
+
+from .exceptions import (
+    AreqCircuitOpen,
+    AreqConnectionError,
+    AreqDeadlineExceeded,
+    AreqException,
+    AreqTimeout,
+)
+from .models import AreqResponse
+
+_monotonic = time.monotonic
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+StateListener = Callable[[Hashable, str, str], Any]
+
+
+class Circuit:
+    """The state of one upstream's circuit."""
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.probes = 0
+        # (timestamp, failed) of recent outcomes, for the error rate.
+        self.outcomes: deque[tuple[float, bool]] = deque()
+
+    def error_rate(self, now: float, window: float) -> tuple[int, float]:
+        """Returns the number of recent outcomes and the fraction that failed."""
+        cutoff = now - window
+        outcomes = self.outcomes
+        while outcomes and outcomes[0][0] < cutoff:
+            outcomes.popleft()
+        if not outcomes:
+            return 0, 0.0
+        failures = sum(1 for _, failed in outcomes if failed)
+        return len(outcomes), failures / len(outcomes)
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    A circuit opens after ``failure_threshold`` consecutive failures, or when at
+    least ``failure_rate`` of the requests within the last ``window`` seconds
+    failed (once there were ``minimum_requests`` of them). While it is open,
+    requests to that host fail immediately with AreqCircuitOpen instead of
+    tying up connections. After ``recovery_timeout`` seconds the circuit turns
+    half-open and lets ``half_open_max_calls`` probe requests through: a
+    successful probe closes it, a failed one opens it again.
+
+    Failures are the Areq exceptions listed in ``failure_exceptions`` (and,
+    optionally, responses with a status in ``failure_statuses``). Other errors,
+    such as invalid URLs, say nothing about the upstream's health and are
+    ignored.
+
+    Usage:
+        breaker = areq.CircuitBreaker(on_state_change=alert)
+        async with areq.Session(circuit_breaker=breaker) as session:
+            ...
+    """
+
+    DEFAULT_FAILURE_EXCEPTIONS: tuple[Type[AreqException], ...] = (
+        AreqConnectionError,
+        AreqTimeout,
+    )
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int | None = 5,
+        failure_rate: float | None = 0.5,
+        minimum_requests: int = 20,
+        window: float = 30.0,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_exceptions: tuple[
+            Type[AreqException], ...
+        ] = DEFAULT_FAILURE_EXCEPTIONS,
+        failure_statuses: Collection[int] = (),
+        key: Callable[[httpx.Request], Hashable] | None = None,
+        on_state_change: StateListener | Iterable[StateListener] | None = None,
+    ):
+        """
+        Initializes the CircuitBreaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open a circuit. None
+                disables the check.
+            failure_rate: Fraction of failed requests within ``window`` that
+                opens a circuit. None disables the check.
+            minimum_requests: Requests needed within ``window`` before
+                ``failure_rate`` is considered.
+            window: Length in seconds of the error-rate window.
+            recovery_timeout: Seconds a circuit stays open before probing.
+            half_open_max_calls: Concurrent probe requests while half-open.
+            failure_exceptions: Areq exception classes counted as failures.
+            failure_statuses: Response status codes counted as failures.
+            key: Returns the circuit key of a request. Defaults to its host.
+            on_state_change: Called with (key, old_state, new_state) on every
+                transition, e.g. for alerting. May be a coroutine function.
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.minimum_requests = minimum_requests
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+        self.failure_statuses = frozenset(failure_statuses)
+        self.key = key or (lambda request: request.url.host)
+        if on_state_change is None:
+            self.listeners: list[StateListener] = []
+        elif callable(on_state_change):
+            self.listeners = [on_state_change]
+        else:
+            self.listeners = list(on_state_change)
+        self._circuits: dict[Hashable, Circuit] = {}
+        self._notifications: set[asyncio.Future] = set()
+
+    def circuit(self, key: Hashable) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit(key)
+        return circuit
+
+    def state(self, key: Hashable) -> str:
+        """Returns the state of a key's circuit, moving it to half-open if due."""
+        circuit = self.circuit(key)
+        if (
+            circuit.state == OPEN
+            and _monotonic() - circuit.opened_at >= self.recovery_timeout
+        ):
+            self._set_state(circuit, HALF_OPEN)
+        return circuit.state
+
+    def _set_state(self, circuit: Circuit, state: str) -> None:
+        old = circuit.state
+        if old == state:
+            return
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = _monotonic()
+        elif state == CLOSED:
+            circuit.consecutive_failures = 0
+            circuit.outcomes.clear()
+        circuit.probes = 0
+        for listener in self.listeners:
+            result = listener(circuit.key, old, state)
+            if inspect.isawaitable(result):
+                # Keep a reference until the notification has run.
+                future = asyncio.ensure_future(result)
+                self._notifications.add(future)
+                future.add_done_callback(self._notifications.discard)
+
+    def _reject(self, request: httpx.Request, circuit: Circuit) -> AreqCircuitOpen:
+        retry_after = max(0.0, circuit.opened_at + self.recovery_timeout - _monotonic())
+        error = httpx.ConnectError(
+            f"Circuit breaker for {circuit.key!r} is {circuit.state.replace('_', '-')}",
+            request=request,
+        )
+        return AreqCircuitOpen(error, key=circuit.key, retry_after=retry_after)
+
+    def before_request(self, request: httpx.Request) -> Circuit:
+        """Raises AreqCircuitOpen if the request may not be sent."""
+        key = self.key(request)
+        state = self.state(key)
+        circuit = self._circuits[key]
+        if state == OPEN:
+            raise self._reject(request, circuit)
+        if state == HALF_OPEN:
+            if circuit.probes >= self.half_open_max_calls:
+                raise self._reject(request, circuit)
+            circuit.probes += 1
+        return circuit
+
+    def record(self, circuit: Circuit, failed: bool) -> None:
+        """Records the outcome of a request that was let through."""
+        if circuit.state == HALF_OPEN:
+            self._set_state(circuit, OPEN if failed else CLOSED)
+            return
+        if circuit.state == OPEN:
+            # Outcome of a request sent before the circuit opened.
+            return
+        now = _monotonic()
+        circuit.outcomes.append((now, failed))
+        if not failed:
+            circuit.consecutive_failures = 0
+            return
+        circuit.consecutive_failures += 1
+        if (
+            self.failure_threshold is not None
+            and circuit.consecutive_failures >= self.failure_threshold
+        ):
+            self._set_state(circuit, OPEN)
+            return
+        if self.failure_rate is not None:
+            count, rate = circuit.error_rate(now, self.window)
+            if count >= self.minimum_requests and rate >= self.failure_rate:
+                self._set_state(circuit, OPEN)
+
+    def _release(self, circuit: Circuit) -> None:
+        # A probe ended without telling anything about the upstream.
+        if circuit.state == HALF_OPEN and circuit.probes:
+            circuit.probes -= 1
+
+    async def call(
+        self, request: httpx.Request, send: Callable[[], Awaitable[AreqResponse]]
+    ) -> AreqResponse:
+        """Sends ``request`` through ``send`` unless its circuit is open."""
+        circuit = self.before_request(request)
+        try:
+            response = await send()
+        except AreqDeadlineExceeded:
+            # The caller ran out of time; that says nothing about the upstream.
+            self._release(circuit)
+            raise
+        except self.failure_exceptions:
+            self.record(circuit, failed=True)
+            raise
+        except BaseException:
+            self._release(circuit)
+            raise
+        self.record(circuit, failed=response.status_code in self.failure_statuses)
+        return response
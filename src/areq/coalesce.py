@@ -0,0 +1,97 @@
+import asyncio
+from typing import Awaitable, Callable, Collection, Hashable
+
+import httpx
+
+from .deadlines import without_deadline
+from .models import AreqResponse
+
+DEFAULT_COALESCED_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+class RequestCoalescer:
+    """
+    Single-flight deduplication of identical in-flight requests.
+
+    While a request is in flight, identical requests (same method, URL and
+    headers) wait for it instead of going to the network. Every caller gets its
+    own AreqResponse over the shared result, or the same AreqException.
+
+    Usage:
+        async with areq.Session(coalesce=True) as session:
+            responses = await asyncio.gather(*[session.get(url) for _ in range(100)])
+    """
+
+    def __init__(
+        self,
+        methods: Collection[str] = DEFAULT_COALESCED_METHODS,
+        key_headers: Collection[str] | None = None,
+    ):
+        """
+        Initializes the RequestCoalescer.
+
+        Args:
+            methods: Methods eligible for coalescing. Only idempotent methods
+                should be listed.
+            key_headers: Headers that distinguish otherwise identical requests.
+                None compares every request header.
+        """
+        self.methods = frozenset(method.upper() for method in methods)
+        self.key_headers = (
+            None
+            if key_headers is None
+            else tuple(sorted(name.lower() for name in key_headers))
+        )
+        self.requests = 0
+        self.coalesced = 0
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def key(self, request: httpx.Request) -> Hashable | None:
+        """Returns the coalescing key of a request, or None if it is not eligible."""
+        if request.method not in self.methods:
+            return None
+        headers = request.headers
+        if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+            return None
+        if self.key_headers is None:
+            selected = tuple(sorted(headers.multi_items()))
+        else:
+            selected = tuple(
+                (name, tuple(headers.get_list(name))) for name in self.key_headers
+            )
+        return request.method, str(request.url), selected
+
+    def _finished(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved even if every waiter went away.
+            future.exception()
+
+    async def run(
+        self, request: httpx.Request, fetch: Callable[[], Awaitable[AreqResponse]]
+    ) -> AreqResponse:
+        """
+        Runs ``fetch`` for ``request``, sharing the call with identical requests
+        already in flight.
+        """
+        self.requests += 1
+        key = self.key(request)
+        if key is None:
+            return await fetch()
+
+        shared = self._in_flight.get(key)
+        if shared is None:
+            # The call runs in its own task so that one cancelled caller does
+            # not cancel it for everyone else waiting on it, and outside the
+            # first caller's deadline, which the others did not set.
+            shared = without_deadline().run(asyncio.ensure_future, fetch())
+            self._in_flight[key] = shared
+            shared.add_done_callback(lambda future: self._finished(key, future))
+        else:
+            self.coalesced += 1
+
+        result = await asyncio.shield(shared)
+        response = AreqResponse(result.httpx_response)
+        response.from_cache = result.from_cache
+        return response
@@ -0,0 +1,199 @@
+import asyncio
+import contextvars
+import time
+from typing import Any, Awaitable, TypeVar
+
+import httpx
+
+from .exceptions import AreqDeadlineExceeded, AreqTimeout
+
+T = TypeVar("T")
+
+_current: contextvars.ContextVar["Deadline | None"] = contextvars.ContextVar(
+    "areq_deadline", default=None
+)
+
+
+def current_deadline() -> "Deadline | None":
+    """Returns the innermost active deadline scope, if any."""
+    return _current.get()
+
+
+def without_deadline() -> contextvars.Context:
+    """
+    Returns a copy of the current context with no deadline, to run work that
+    callers with different deadlines share. Each caller still bounds its own
+    wait with Deadline.watch().
+    """
+    context = contextvars.copy_context()
+    context.run(_current.set, None)
+    return context
+
+
+def _cancelling(task: asyncio.Task) -> int:
+    cancelling = getattr(task, "cancelling", None)  # Python 3.11+
+    return 0 if cancelling is None else cancelling()
+
+
+def _uncancel(task: asyncio.Task, baseline: int) -> bool:
+    """
+    Withdraws a cancellation requested by a deadline. Returns False when the
+    task was cancelled by someone else too, and must stay cancelled.
+    """
+    uncancel = getattr(task, "uncancel", None)  # Python 3.11+
+    return uncancel is None or uncancel() <= baseline
+
+
+class Deadline:
+    """
+    An end-to-end time budget for every areq call made inside
+    ``async with areq.deadline(seconds):``.
+
+    Context variables follow the calls into the tasks they spawn, so
+    concurrent requests (areq.map(), asyncio.gather(), TaskGroup) share the
+    budget. Inside the scope each attempt's connect, read, write and pool
+    timeouts are cut to the time remaining, and a request made once the budget
+    is spent fails at once with AreqDeadlineExceeded, without touching the
+    network. When the deadline passes, the requests still in flight and the
+    block itself are cancelled and raise AreqDeadlineExceeded, releasing their
+    connections. Nested scopes can only shorten the budget.
+
+    Usage:
+        async with areq.deadline(2.0):
+            user = await areq.get(user_url)
+            orders, prefs = await asyncio.gather(
+                areq.get(orders_url), areq.get(prefs_url)
+            )
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Initializes the Deadline.
+
+        Args:
+            timeout: Seconds the scope may take, from entering it.
+        """
+        self.timeout = timeout
+        self.when: float | None = None
+        self._task: asyncio.Task | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._token: contextvars.Token | None = None
+        # Tasks with a request in flight, and their cancellation counts then.
+        self._in_flight: dict[asyncio.Task, int] = {}
+        self._cancelled: dict[asyncio.Task, int] = {}
+
+    def remaining(self) -> float:
+        """Seconds left in the budget; 0 once it is spent."""
+        if self.when is None:
+            return self.timeout
+        return max(0.0, self.when - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.when is not None and time.monotonic() >= self.when
+
+    def exceeded(self, request: httpx.Request | None = None) -> AreqDeadlineExceeded:
+        error = httpx.TimeoutException(
+            f"Deadline of {self.timeout}s exceeded", request=request
+        )
+        return AreqDeadlineExceeded(error, timeout=self.timeout)
+
+    async def __aenter__(self) -> "Deadline":
+        now = time.monotonic()
+        self.when = now + self.timeout
+        outer = _current.get()
+        if outer is not None and outer.when is not None:
+            self.when = min(self.when, outer.when)
+        task = asyncio.current_task()
+        assert task is not None, "areq.deadline() must be used inside a task"
+        self._task = task
+        self._in_flight[task] = _cancelling(task)
+        self._handle = asyncio.get_running_loop().call_later(
+            self.when - now, self._expire
+        )
+        self._token = _current.set(self)
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        assert self._task is not None and self._handle is not None
+        self._handle.cancel()
+        _current.reset(self._token)
+        self._in_flight.pop(self._task, None)
+        baseline = self._cancelled.pop(self._task, None)
+        if exc_type is asyncio.CancelledError and baseline is not None:
+            if _uncancel(self._task, baseline):
+                raise self.exceeded() from None
+        elif (
+            isinstance(exc, AreqTimeout)
+            and not isinstance(exc, AreqDeadlineExceeded)
+            and self.expired
+        ):
+            # A timeout cut short by the budget, e.g. reading a streamed body.
+            raise self.exceeded() from exc
+
+    def _expire(self) -> None:
+        for task, baseline in self._in_flight.items():
+            if not task.done():
+                self._cancelled[task] = baseline
+                task.cancel()
+        self._in_flight.clear()
+
+    def limit_timeouts(self, request: httpx.Request) -> None:
+        """
+        Cuts the timeouts of ``request`` to the remaining budget.
+
+        Raises:
+            AreqDeadlineExceeded: The budget is spent.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded(request)
+        timeouts = request.extensions.get("timeout") or {}
+        request.extensions["timeout"] = {
+            phase: remaining if value is None else min(value, remaining)
+            for phase, value in {
+                "connect": None,
+                "read": None,
+                "write": None,
+                "pool": None,
+                **timeouts,
+            }.items()
+        }
+
+    async def watch(self, request: httpx.Request, call: Awaitable[T]) -> T:
+        """
+        Awaits a request's ``call``, registered to be cancelled when the
+        deadline passes, and reports that and budget-bound timeouts as
+        AreqDeadlineExceeded.
+        """
+        if self.expired:
+            # Close the coroutine that will not be awaited.
+            getattr(call, "close", lambda: None)()
+            raise self.exceeded(request)
+        task = asyncio.current_task()
+        # The scope's own task is registered already, as are nested calls.
+        owner = task is not None and task not in self._in_flight
+        if owner:
+            self._in_flight[task] = _cancelling(task)
+        try:
+            return await call
+        except asyncio.CancelledError:
+            baseline = self._cancelled.pop(task, None)
+            if baseline is not None and _uncancel(task, baseline):
+                raise self.exceeded(request) from None
+            raise
+        except AreqTimeout as e:
+            if self.expired and not isinstance(e, AreqDeadlineExceeded):
+                raise self.exceeded(request) from e
+            raise
+        finally:
+            if owner:
+                self._in_flight.pop(task, None)
+
+
+def deadline(timeout: float) -> Deadline:
+    """
+    Returns a scope bounding every areq call made within it to ``timeout``
+    seconds in total. See Deadline.
+    """
+    return Deadline(timeout)
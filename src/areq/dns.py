@@ -0,0 +1,369 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+import httpcore
+import httpx
+
+_monotonic = time.monotonic
+
+DEFAULT_TTL = 60.0
+# RFC 8305 recommends 250ms between connection attempts.
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25
+
+
+@dataclass(frozen=True)
+class DNSAnswer:
+    """Addresses a hostname resolved to, and how long they may be cached."""
+
+    addresses: tuple[str, ...]
+    ttl: float | None = None
+
+
+class BaseResolver:
+    """
+    Resolves hostnames for a DNSCache. Subclasses implement resolve(), raising
+    OSError (e.g. socket.gaierror) when a name does not resolve.
+    """
+
+    async def resolve(self, host: str) -> DNSAnswer:
+        raise NotImplementedError
+
+
+class SystemResolver(BaseResolver):
+    """
+    Resolves through getaddrinfo() in the default executor, like the socket
+    module. The system resolver does not report TTLs, so answers are cached
+    for the DNSCache's default TTL.
+    """
+
+    async def resolve(self, host: str) -> DNSAnswer:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, None, type=socket.SOCK_STREAM
+        )
+        addresses = dict.fromkeys(info[4][0] for info in infos)
+        return DNSAnswer(tuple(addresses))
+
+
+class AiodnsResolver(BaseResolver):
+    """
+    Queries DNS servers directly with aiodns (c-ares), without threads, and
+    honours the TTLs of the A and AAAA records. Requires the ``aiodns``
+    package.
+    """
+
+    def __init__(self, nameservers: list[str] | None = None):
+        try:
+            import aiodns
+        except ImportError:
+            raise ImportError(
+                "AiodnsResolver requires the 'aiodns' package: pip install aiodns"
+            ) from None
+        self._resolver = aiodns.DNSResolver(nameservers=nameservers)
+
+    async def resolve(self, host: str) -> DNSAnswer:
+        results = await asyncio.gather(
+            self._resolver.query(host, "AAAA"),
+            self._resolver.query(host, "A"),
+            return_exceptions=True,
+        )
+        records = [
+            record
+            for result in results
+            if isinstance(result, list)
+            for record in result
+        ]
+        if not records:
+            error = next((r for r in results if isinstance(r, BaseException)), None)
+            raise socket.gaierror(socket.EAI_NONAME, f"{host}: {error}")
+        return DNSAnswer(
+            tuple(dict.fromkeys(record.host for record in records)),
+            ttl=min(record.ttl for record in records),
+        )
+
+
+@dataclass
+class _Entry:
+    answer: DNSAnswer | None
+    error: OSError | None
+    expires: float
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """
+    Caches hostname lookups for connections opened by a Session.
+
+    Answers are kept for their TTL, clamped to [min_ttl, max_ttl]. Failed
+    lookups are cached for ``negative_ttl``. Once an answer expires it is still
+    served for up to ``stale_ttl`` seconds while a single background lookup
+    refreshes it, so requests never wait on the resolver for a known host.
+    Concurrent lookups of one host share a single query.
+
+    New connections try the resolved addresses with happy eyeballs (RFC 8305):
+    IPv6 and IPv4 addresses are interleaved and a new attempt starts every
+    ``happy_eyeballs_delay`` seconds, or as soon as one fails, until one
+    connects.
+
+    Usage:
+        async with areq.Session(dns_cache=areq.DNSCache(max_ttl=600)) as session:
+            ...
+        await areq.get(url, dns_cache=True)  # shared default cache
+    """
+
+    def __init__(
+        self,
+        resolver: BaseResolver | None = None,
+        *,
+        default_ttl: float = DEFAULT_TTL,
+        min_ttl: float = 0.0,
+        max_ttl: float = 3600.0,
+        negative_ttl: float = 5.0,
+        stale_ttl: float = 30.0,
+        max_size: int = 1024,
+        happy_eyeballs_delay: float | None = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    ):
+        """
+        Initializes the DNSCache.
+
+        Args:
+            resolver: Resolver used on cache misses. Defaults to a
+                SystemResolver.
+            default_ttl: TTL of answers that carry none, as from the system
+                resolver.
+            min_ttl: Lower bound applied to record TTLs.
+            max_ttl: Upper bound applied to record TTLs.
+            negative_ttl: Seconds a failed lookup is cached; 0 disables
+                negative caching.
+            stale_ttl: Seconds an expired answer may still be served while it
+                is refreshed in the background; 0 disables it.
+            max_size: Maximum number of cached hostnames.
+            happy_eyeballs_delay: Seconds before racing the next address. None
+                tries the addresses one after the other.
+        """
+        self.resolver = resolver or SystemResolver()
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, _Entry] = {}
+        self._lookups: dict[str, asyncio.Future] = {}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def resolve(self, host: str) -> tuple[str, ...]:
+        """
+        Returns the addresses of ``host``, from the cache when possible.
+
+        Raises:
+            OSError: The lookup failed, now or within ``negative_ttl``.
+        """
+        if _is_ip_address(host):
+            return (host,)
+        entry = self._entries.get(host)
+        now = _monotonic()
+        if entry is not None:
+            if now < entry.expires:
+                self.hits += 1
+                if entry.error is not None:
+                    raise entry.error
+                assert entry.answer is not None
+                return entry.answer.addresses
+            if entry.answer is not None and now < entry.expires + self.stale_ttl:
+                self.hits += 1
+                self._lookup(host)
+                return entry.answer.addresses
+        self.misses += 1
+        # shield(): a cancelled caller must not cancel the query others share.
+        return await asyncio.shield(self._lookup(host))
+
+    def _lookup(self, host: str) -> asyncio.Future:
+        future = self._lookups.get(host)
+        if future is None:
+            future = self._lookups[host] = asyncio.ensure_future(self._query(host))
+            future.add_done_callback(lambda f: self._lookup_done(host, f))
+        return future
+
+    def _lookup_done(self, host: str, future: asyncio.Future) -> None:
+        del self._lookups[host]
+        if not future.cancelled():
+            # Mark the exception as retrieved: background refreshes have no waiter.
+            future.exception()
+
+    async def _query(self, host: str) -> tuple[str, ...]:
+        try:
+            answer = await self.resolver.resolve(host)
+            if not answer.addresses:
+                raise socket.gaierror(socket.EAI_NONAME, f"{host} has no addresses")
+        except OSError as e:
+            entry = self._entries.get(host)
+            if (
+                entry is not None
+                and entry.answer is not None
+                and _monotonic() < entry.expires + self.stale_ttl
+            ):
+                # A failed refresh keeps the stale answer until its window ends.
+                raise
+            if self.negative_ttl > 0:
+                self._store(host, _Entry(None, e, _monotonic() + self.negative_ttl))
+            else:
+                self._entries.pop(host, None)
+            raise
+        ttl = self.default_ttl if answer.ttl is None else answer.ttl
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        self._store(host, _Entry(answer, None, _monotonic() + ttl))
+        return answer.addresses
+
+    def _store(self, host: str, entry: _Entry) -> None:
+        self._entries.pop(host, None)
+        if len(self._entries) >= self.max_size:
+            # Dicts keep insertion order: drop the oldest answer.
+            del self._entries[next(iter(self._entries))]
+        self._entries[host] = entry
+
+
+_default_dns_cache: DNSCache | None = None
+
+
+def default_dns_cache() -> DNSCache:
+    """Returns the process-wide DNSCache used by ``dns_cache=True``."""
+    global _default_dns_cache
+    if _default_dns_cache is None:
+        _default_dns_cache = DNSCache()
+    return _default_dns_cache
+
+
+def _interleave(addresses: tuple[str, ...]) -> list[str]:
+    """Alternates address families, starting with the first one (RFC 8305)."""
+    first_is_ipv6 = ":" in addresses[0]
+    first = [address for address in addresses if (":" in address) == first_is_ipv6]
+    second = [address for address in addresses if (":" in address) != first_is_ipv6]
+    ordered = []
+    for i in range(max(len(first), len(second))):
+        ordered.extend(family[i] for family in (first, second) if i < len(family))
+    return ordered
+
+
+class DNSCacheBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend resolving through a DNSCache."""
+
+    def __init__(
+        self, dns_cache: DNSCache, backend: httpcore.AsyncNetworkBackend | None = None
+    ):
+        self.dns_cache = dns_cache
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await asyncio.wait_for(self.dns_cache.resolve(host), timeout)
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"Timed out resolving {host}") from None
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        async def connect(address: str) -> httpcore.AsyncNetworkStream:
+            return await self.backend.connect_tcp(
+                address,
+                port,
+                timeout=timeout,
+                local_address=local_address,
+                socket_options=socket_options,
+            )
+
+        ordered = _interleave(addresses)
+        delay = self.dns_cache.happy_eyeballs_delay
+        if len(ordered) == 1:
+            return await connect(ordered[0])
+        return await self._race(ordered, connect, delay)
+
+    async def _race(
+        self,
+        addresses: list[str],
+        connect: Callable[[str], Awaitable[httpcore.AsyncNetworkStream]],
+        delay: float | None,
+    ) -> httpcore.AsyncNetworkStream:
+        remaining = list(addresses)
+        started: list[asyncio.Future] = []
+        pending: set[asyncio.Future] = set()
+        errors: list[BaseException] = []
+        winner: asyncio.Future | None = None
+        try:
+            while remaining or pending:
+                if remaining and (delay is not None or not pending):
+                    task = asyncio.ensure_future(connect(remaining.pop(0)))
+                    started.append(task)
+                    pending.add(task)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            losers = [task for task in started if task is not winner]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+            for task in losers:
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+def install(client: httpx.AsyncClient, dns_cache: DNSCache) -> None:
+    """
+    Makes the connection pools of ``client`` resolve through ``dns_cache``.
+
+    httpx takes no network backend argument, so the backend of each pool httpx
+    built (including proxy mounts) is replaced before any connection is made.
+    """
+    transports = [client._transport, *client._mounts.values()]
+    pools = [
+        transport._pool
+        for transport in transports
+        if isinstance(transport, httpx.AsyncHTTPTransport)
+    ]
+    if not pools:
+        raise ValueError("dns_cache requires httpx's default transport")
+    for pool in pools:
+        pool._network_backend = DNSCacheBackend(dns_cache, pool._network_backend)
@@ -0,0 +1,281 @@
+import asyncio
+import json
+import math
+import mmap
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from .api import get_default_session
+from .sessions import Session
+
+DEFAULT_PARTS = 4
+DEFAULT_MIN_PART_SIZE = 1024 * 1024
+# How often, in seconds, the progress of a ranged download is persisted.
+STATE_SAVE_INTERVAL = 1.0
+# Bytes a single-stream download buffers before handing a write to a thread.
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of areq.download()."""
+
+    path: Path
+    size: int
+    #: Number of byte ranges fetched concurrently; 1 for a single streamed GET.
+    parts: int
+    #: Bytes kept from an interrupted earlier attempt.
+    resumed_bytes: int = 0
+
+
+class _RangeNotHonoured(Exception):
+    """The server answered a range request with the whole body."""
+
+
+def _content_length(response) -> int | None:
+    value = response.headers.get("content-length")
+    if value is None or not value.isdigit():
+        return None
+    return int(value)
+
+
+def _check_status(response, url: str) -> None:
+    """Rejects anything but a 2xx answer before its body is written."""
+    response.raise_for_status()
+    if not 200 <= response.status_code < 300:
+        raise requests.exceptions.HTTPError(
+            f"Unexpected status {response.status_code} downloading {url}",
+            response=response,
+        )
+
+
+def _load_state(state_path: Path) -> dict | None:
+    try:
+        with open(state_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_path: Path, state: dict) -> None:
+    tmp = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path)
+
+
+def _allocate(partial: Path, size: int) -> None:
+    with open(partial, "wb") as f:
+        f.truncate(size)
+
+
+def _split(size: int, parts: int) -> list[list[int]]:
+    """Splits [0, size) into ``parts`` inclusive [start, end, written] ranges."""
+    step = math.ceil(size / parts)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+async def download(
+    url: str,
+    path: str | os.PathLike,
+    *,
+    parts: int = DEFAULT_PARTS,
+    session: Session | None = None,
+    resume: bool = True,
+    min_part_size: int = DEFAULT_MIN_PART_SIZE,
+    **kwargs: Any,
+) -> DownloadResult:
+    """
+    Downloads ``url`` to ``path`` in constant memory.
+
+    A HEAD request learns the size and whether the server accepts byte ranges.
+    If it does, ``parts`` ranges are fetched concurrently over the session's
+    pool and written straight into a preallocated, memory-mapped file.
+    Otherwise the body is streamed to disk with a single GET.
+
+    Data is written to ``<path>.part`` and renamed to ``path`` once complete.
+    When a ranged download is interrupted, its progress is kept in
+    ``<path>.part.json`` and the next call resumes it, provided the remote
+    file still has the same size and ETag/Last-Modified. Downloads from servers
+    that send neither are never resumed.
+
+    Args:
+        url: URL to download.
+        path: Destination file.
+        parts: Number of concurrent range requests.
+        session: Session to download through. Defaults to the shared default
+            session.
+        resume: Resume an interrupted download instead of starting over.
+        min_part_size: Files are not split into parts smaller than this.
+        **kwargs: Keyword arguments for every request, e.g. headers or auth.
+            Redirects are followed unless allow_redirects=False.
+
+    Returns:
+        A DownloadResult.
+    """
+    if parts < 1:
+        raise ValueError("parts must be at least 1")
+    session = session or get_default_session()
+    path = Path(path)
+    partial = path.with_name(path.name + ".part")
+    state_path = path.with_name(path.name + ".part.json")
+    headers = dict(kwargs.pop("headers", None) or {})
+    kwargs.setdefault("allow_redirects", True)
+    # Ranges address the bytes on the wire: they must not be compressed.
+    identity_headers = {**headers, "Accept-Encoding": "identity"}
+
+    head = await session.head(url, headers=identity_headers, **kwargs)
+    size = _content_length(head)
+    if (
+        head.status_code >= 400
+        or not size
+        or head.headers.get("accept-ranges", "").lower() != "bytes"
+    ):
+        return await _download_single(session, url, path, partial, headers, kwargs)
+
+    # Ranges are requested where the redirects, if any, led.
+    location = str(head.url)
+    validator = head.headers.get("etag") or head.headers.get("last-modified")
+    # Without a validator, a changed file cannot be told from the one the
+    # partial download came from: only resume with one.
+    resumable = resume and validator is not None
+    state = await asyncio.to_thread(_load_state, state_path) if resumable else None
+    if not (
+        state is not None
+        and state.get("url") == str(url)
+        and state.get("size") == size
+        and state.get("validator") == validator
+        and partial.exists()
+        and partial.stat().st_size == size
+    ):
+        count = max(1, min(parts, math.ceil(size / min_part_size)))
+        state = {
+            "url": str(url),
+            "size": size,
+            "validator": validator,
+            "ranges": _split(size, count),
+        }
+        await asyncio.to_thread(_allocate, partial, size)
+    ranges = state["ranges"]
+    resumed = sum(written for _, _, written in ranges)
+    last_save = time.monotonic()
+    saving = False
+
+    async def save_state() -> None:
+        # The ranges keep moving while a thread writes the snapshot.
+        snapshot = {**state, "ranges": [list(byte_range) for byte_range in ranges]}
+        await asyncio.to_thread(_save_state, state_path, snapshot)
+
+    async def save_if_due() -> None:
+        nonlocal last_save, saving
+        if (
+            resumable
+            and not saving
+            and time.monotonic() - last_save >= STATE_SAVE_INTERVAL
+        ):
+            saving = True
+            try:
+                await save_state()
+            finally:
+                saving = False
+                last_save = time.monotonic()
+
+    async def fetch_range(byte_range: list[int], mm: mmap.mmap) -> None:
+        start, end, written = byte_range
+        position = start + written
+        range_headers = {**identity_headers, "Range": f"bytes={position}-{end}"}
+        if validator:
+            range_headers["If-Range"] = validator
+        response = await session.get(
+            location, headers=range_headers, stream=True, **kwargs
+        )
+        async with response:
+            if response.status_code == 200:
+                raise _RangeNotHonoured()
+            _check_status(response, url)
+            content_range = response.headers.get("content-range", "")
+            if not content_range.startswith(f"bytes {position}-{end}/"):
+                raise ValueError(
+                    f"Server sent range {content_range!r} for bytes {position}-{end} of {url}"
+                )
+            # Chunks are written as they arrive: re-chunking would copy them.
+            async for chunk in response.aiter_bytes():
+                stop = position + len(chunk)
+                if stop > end + 1:
+                    raise ValueError(
+                        f"Server sent more than the requested range of {url}"
+                    )
+                mm[position:stop] = chunk
+                position = stop
+                byte_range[2] = position - start
+                await save_if_due()
+        if position != end + 1:
+            raise ValueError(f"Incomplete range {start}-{end} of {url}")
+
+    ranges_honoured = True
+    with open(partial, "r+b") as f, mmap.mmap(f.fileno(), size) as mm:
+        tasks = [
+            asyncio.ensure_future(fetch_range(byte_range, mm))
+            for byte_range in ranges
+            if byte_range[0] + byte_range[2] <= byte_range[1]
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not isinstance(e, _RangeNotHonoured):
+                if resumable:
+                    await save_state()
+                raise
+            ranges_honoured = False
+        else:
+            await asyncio.to_thread(mm.flush)
+
+    if not ranges_honoured:
+        # Advertised Accept-Ranges, then sent the whole body (or the file
+        # changed under If-Range): start over with a single stream.
+        state_path.unlink(missing_ok=True)
+        return await _download_single(session, url, path, partial, headers, kwargs)
+    os.replace(partial, path)
+    state_path.unlink(missing_ok=True)
+    return DownloadResult(
+        path=path, size=size, parts=len(ranges), resumed_bytes=resumed
+    )
+
+
+async def _download_single(
+    session: Session,
+    url: str,
+    path: Path,
+    partial: Path,
+    headers: dict,
+    kwargs: dict,
+) -> DownloadResult:
+    size = 0
+    response = await session.get(url, headers=headers, stream=True, **kwargs)
+    async with response:
+        _check_status(response, url)
+        f = await asyncio.to_thread(open, partial, "wb")
+        try:
+            # Disk writes run in a thread, a buffer at a time, off the loop.
+            buffered: list[bytes] = []
+            pending = 0
+            async for chunk in response.aiter_bytes():
+                buffered.append(chunk)
+                pending += len(chunk)
+                size += len(chunk)
+                if pending >= WRITE_BUFFER_SIZE:
+                    await asyncio.to_thread(f.writelines, buffered)
+                    buffered, pending = [], 0
+            await asyncio.to_thread(f.writelines, buffered)
+        finally:
+            await asyncio.to_thread(f.close)
+    os.replace(partial, path)
+    return DownloadResult(path=path, size=size, parts=1)
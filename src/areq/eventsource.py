@@ -0,0 +1,195 @@
+import asyncio
+import codecs
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+import httpx
+
+from .api import get_default_session
+from .deadlines import current_deadline
+from .exceptions import AreqConnectionError, AreqDeadlineExceeded, AreqTimeout
+from .models import MAX_LINE_SIZE, AreqResponse, LineBuffer, _loads_json
+from .sessions import Session
+
+# Seconds before reconnecting, until the server sends a retry: field.
+DEFAULT_RECONNECT_DELAY = 3.0
+
+
+@dataclass
+class ServerSentEvent:
+    """An event of a text/event-stream response."""
+
+    data: str
+    event: str = "message"
+    #: The last event ID seen on the stream, sent back on reconnection.
+    id: str | None = None
+    #: Reconnection delay requested by the server, in milliseconds.
+    retry: int | None = None
+
+    def json(self, **kwargs: Any) -> Any:
+        """Parses ``data`` as JSON."""
+        return _loads_json(self.data.encode(), **kwargs)
+
+
+class SSEDecoder:
+    """
+    Turns the lines of a text/event-stream into ServerSentEvents, following
+    the HTML standard's event stream interpretation.
+    """
+
+    def __init__(self, last_event_id: str | None = None):
+        self.last_event_id = last_event_id
+        self.retry: int | None = None
+        self._event = ""
+        self._data: list[str] = []
+
+    def decode(self, line: str) -> ServerSentEvent | None:
+        """Consumes one line; returns the event an empty line dispatches."""
+        if not line:
+            if not self._data:
+                self._event = ""
+                return None
+            event = ServerSentEvent(
+                data="\n".join(self._data),
+                event=self._event or "message",
+                id=self.last_event_id,
+                retry=self.retry,
+            )
+            self._event = ""
+            self._data = []
+            return event
+        if line[0] == ":":
+            return None
+        name, _, value = line.partition(":")
+        if value[:1] == " ":
+            value = value[1:]
+        if name == "data":
+            self._data.append(value)
+        elif name == "event":
+            self._event = value
+        elif name == "id":
+            if "\0" not in value:
+                self.last_event_id = value
+        elif name == "retry":
+            if value.isdigit():
+                self.retry = int(value)
+        return None
+
+    def reset(self) -> None:
+        """Drops a half-received event, as when the connection is lost."""
+        self._event = ""
+        self._data = []
+
+
+async def iter_events(
+    response: AreqResponse,
+    decoder: SSEDecoder | None = None,
+    max_line_size: int = MAX_LINE_SIZE,
+) -> AsyncIterator[ServerSentEvent]:
+    """
+    Parses the body of a text/event-stream response as it arrives.
+
+    Lines are split on bytes and each complete line is decoded once, so the
+    cost per chunk does not grow with the data buffered.
+    """
+    decoder = decoder or SSEDecoder()
+    lines = LineBuffer(max_line_size, cr=True)
+    first = True
+    try:
+        async for chunk in response.aiter_bytes():
+            if first and chunk:
+                first = False
+                if chunk.startswith(codecs.BOM_UTF8):
+                    chunk = chunk[len(codecs.BOM_UTF8) :]
+            for line in lines.feed(chunk):
+                event = decoder.decode(line.decode("utf-8", "replace"))
+                if event is not None:
+                    yield event
+    finally:
+        # An event cut short by the end of the stream is discarded.
+        decoder.reset()
+
+
+async def sse(
+    url: str,
+    *,
+    method: str = "GET",
+    session: Session | None = None,
+    last_event_id: str | None = None,
+    reconnect: bool = True,
+    max_reconnects: int | None = None,
+    reconnect_delay: float = DEFAULT_RECONNECT_DELAY,
+    max_line_size: int = MAX_LINE_SIZE,
+    **kwargs: Any,
+) -> AsyncIterator[ServerSentEvent]:
+    """
+    Subscribes to a Server-Sent Events stream.
+
+    Like a browser's EventSource, the connection is reopened when the stream
+    ends or fails, after the delay set by the server's ``retry:`` field
+    (``reconnect_delay`` until then), with the ID of the last event received in
+    a ``Last-Event-ID`` header. A 204 response ends the subscription; error
+    statuses raise requests.exceptions.HTTPError, as raise_for_status() does.
+
+    Usage:
+        async for event in areq.sse("https://example.com/events"):
+            print(event.event, event.data)
+
+    Args:
+        url: URL of the event stream.
+        method: HTTP method.
+        session: Session to connect through. Defaults to the shared default
+            session.
+        last_event_id: Event ID to resume after.
+        reconnect: Reconnect when the stream ends or the connection fails.
+        max_reconnects: Consecutive reconnections, without receiving an event,
+            before giving up. None retries forever.
+        reconnect_delay: Seconds to wait before reconnecting.
+        max_line_size: Longest line to buffer, in bytes; ValueError beyond.
+        **kwargs: Passed to Session.request(). The read timeout defaults to
+            none, since streams may be quiet for long.
+    """
+    if session is None:
+        session = get_default_session()
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers.setdefault("Accept", "text/event-stream")
+    headers.setdefault("Cache-Control", "no-cache")
+    kwargs.setdefault("timeout", httpx.Timeout(5.0, read=None))
+    decoder = SSEDecoder(last_event_id)
+    failures = 0
+    while True:
+        if decoder.last_event_id is not None:
+            headers["Last-Event-ID"] = decoder.last_event_id
+        error: Exception | None = None
+        try:
+            response = await session.request(
+                method, url, stream=True, headers=headers, **kwargs
+            )
+            try:
+                if response.status_code == 204:
+                    return
+                response.raise_for_status()
+                async for event in iter_events(response, decoder, max_line_size):
+                    failures = 0
+                    yield event
+            finally:
+                await response.aclose()
+        except AreqDeadlineExceeded:
+            # The caller's budget is spent: reconnecting cannot help.
+            raise
+        except (AreqConnectionError, AreqTimeout) as e:
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired:
+                raise deadline.exceeded() from e
+            error = e
+        if not reconnect:
+            if error is not None:
+                raise error
+            return
+        failures += 1
+        if max_reconnects is not None and failures > max_reconnects:
+            if error is not None:
+                raise error
+            return
+        delay = reconnect_delay if decoder.retry is None else decoder.retry / 1000
+        await asyncio.sleep(delay)
@@ -1,5 +1,6 @@
+import functools
 from collections import OrderedDict
-from typing import Type, TypeVar, Union
+from typing import Callable, Type, TypeVar, Union
 
 import httpx
 import requests.exceptions
@@ -39,8 +40,10 @@ class AreqException(requests.exceptions.RequestException):
     """
 
     underlying_exception: SupportedHttpxError
-    request: AreqRequest | None = None
-    response: AreqResponse | None = None
+    # Wrapped on first access: most handlers only look at the exception type,
+    # and building the wrappers copies headers and body.
+    _request: AreqRequest | None = None
+    _response: AreqResponse | None = None
 
     def __init__(self, error: SupportedHttpxError, *args, **kwargs):
         """
@@ -53,50 +56,59 @@ class AreqException(requests.exceptions.RequestException):
         """
         self.underlying_exception = error
 
-        # Ensure self.request is an AreqRequest instance
-        httpx_req_obj = getattr(error, "request", None)
-        self.request = create_areq_request(httpx_req_obj)
-
-        # Ensure self.response is an AreqResponse instance
-        httpx_resp_obj = getattr(error, "response", None)
-        self.response = create_areq_response(httpx_resp_obj)
-
-        # Pass message and request to parent RequestException
+        # Pass message to parent RequestException. request/response are only
+        # forwarded when given explicitly; otherwise they are derived lazily.
         if not args:
             args_to_parent = (str(error),)
         else:
             args_to_parent = args
 
-        kwargs_to_parent = kwargs.copy()
-        if "request" not in kwargs_to_parent:
-            kwargs_to_parent["request"] = self.request
-
-        super().__init__(*args_to_parent, **kwargs_to_parent)
+        super().__init__(*args_to_parent, **kwargs)
         self.__cause__ = error
 
+    @property
+    def request(self) -> AreqRequest | None:
+        if self._request is None:
+            self._request = create_areq_request(
+                _error_attribute(self.underlying_exception, "request")
+            )
+        return self._request
+
+    @request.setter
+    def request(self, request: AreqRequest | None) -> None:
+        # None (what requests.RequestException.__init__ assigns by default)
+        # leaves the request to be derived from the underlying error.
+        self._request = request
+
+    @property
+    def response(self) -> AreqResponse | None:
+        if self._response is None:
+            self._response = create_areq_response(
+                _error_attribute(self.underlying_exception, "response")
+            )
+        return self._response
+
+    @response.setter
+    def response(self, response: AreqResponse | None) -> None:
+        self._response = response
+
+
+def _error_attribute(error: SupportedHttpxError, name: str):
+    # httpx raises RuntimeError, not AttributeError, for an unset .request.
+    try:
+        return getattr(error, name, None)
+    except RuntimeError:
+        return None
+
 
 class AreqHTTPError(AreqException, requests.exceptions.HTTPError):
     """
     Wraps an httpx.HTTPStatusError, mimicking requests.exceptions.HTTPError.
     """
 
-    response: AreqResponse | None = (
-        None  # Overrides requests.HTTPError.response for type
-    )
-
     def __init__(self, error: httpx.HTTPStatusError):
-        # Convert httpx response to AreqResponse
-        areq_response = create_areq_response(error.response)
-
-        # Initialize AreqException (which sets self.request and self.underlying_exception)
-        # and requests.exceptions.HTTPError
-        super().__init__(
-            error, response=areq_response
-        )  # Calls AreqException then HTTPError
-        self.response = areq_response  # Ensure self.response is the AreqResponse
-
-        # Note: self.request is set by AreqException's __init__
-        # self.__cause__ is set by AreqException's __init__
+        # self.response and self.request are wrapped from error on first access.
+        super().__init__(error)  # Calls AreqException then HTTPError
 
 
 class AreqConnectionError(AreqException, requests.exceptions.ConnectionError):
@@ -128,6 +140,25 @@ class AreqTimeout(AreqException, requests.exceptions.Timeout):
         super().__init__(error)
 
 
+class AreqDeadlineExceeded(AreqTimeout):
+    """
+    Raised when the budget of an ``areq.deadline()`` scope is spent: by requests
+    made after it ran out, by requests in flight when it did, and by the scope
+    itself. Never retried.
+    """
+
+    def __init__(self, error: httpx.TimeoutException, timeout: float | None = None):
+        """
+        Initializes the AreqDeadlineExceeded exception.
+
+        Args:
+            error: Synthetic httpx.TimeoutException, carrying the request if any.
+            timeout: Budget of the deadline scope, in seconds.
+        """
+        super().__init__(error)
+        self.timeout = timeout
+
+
 class AreqConnectTimeout(
     AreqTimeout, AreqConnectionError, requests.exceptions.ConnectTimeout
 ):
@@ -185,8 +216,6 @@ class AreqTooManyRedirects(AreqException, requests.exceptions.TooManyRedirects):
     Wraps httpx too many redirects errors, mimicking requests.exceptions.TooManyRedirects.
     """
 
-    response: AreqResponse | None = None  # Can be None
-
     def __init__(self, error: httpx.TooManyRedirects):
         # httpx.TooManyRedirects doesn't have a response attribute
         super().__init__(error)  # Just pass the error, no response
@@ -247,6 +276,58 @@ class AreqProxyError(AreqConnectionError, requests.exceptions.ProxyError):
         super().__init__(error)
 
 
+class AreqCircuitOpen(AreqConnectionError):
+    """
+    Raised without touching the network while the circuit breaker of the
+    request's upstream is open. Caught by ``except requests.ConnectionError``
+    like any other failure to reach the host.
+    """
+
+    def __init__(
+        self,
+        error: httpx.ConnectError,
+        key: object = None,
+        retry_after: float | None = None,
+    ):
+        """
+        Initializes the AreqCircuitOpen exception.
+
+        Args:
+            error: Synthetic httpx.ConnectError carrying the request.
+            key: Circuit key, by default the host.
+            retry_after: Seconds until the circuit lets a probe request through.
+        """
+        super().__init__(error)
+        self.key = key
+        self.retry_after = retry_after
+
+
+class AreqContentTooLarge(AreqException):
+    """
+    Raised when a response body exceeds ``max_content_size``. The connection is
+    closed instead of being drained; ``response`` still carries the status and
+    headers. Not retried, and not a failure for circuit breakers.
+    """
+
+    def __init__(
+        self,
+        error: httpx.TransportError,
+        response: AreqResponse | None = None,
+        max_content_size: int | None = None,
+    ):
+        """
+        Initializes the AreqContentTooLarge exception.
+
+        Args:
+            error: Synthetic httpx.TransportError carrying the request.
+            response: The response whose body was too large, not read.
+            max_content_size: The limit that was exceeded, in bytes.
+        """
+        super().__init__(error)
+        self.response = response
+        self.max_content_size = max_content_size
+
+
 class AreqContentDecodingError(AreqException, requests.exceptions.ContentDecodingError):
     """
     Wraps httpx content decoding errors, mimicking requests.exceptions.ContentDecodingError.
@@ -339,6 +420,22 @@ def is_error_type(
     return isinstance(error, error_type)
 
 
+@functools.lru_cache(maxsize=None)
+def _converter_for(error_type: type) -> Callable[..., AreqException]:
+    """
+    Returns the converter for an httpx error class.
+
+    Resolved once per class, in mapper order, so the conversion of every later
+    error of that class is a single dict lookup. Call
+    ``_converter_for.cache_clear()`` after modifying ``mapper``.
+    """
+    for mapped_type, converter in mapper.items():
+        if issubclass(error_type, mapped_type):
+            return converter
+    # Absolute fallback for any httpx.HTTPError not specifically mapped
+    return AreqException
+
+
 def convert_httpx_to_areq_exception(
     error: httpx.HTTPError | httpx.InvalidURL,
 ) -> AreqException:
@@ -354,10 +451,4 @@ def convert_httpx_to_areq_exception(
     Note:
         If the error type is not found in the mapper, returns a base AreqException
     """
-    for error_type, converter in mapper.items():
-        if isinstance(error, error_type):
-            # After isinstance check, we know error is of type error_type
-            return converter(error)  # type: ignore[arg-type]
-
-    # Absolute fallback for any httpx.HTTPError not specifically mapped
-    return AreqException(error)
+    return _converter_for(type(error))(error)
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Collection, Hashable
+
+import httpx
+
+from .models import AreqResponse
+from .retry import Retry, RetryBudget
+
+
+def _fork(request: httpx.Request) -> httpx.Request:
+    # Hooks and deadlines write to a request's extensions while it is sent,
+    # so concurrent attempts each get their own copy. The body is shared:
+    # uploads that can only be read once are never hedged.
+    fork = httpx.Request(
+        request.method,
+        request.url,
+        headers=request.headers,
+        stream=request.stream,
+        extensions=dict(request.extensions),
+    )
+    if hasattr(request, "_content"):
+        fork._content = request._content
+    return fork
+
+
+class Hedge:
+    """
+    Hedged requests: if an idempotent request has not received its response
+    headers after ``delay`` seconds, a duplicate is sent and whichever answers
+    first wins. The loser is cancelled.
+
+    The delay is either fixed or, with ``percentile``, derived per host from the
+    latencies of recent requests (e.g. 0.95 hedges the slowest 5%). A budget
+    caps the extra load: by default hedges may not exceed 10% of requests.
+
+    Usage:
+        async with areq.Session(hedge=areq.Hedge(percentile=0.95)) as session:
+            ...
+        await areq.get(url, hedge=0.05)  # hedge after 50ms
+    """
+
+    def __init__(
+        self,
+        delay: float | None = None,
+        *,
+        percentile: float | None = None,
+        min_samples: int = 20,
+        sample_size: int = 500,
+        min_delay: float = 0.005,
+        max_hedges: int = 1,
+        methods: Collection[str] = Retry.DEFAULT_ALLOWED_METHODS,
+        budget: RetryBudget | None = None,
+    ):
+        """
+        Initializes the Hedge policy.
+
+        Args:
+            delay: Seconds to wait for the response headers before hedging. With
+                ``percentile``, the delay used until enough latencies were seen.
+            percentile: Derive the delay from this percentile (0-1) of the recent
+                latencies of the request's host.
+            min_samples: Latencies needed before ``percentile`` is used.
+            sample_size: Number of recent latencies kept per host.
+            min_delay: Lower bound for the derived delay.
+            max_hedges: Maximum number of duplicates per request.
+            methods: Methods that may be hedged. Only idempotent methods
+                should be listed.
+            budget: RetryBudget capping hedges to a fraction of requests.
+                Defaults to 10% of requests plus a small allowance.
+        """
+        if delay is None and percentile is None:
+            raise ValueError("Either delay or percentile is required")
+        if percentile is not None and not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.sample_size = sample_size
+        self.min_delay = min_delay
+        self.max_hedges = max_hedges
+        self.methods = frozenset(method.upper() for method in methods)
+        self.budget = (
+            RetryBudget(ratio=0.1, min_retries=5) if budget is None else budget
+        )
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: dict[Hashable, deque[float]] = {}
+        self._delays: dict[Hashable, float] = {}
+        # Samples recorded per host since its delay was last computed.
+        self._stale: dict[Hashable, int] = {}
+
+    @classmethod
+    def from_value(cls, hedge: "Hedge | float | None") -> "Hedge | None":
+        """Builds a Hedge from the value of a ``hedge=`` argument."""
+        if hedge is None or isinstance(hedge, Hedge):
+            return hedge
+        return cls(delay=hedge)
+
+    def record(self, host: Hashable, latency: float) -> None:
+        latencies = self._latencies.get(host)
+        if latencies is None:
+            latencies = self._latencies[host] = deque(maxlen=self.sample_size)
+        latencies.append(latency)
+        self._stale[host] = self._stale.get(host, 0) + 1
+
+    def get_delay(self, host: Hashable) -> float | None:
+        """Returns the hedging delay for a host."""
+        if self.percentile is None:
+            return self.delay
+        latencies = self._latencies.get(host)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.delay
+        # Sorting on every request would cost more than hedging saves; refresh
+        # the percentile once a tenth of the samples are new.
+        delay = self._delays.get(host)
+        if delay is None or self._stale[host] >= max(1, self.sample_size // 10):
+            ordered = sorted(latencies)
+            value = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+            delay = self._delays[host] = max(self.min_delay, value)
+            self._stale[host] = 0
+        return delay
+
+    async def call(
+        self,
+        request: httpx.Request,
+        send: Callable[[httpx.Request], Awaitable[AreqResponse]],
+    ) -> AreqResponse:
+        """
+        Sends ``request`` through ``send``, hedging it if it is slow. Each
+        hedged attempt is sent as a copy of ``request``.
+
+        ``send`` should return as soon as the response headers arrive (a
+        streamed response), so that a slow body is not mistaken for a slow
+        server.
+        """
+        if request.method not in self.methods:
+            return await send(request)
+        self.requests += 1
+        self.budget.deposit()
+        host = request.url.host
+        delay = self.get_delay(host)
+
+        started: dict[asyncio.Future, float] = {}
+
+        def launch() -> None:
+            started[asyncio.ensure_future(send(_fork(request)))] = time.monotonic()
+
+        launch()
+        first = next(iter(started))
+        winner: asyncio.Future | None = None
+        error: BaseException | None = None
+        try:
+            while winner is None:
+                pending = [task for task in started if not task.done()]
+                if not pending:
+                    # Every attempt failed; report the first failure.
+                    assert error is not None
+                    raise error
+                can_hedge = delay is not None and len(started) <= self.max_hedges
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if self.budget.withdraw():
+                        self.hedges += 1
+                        launch()
+                    else:
+                        delay = None
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    if error is None:
+                        error = task.exception()
+            self.record(host, time.monotonic() - started[winner])
+            if winner is not first:
+                self.hedge_wins += 1
+            return winner.result()
+        finally:
+            losers = [task for task in started if task is not winner]
+            for task in losers:
+                task.cancel()
+            # Wait for the cancelled attempts to release their connections.
+            await asyncio.gather(*losers, return_exceptions=True)
+            for task in losers:
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
@@ -0,0 +1,228 @@
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+import httpx
+
+from .exceptions import AreqException
+from .models import AreqResponse
+
+REQUEST_START = "request_start"
+CONNECTION_ACQUIRED = "connection_acquired"
+HEADERS_RECEIVED = "headers_received"
+RESPONSE_COMPLETE = "response_complete"
+EXCEPTION = "exception"
+HOOK_EVENTS = (
+    REQUEST_START,
+    CONNECTION_ACQUIRED,
+    HEADERS_RECEIVED,
+    RESPONSE_COMPLETE,
+    EXCEPTION,
+)
+
+# httpcore steps that mean the request now holds a connection: either a new one
+# is being opened, or an existing one starts carrying the request.
+_ACQUIRING_STEPS = frozenset(
+    ["connect_tcp", "send_connection_init", "send_request_headers"]
+)
+
+Hook = Callable[["RequestEvent"], Any]
+Hooks = dict[str, list[Hook]]
+
+
+@dataclass
+class RequestTimings:
+    """
+    time.perf_counter() timestamps of the phases of one request attempt.
+
+    Phases a request did not go through (e.g. connect and TLS on a reused
+    connection) stay None, as do the derived durations.
+    """
+
+    start: float
+    connection_acquired: float | None = None
+    connect_started: float | None = None
+    connect_complete: float | None = None
+    tls_started: float | None = None
+    tls_complete: float | None = None
+    request_sent: float | None = None
+    headers_received: float | None = None
+    complete: float | None = None
+
+    @staticmethod
+    def _span(begin: float | None, end: float | None) -> float | None:
+        return None if begin is None or end is None else end - begin
+
+    @property
+    def pool_wait(self) -> float | None:
+        """Time spent waiting for the pool to hand out a connection."""
+        return self._span(self.start, self.connection_acquired)
+
+    @property
+    def connect(self) -> float | None:
+        """DNS resolution and TCP connect of a new connection."""
+        return self._span(self.connect_started, self.connect_complete)
+
+    @property
+    def tls(self) -> float | None:
+        return self._span(self.tls_started, self.tls_complete)
+
+    @property
+    def time_to_first_byte(self) -> float | None:
+        """Time from the start of the request until the response headers."""
+        return self._span(self.start, self.headers_received)
+
+    @property
+    def server(self) -> float | None:
+        """Time between sending the request and receiving the headers."""
+        return self._span(self.request_sent, self.headers_received)
+
+    @property
+    def download(self) -> float | None:
+        return self._span(self.headers_received, self.complete)
+
+    @property
+    def total(self) -> float | None:
+        return self._span(self.start, self.complete)
+
+
+@dataclass
+class RequestEvent:
+    """Payload passed to every hook."""
+
+    name: str
+    request: httpx.Request
+    timings: RequestTimings
+    status_code: int | None = None
+    bytes_sent: int | None = None
+    bytes_received: int | None = None
+    response: AreqResponse | None = None
+    exception: AreqException | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def method(self) -> str:
+        return self.request.method
+
+    @property
+    def host(self) -> str:
+        return self.request.url.host
+
+
+def normalize_hooks(hooks: Mapping[str, Hook | Iterable[Hook]] | None) -> Hooks:
+    """Turns a {event: hook or [hooks]} mapping into {event: [hooks]}."""
+    normalized: Hooks = {}
+    for name, value in (hooks or {}).items():
+        if name not in HOOK_EVENTS:
+            raise ValueError(
+                f"Unknown hook event {name!r}, expected one of {', '.join(HOOK_EVENTS)}"
+            )
+        normalized[name] = [value] if callable(value) else list(value)
+    return normalized
+
+
+def merge_hooks(session_hooks: Hooks, request_hooks: Hooks) -> Hooks:
+    if not request_hooks:
+        return session_hooks
+    merged = {name: list(hooks) for name, hooks in session_hooks.items()}
+    for name, hooks in request_hooks.items():
+        merged.setdefault(name, []).extend(hooks)
+    return merged
+
+
+class RequestTracer:
+    """
+    Follows one request attempt through httpcore's ``trace`` extension and
+    dispatches the lifecycle events to hooks.
+
+    Only created when hooks are registered, so un-instrumented requests pay
+    nothing for it.
+    """
+
+    def __init__(self, request: httpx.Request, hooks: Hooks):
+        self.request = request
+        self.hooks = hooks
+        self.timings = RequestTimings(start=time.perf_counter())
+        self.status_code: int | None = None
+        self._user_trace = request.extensions.get("trace")
+        request.extensions["trace"] = self.trace
+        content_length = request.headers.get("content-length")
+        self.bytes_sent = int(content_length) if content_length else None
+
+    async def emit(self, name: str, **fields: Any) -> None:
+        hooks = self.hooks.get(name)
+        if not hooks:
+            return
+        event = RequestEvent(
+            name=name,
+            request=self.request,
+            timings=self.timings,
+            status_code=self.status_code,
+            bytes_sent=self.bytes_sent,
+            **fields,
+        )
+        for hook in hooks:
+            result = hook(event)
+            if inspect.isawaitable(result):
+                await result
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        step, _, state = event_name.partition(".")[2].rpartition(".")
+        timings = self.timings
+        if (
+            timings.connection_acquired is None
+            and step in _ACQUIRING_STEPS
+            and state == "started"
+        ):
+            timings.connection_acquired = now
+            await self.emit(CONNECTION_ACQUIRED)
+        if step == "connect_tcp":
+            if state == "started":
+                timings.connect_started = now
+            elif state == "complete":
+                timings.connect_complete = now
+        elif step == "start_tls":
+            if state == "started":
+                timings.tls_started = now
+            elif state == "complete":
+                timings.tls_complete = now
+        elif step == "send_request_body" and state == "complete":
+            timings.request_sent = now
+        elif step == "receive_response_headers" and state == "complete":
+            timings.headers_received = now
+            # (http_version, status, reason, headers) for HTTP/1.1,
+            # (status, headers) for HTTP/2.
+            return_value = info.get("return_value") or ()
+            status = return_value[1] if len(return_value) == 4 else return_value[0]
+            self.status_code = status
+            await self.emit(HEADERS_RECEIVED)
+        if self._user_trace is not None:
+            await self._user_trace(event_name, info)
+
+    def detach(self) -> None:
+        """Restores the request's own trace callback, e.g. before a retry."""
+        if self._user_trace is None:
+            self.request.extensions.pop("trace", None)
+        else:
+            self.request.extensions["trace"] = self._user_trace
+
+    async def started(self) -> None:
+        await self.emit(REQUEST_START)
+
+    async def completed(self, response: AreqResponse) -> None:
+        self.timings.complete = time.perf_counter()
+        self.status_code = response.status_code
+        if self.timings.headers_received is None:
+            # Transports that do not trace (mocks, custom transports).
+            self.timings.headers_received = self.timings.complete
+        await self.emit(
+            RESPONSE_COMPLETE,
+            response=response,
+            bytes_received=response.httpx_response.num_bytes_downloaded,
+        )
+
+    async def failed(self, exception: AreqException) -> None:
+        self.timings.complete = time.perf_counter()
+        await self.emit(EXCEPTION, exception=exception)
@@ -0,0 +1,215 @@
+import bisect
+from collections import Counter
+from typing import Any, Sequence
+
+from .hooks import EXCEPTION, RESPONSE_COMPLETE, Hooks, RequestEvent
+
+# Seconds. Same boundaries as the Prometheus client defaults.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+class Histogram:
+    """A fixed-bucket histogram, cheap enough to update on every request."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket, plus the +Inf bucket.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimates a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip(self.buckets, self.counts)),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsCollector:
+    """
+    Aggregates request latencies from Session hooks into per-endpoint histograms.
+
+    Series are keyed on (host, method, status), so the number of series stays
+    bounded by the number of origins a program talks to, not by its URLs.
+
+    Usage:
+        metrics = areq.MetricsCollector()
+        async with areq.Session(hooks=metrics.hooks) as session:
+            await session.get("https://example.com")
+        print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initializes the MetricsCollector.
+
+        Args:
+            buckets: Upper bounds, in seconds, of the latency histogram buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.durations: dict[tuple[str, str, int], Histogram] = {}
+        self.time_to_first_byte: dict[tuple[str, str, int], Histogram] = {}
+        self.pool_wait: dict[str, Histogram] = {}
+        self.bytes_sent: Counter[str] = Counter()
+        self.bytes_received: Counter[str] = Counter()
+        self.errors: Counter[tuple[str, str, str]] = Counter()
+
+    @property
+    def hooks(self) -> Hooks:
+        """Hooks to pass to ``Session(hooks=...)``."""
+        return {
+            RESPONSE_COMPLETE: [self.record_response],
+            EXCEPTION: [self.record_exception],
+        }
+
+    def _histogram(self, series: dict, key: Any) -> Histogram:
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self.buckets)
+        return histogram
+
+    def record_response(self, event: RequestEvent) -> None:
+        host, timings = event.host, event.timings
+        key = (host, event.method, event.status_code or 0)
+        if timings.total is not None:
+            self._histogram(self.durations, key).observe(timings.total)
+        if timings.time_to_first_byte is not None:
+            self._histogram(self.time_to_first_byte, key).observe(
+                timings.time_to_first_byte
+            )
+        if timings.pool_wait is not None:
+            self._histogram(self.pool_wait, host).observe(timings.pool_wait)
+        if event.bytes_sent:
+            self.bytes_sent[host] += event.bytes_sent
+        if event.bytes_received:
+            self.bytes_received[host] += event.bytes_received
+
+    def record_exception(self, event: RequestEvent) -> None:
+        self.errors[(event.host, event.method, type(event.exception).__name__)] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the collected metrics as plain, JSON-serializable data."""
+
+        def series(histograms: dict) -> list[dict[str, Any]]:
+            return [
+                {
+                    "labels": list(key) if isinstance(key, tuple) else [key],
+                    **h.snapshot(),
+                }
+                for key, h in histograms.items()
+            ]
+
+        return {
+            "request_duration_seconds": series(self.durations),
+            "time_to_first_byte_seconds": series(self.time_to_first_byte),
+            "pool_wait_seconds": series(self.pool_wait),
+            "bytes_sent": dict(self.bytes_sent),
+            "bytes_received": dict(self.bytes_received),
+            "errors": [
+                {"labels": list(key), "count": count}
+                for key, count in self.errors.items()
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = "areq") -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def histogram(
+            name: str, help: str, label_names: tuple[str, ...], series: dict
+        ) -> None:
+            name = f"{prefix}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, h in series.items():
+                values = key if isinstance(key, tuple) else (key,)
+                labels = ",".join(f'{n}="{v}"' for n, v in zip(label_names, values))
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"{name}_sum{{{labels}}} {h.sum}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        def counter(
+            name: str, help: str, label_names: tuple[str, ...], series: dict
+        ) -> None:
+            name = f"{prefix}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in series.items():
+                values = key if isinstance(key, tuple) else (key,)
+                labels = ",".join(f'{n}="{v}"' for n, v in zip(label_names, values))
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        request_labels = ("host", "method", "status")
+        histogram(
+            "request_duration_seconds",
+            "Time from sending a request until its body was read.",
+            request_labels,
+            self.durations,
+        )
+        histogram(
+            "time_to_first_byte_seconds",
+            "Time from sending a request until its response headers arrived.",
+            request_labels,
+            self.time_to_first_byte,
+        )
+        histogram(
+            "pool_wait_seconds",
+            "Time spent waiting for a pooled connection.",
+            ("host",),
+            self.pool_wait,
+        )
+        counter(
+            "sent_bytes_total", "Request body bytes sent.", ("host",), self.bytes_sent
+        )
+        counter(
+            "received_bytes_total",
+            "Response body bytes received.",
+            ("host",),
+            self.bytes_received,
+        )
+        counter(
+            "errors_total",
+            "Requests that failed with an exception.",
+            ("host", "method", "exception"),
+            self.errors,
+        )
+        return "\n".join(lines) + "\n"
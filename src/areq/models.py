@@ -1,8 +1,18 @@
-from typing import Optional
+import asyncio
+import codecs
+import functools
+import json
+import mmap
+import sys
+import tempfile
+from concurrent.futures import Executor
+from datetime import timedelta
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, Optional, Union
 
 from httpx import (
     Headers as HttpxHeaders,
 )
+from httpx import HTTPError, InvalidURL, ResponseNotRead, TransportError
 from httpx import (
     Request as HttpxRequest,
 )
@@ -11,11 +21,168 @@ from httpx import (
 )
 from requests import Request as RequestsRequest
 from requests import Response as RequestsResponse
+from requests.cookies import RequestsCookieJar, cookiejar_from_dict
+from requests.exceptions import JSONDecodeError as RequestsJSONDecodeError
 from requests.structures import CaseInsensitiveDict
+from requests.utils import iter_slices
 from urllib3 import HTTPResponse
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+ITER_CHUNK_SIZE = 512
+# ajson() may parse bodies at least this large in an executor.
+JSON_OFFLOAD_THRESHOLD = 256 * 1024
+# Chunks copied out of a body spilled to disk when no chunk size is asked for.
+SPILL_CHUNK_SIZE = 64 * 1024
+# orjson turns integers beyond 64 bits into floats without an error; documents
+# with a run of 19 or more digits go to json.loads(), which keeps them exact.
+# Mapping digits to "0" and the rest to " " finds such runs at memchr speed.
+_DIGITS = bytes(48 if 48 <= byte <= 57 else 32 for byte in range(256))
+_LONG_NUMBER = b"0" * 19
+# Longest incomplete line iter_ndjson() and areq.sse() buffer.
+MAX_LINE_SIZE = 16 * 1024 * 1024
+
+_UNSET = object()
+
+
+def _gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)  # Python 3.13+
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+@functools.lru_cache(maxsize=32)
+def _is_utf8(encoding: Optional[str]) -> bool:
+    if not encoding:
+        return False
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+def _loads_json(content: bytes, **kwargs: Any) -> Any:
+    """
+    Parses a UTF-8 JSON document straight from bytes, with orjson when it is
+    installed and no json.loads() options are given.
+
+    Module-level (and so picklable) to run in any executor, including a
+    process pool.
+    """
+    if content[:3] == codecs.BOM_UTF8:
+        content = content[3:]
+    try:
+        if orjson is not None and not kwargs and not _has_long_number(content):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # orjson rejects NaN and Infinity, which json.loads() accepts.
+                pass
+        if isinstance(content, memoryview):
+            # A body spilled to disk; json.loads() only takes bytes and str.
+            content = content.tobytes()
+        return json.loads(content, **kwargs)
+    except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError is a json.JSONDecodeError too.
+        doc = e.doc if isinstance(e.doc, str) else str(content, "utf-8", "replace")
+        raise RequestsJSONDecodeError(e.msg, doc, e.pos)
+
+
+def _has_long_number(content: bytes | memoryview) -> bool:
+    if not isinstance(content, memoryview):
+        return _LONG_NUMBER in content.translate(_DIGITS)
+    # A body spilled to disk is scanned a slice at a time, overlapping so that
+    # no run is split.
+    overlap = len(_LONG_NUMBER) - 1
+    for start in range(0, len(content), SPILL_CHUNK_SIZE):
+        window = bytes(content[start : start + SPILL_CHUNK_SIZE + overlap])
+        if _LONG_NUMBER in window.translate(_DIGITS):
+            return True
+    return False
+
+
+class LineBuffer:
+    """
+    Splits a byte stream into lines as chunks arrive.
+
+    Only the bytes of an incomplete line are kept between chunks, and each
+    chunk is scanned once: the search for the last line break starts where the
+    previous chunk ended. Lines end with LF or CRLF, and with ``cr`` also a lone
+    CR (as in text/event-stream).
+    """
+
+    def __init__(self, max_line_size: int = MAX_LINE_SIZE, cr: bool = False):
+        self.max_line_size = max_line_size
+        self.cr = cr
+        self._buffer = bytearray()
+        # A chunk ended with CR: an LF starting the next one belongs to it.
+        self._after_cr = False
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Returns the lines completed by ``data``, without line breaks."""
+        if self._after_cr and data[:1] == b"\n":
+            data = data[1:]
+        self._after_cr = False
+        buffer = self._buffer
+        start = len(buffer)
+        buffer += data
+        end = buffer.rfind(b"\n", start)
+        if self.cr:
+            end = max(end, buffer.rfind(b"\r", start))
+        if end == -1:
+            if len(buffer) > self.max_line_size:
+                raise ValueError(
+                    f"Line exceeds max_line_size ({self.max_line_size} bytes)"
+                )
+            return []
+        complete = bytes(buffer[: end + 1])
+        del buffer[: end + 1]
+        if self.cr:
+            self._after_cr = complete[-1:] == b"\r"
+            # bytes.splitlines() breaks on LF, CRLF and CR only.
+            return complete.splitlines()
+        lines = complete[:-1].split(b"\n")
+        if b"\r" in complete:
+            lines = [line[:-1] if line[-1:] == b"\r" else line for line in lines]
+        return lines
+
+    def flush(self) -> bytes:
+        """Returns and clears the trailing line that has no line break."""
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        return line
+
+
+def _map_file(file: IO[bytes]) -> memoryview:
+    file.flush()
+    return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
 
 class AreqResponse(RequestsResponse):
+    """
+    A requests.Response backed by an httpx.Response.
+
+    Responses obtained with ``stream=True`` are not read up front. Their body is
+    consumed incrementally with ``iter_content()``/``iter_lines()``, or loaded
+    with ``await response.aread()``, and the connection is released with
+    ``await response.aclose()`` (or ``async with response:``).
+    """
+
+    # Built on first access from the wrapped httpx response; most callers never
+    # touch .raw and many never read .headers or .cookies.
+    _headers: Optional[CaseInsensitiveDict] = None
+    _cookies: Optional[RequestsCookieJar] = None
+    _raw: Any = _UNSET
+    #: True when the response was served by an areq.HTTPCache.
+    from_cache: bool = False
+    # Called once when a streamed response is released; used by Session hooks.
+    _on_close: Optional[Callable[["AreqResponse"], Awaitable[None]]] = None
+    # Set by Session.request from max_content_size= and spill_threshold=.
+    _max_content_size: Optional[int] = None
+    _spill_threshold: Optional[int] = None
+
     def __new__(cls, httpx_response: HttpxResponse):
         return super().__new__(cls)
 
@@ -23,26 +190,386 @@ class AreqResponse(RequestsResponse):
         if httpx_response is None:
             raise ValueError("httpx_response cannot be None")
 
-        super().__init__()
+        # requests.Response.__init__ is deliberately not called: it eagerly
+        # builds an empty header dict and cookie jar that would be discarded.
         self._httpx_response: HttpxResponse = httpx_response
+        self._next = None
+        self.history = []
+        self.elapsed = timedelta(0)
+        self.request = None
         self.status_code = httpx_response.status_code
-        self._content = httpx_response.content
-        self.headers = CaseInsensitiveDict(httpx_response.headers)
         self.url = str(httpx_response.url)
         self.encoding = httpx_response.encoding
         self.reason = httpx_response.reason_phrase
-        self.raw = HTTPResponse(
-            body=httpx_response.content,
-            headers=httpx_response.headers,
-            status=httpx_response.status_code,
-            reason=httpx_response.reason_phrase,
-            preload_content=False,
-        )
+        try:
+            self._content = httpx_response.content
+            self._content_consumed = True
+        except ResponseNotRead:
+            # Streamed response: the body stays on the wire until consumed.
+            self._content = False
+            self._content_consumed = False
 
     @property
     def httpx_response(self) -> HttpxResponse:
         return self._httpx_response
 
+    @property
+    def http_version(self) -> str:
+        """The negotiated protocol, e.g. "HTTP/1.1" or "HTTP/2"."""
+        return self._httpx_response.http_version
+
+    @property
+    def headers(self) -> CaseInsensitiveDict:
+        if self._headers is None:
+            self._headers = CaseInsensitiveDict(self._httpx_response.headers)
+        return self._headers
+
+    @headers.setter
+    def headers(self, headers: CaseInsensitiveDict) -> None:
+        self._headers = headers
+
+    @property
+    def cookies(self) -> RequestsCookieJar:
+        if self._cookies is None:
+            jar = cookiejar_from_dict({})
+            try:
+                httpx_cookies = self._httpx_response.cookies
+            except RuntimeError:
+                # Responses built without a request carry no cookie context.
+                httpx_cookies = None
+            if httpx_cookies is not None:
+                for cookie in httpx_cookies.jar:
+                    jar.set_cookie(cookie)
+            self._cookies = jar
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, cookies: RequestsCookieJar) -> None:
+        self._cookies = cookies
+
+    @property
+    def raw(self) -> Optional[HTTPResponse]:
+        if self._raw is _UNSET:
+            if self._content is False:
+                # Streamed and not read yet; there is nothing to wrap.
+                return None
+            self._raw = HTTPResponse(
+                body=self._content,
+                headers=self._httpx_response.headers,
+                status=self.status_code,
+                reason=self.reason,
+                preload_content=False,
+            )
+        return self._raw
+
+    @raw.setter
+    def raw(self, raw: Optional[HTTPResponse]) -> None:
+        self._raw = raw
+
+    @property
+    def content(self) -> Union[bytes, memoryview]:
+        """
+        The body, as bytes, or as a read-only memoryview of a memory-mapped
+        temporary file for bodies read with ``spill_threshold`` that exceeded
+        it. Use ``bytes(response.content)`` to copy a spilled body to memory.
+        """
+        if self._content is False:
+            if self._content_consumed:
+                raise RuntimeError("The content for this response was already consumed")
+            raise RuntimeError(
+                "The content for this streamed response has not been read. "
+                "Use `await response.aread()` or `response.iter_content()`."
+            )
+        return self._content
+
+    async def aread(self) -> Union[bytes, memoryview]:
+        """
+        Reads and stores the whole body of a streamed response.
+
+        Raises:
+            AreqContentTooLarge: The body exceeds ``max_content_size``.
+        """
+        if self._content is False:
+            if self._content_consumed:
+                raise RuntimeError("The content for this response was already consumed")
+            if self._max_content_size is not None or self._spill_threshold is not None:
+                self._content = await self._read_limited()
+                # Like httpx's aread(), so that the wrapped response has it too.
+                self._httpx_response._content = self._content
+                return self._content
+            self._content_consumed = True
+            try:
+                # Read through httpx, so that the wrapped response has its
+                # content too (e.g. for another AreqResponse built over it).
+                self._content = await self._httpx_response.aread()
+            except (HTTPError, InvalidURL) as e:
+                from .exceptions import convert_httpx_to_areq_exception
+
+                raise convert_httpx_to_areq_exception(e)
+            finally:
+                await self.aclose()
+        return self._content
+
+    async def _read_limited(self) -> Union[bytes, memoryview]:
+        """
+        Reads the body, enforcing ``max_content_size`` through aiter_bytes(),
+        and moves it to a temporary file once it exceeds ``spill_threshold``.
+        """
+        threshold = self._spill_threshold
+        chunks: list[bytes] = []
+        size = 0
+        spill: Optional[IO[bytes]] = None
+        try:
+            async for chunk in self.aiter_bytes():
+                if spill is not None:
+                    await asyncio.to_thread(spill.write, chunk)
+                    continue
+                chunks.append(chunk)
+                size += len(chunk)
+                if threshold is not None and size > threshold:
+                    spill = tempfile.TemporaryFile()
+                    await asyncio.to_thread(spill.writelines, chunks)
+                    chunks = []
+            if spill is None:
+                return b"".join(chunks)
+            # The mapping keeps the (already unlinked) file alive once closed.
+            return await asyncio.to_thread(_map_file, spill)
+        finally:
+            if spill is not None:
+                spill.close()
+
+    def _too_large(self) -> Exception:
+        from .exceptions import AreqContentTooLarge
+
+        limit = self._max_content_size
+        error = TransportError(
+            f"Response body exceeds max_content_size ({limit} bytes)",
+            request=self._httpx_response._request,
+        )
+        return AreqContentTooLarge(error, response=self, max_content_size=limit)
+
+    def json(self, **kwargs: Any) -> Any:
+        """
+        Parses the body as JSON, like requests.Response.json.
+
+        UTF-8 bodies, by far the most common, are parsed straight from bytes
+        (with orjson when it is installed) instead of being decoded to text
+        first. Other encodings go through requests' implementation.
+
+        Raises:
+            requests.exceptions.JSONDecodeError: The body is not valid JSON.
+        """
+        content = self.content
+        if content and _is_utf8(self.encoding):
+            try:
+                return _loads_json(content, **kwargs)
+            except UnicodeDecodeError:
+                # The stdlib rejects invalid UTF-8, requests replaces it.
+                pass
+        return super().json(**kwargs)
+
+    async def ajson(self, executor: Optional[Executor] = None, **kwargs: Any) -> Any:
+        """
+        Reads the body, if it was streamed, and parses it as JSON.
+
+        Bodies of JSON_OFFLOAD_THRESHOLD bytes or more are parsed in an
+        executor: ``executor`` if given, else the default thread pool on
+        free-threaded Python builds. With the GIL, parsers hold it for the whole
+        document, so a worker thread would not let the loop run in the
+        meantime and large bodies are parsed inline. ``executor`` may be a
+        ProcessPoolExecutor, at the cost of pickling the result back.
+
+        Args:
+            executor: concurrent.futures executor to parse large bodies in.
+            **kwargs: Passed to json.loads().
+        """
+        content = await self.aread()
+        if (
+            len(content) < JSON_OFFLOAD_THRESHOLD
+            or not _is_utf8(self.encoding)
+            or (executor is None and _gil_enabled())
+        ):
+            return self.json(**kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                executor, functools.partial(_loads_json, content, **kwargs)
+            )
+        except UnicodeDecodeError:
+            return super().json(**kwargs)
+
+    async def aiter_bytes(
+        self, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Iterates over the decoded response body.
+
+        Args:
+            chunk_size: Size of the yielded chunks. None yields data as it arrives.
+        """
+        if isinstance(self._content, memoryview):
+            # Spilled to disk: copy one chunk at a time out of the mapping.
+            for chunk in iter_slices(self._content, chunk_size or SPILL_CHUNK_SIZE):
+                yield chunk.tobytes()
+            return
+        if self._content is not False:
+            if chunk_size is None:
+                if self._content:
+                    yield self._content
+            else:
+                for chunk in iter_slices(self._content, chunk_size):
+                    yield chunk
+            return
+
+        if self._content_consumed:
+            raise RuntimeError("The content for this response was already consumed")
+        self._content_consumed = True
+        limit = self._max_content_size
+        try:
+            if limit is not None:
+                declared = self._httpx_response.headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > limit:
+                    raise self._too_large()
+            received = 0
+            async for chunk in self._httpx_response.aiter_bytes(chunk_size):
+                if limit is not None:
+                    # Counted after decompression, which also stops zip bombs.
+                    received += len(chunk)
+                    if received > limit:
+                        raise self._too_large()
+                yield chunk
+        except (HTTPError, InvalidURL) as e:
+            # Imported here, exceptions.py depends on this module.
+            from .exceptions import convert_httpx_to_areq_exception
+
+            raise convert_httpx_to_areq_exception(e)
+        finally:
+            await self.aclose()
+
+    async def iter_content(
+        self, chunk_size: Optional[int] = 1, decode_unicode: bool = False
+    ) -> AsyncIterator[Any]:
+        """
+        Async counterpart of requests.Response.iter_content.
+
+        Args:
+            chunk_size: Number of bytes per chunk. None yields data as it arrives.
+            decode_unicode: Decode chunks to str using the response encoding.
+        """
+        if chunk_size is not None and not isinstance(chunk_size, int):
+            raise TypeError(
+                f"chunk_size must be an int, it is instead a {type(chunk_size)}."
+            )
+
+        if not decode_unicode or self.encoding is None:
+            async for chunk in self.aiter_bytes(chunk_size):
+                yield chunk
+            return
+
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        async for chunk in self.aiter_bytes(chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    async def iter_lines(
+        self,
+        chunk_size: Optional[int] = ITER_CHUNK_SIZE,
+        decode_unicode: bool = False,
+        delimiter: Any = None,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of requests.Response.iter_lines."""
+        pending = None
+
+        async for chunk in self.iter_content(
+            chunk_size=chunk_size, decode_unicode=decode_unicode
+        ):
+            if pending is not None:
+                chunk = pending + chunk
+
+            if delimiter:
+                lines = chunk.split(delimiter)
+            else:
+                lines = chunk.splitlines()
+
+            if lines and lines[-1] and chunk and lines[-1][-1] == chunk[-1]:
+                pending = lines.pop()
+            else:
+                pending = None
+
+            for line in lines:
+                yield line
+
+        if pending is not None:
+            yield pending
+
+    async def iter_ndjson(
+        self, max_line_size: int = MAX_LINE_SIZE, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Parses a newline-delimited JSON body (NDJSON, JSON Lines) one document
+        at a time as it arrives. Blank lines are skipped.
+
+        Lines are parsed straight from bytes like json(). Only the incomplete
+        last line is buffered between chunks.
+
+        Args:
+            max_line_size: Longest line to buffer, in bytes; ValueError beyond.
+            **kwargs: Passed to json.loads().
+
+        Raises:
+            requests.exceptions.JSONDecodeError: A line is not valid JSON.
+        """
+        lines = LineBuffer(max_line_size)
+        # Per-line calls dominate: go straight to the parser when possible,
+        # and through _loads_json() for its BOM handling and error type.
+        loads = orjson.loads if orjson is not None and not kwargs else None
+        tail = b""
+        async for chunk in self.aiter_bytes():
+            # Once a long digit run shows up (within a chunk or across two),
+            # every later line goes through _loads_json().
+            if loads is not None and _has_long_number(tail + chunk):
+                loads = None
+            tail = chunk[-len(_LONG_NUMBER) + 1 :]
+            for line in lines.feed(chunk):
+                if not line or line.isspace():
+                    continue
+                if loads is None:
+                    yield _loads_json(line, **kwargs)
+                    continue
+                try:
+                    document = loads(line)
+                except ValueError:
+                    document = _loads_json(line)
+                yield document
+        line = lines.flush()
+        if line and not line.isspace():
+            yield _loads_json(line, **kwargs)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.iter_content(128)
+
+    async def aclose(self) -> None:
+        """Releases the connection held by the response."""
+        await self._httpx_response.aclose()
+        if self._on_close is not None:
+            on_close, self._on_close = self._on_close, None
+            await on_close(self)
+
+    def close(self) -> None:
+        # A streamed response has no urllib3 raw object; use aclose() instead.
+        if self.raw is not None:
+            super().close()
+
+    async def __aenter__(self) -> "AreqResponse":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
 
 class AreqRequest(RequestsRequest):
     def __new__(cls, httpx_request: HttpxRequest):
@@ -0,0 +1,153 @@
+import time
+import weakref
+from dataclasses import dataclass, field
+
+import httpcore
+import httpx
+
+# How often, at most, a Session with max_connection_lifetime sweeps its pool.
+POOL_SWEEP_INTERVAL = 1.0
+
+
+@dataclass
+class OriginPoolStats:
+    """Connections a Session holds to one origin."""
+
+    origin: str
+    open: int = 0
+    idle: int = 0
+    in_use: int = 0
+    #: Seconds since each open connection was created, oldest first.
+    ages: list[float] = field(default_factory=list)
+    #: Number of open connections per protocol, e.g. {"HTTP/1.1": 4}.
+    http_versions: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class PoolStats:
+    """A snapshot of a Session's connection pool."""
+
+    origins: dict[str, OriginPoolStats]
+    #: Requests waiting for a connection, e.g. because max_connections is hit.
+    queued: int = 0
+
+    @property
+    def open(self) -> int:
+        return sum(stats.open for stats in self.origins.values())
+
+    @property
+    def idle(self) -> int:
+        return sum(stats.idle for stats in self.origins.values())
+
+    @property
+    def in_use(self) -> int:
+        return sum(stats.in_use for stats in self.origins.values())
+
+
+def _http_version(connection: httpcore.AsyncConnectionInterface) -> str | None:
+    # info() reads e.g. "'https://example.com:443', HTTP/1.1, IDLE, Request
+    # Count: 3", or "CONNECTING" before the handshake completes.
+    for part in connection.info().split(", "):
+        if part.startswith("HTTP/"):
+            return part
+    return None
+
+
+class PoolMonitor:
+    """
+    Tracks the connections of the httpcore pools behind an httpx client.
+
+    Each pool's create_connection(), httpcore's extension point for new
+    connections, is wrapped to record the origin and creation time of every
+    connection, which httpcore does not keep.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        transports = [client._transport, *client._mounts.values()]
+        self.pools: list[httpcore.AsyncConnectionPool] = [
+            transport._pool
+            for transport in transports
+            if isinstance(transport, httpx.AsyncHTTPTransport)
+        ]
+        self._connections: weakref.WeakKeyDictionary[
+            httpcore.AsyncConnectionInterface, tuple[str, float]
+        ] = weakref.WeakKeyDictionary()
+        for pool in self.pools:
+            pool.create_connection = self._tracking(pool.create_connection)
+
+    def _tracking(self, create_connection):
+        def create(origin: httpcore.Origin) -> httpcore.AsyncConnectionInterface:
+            connection = create_connection(origin)
+            self._connections[connection] = (str(origin), time.monotonic())
+            return connection
+
+        return create
+
+    def _open_connections(self):
+        for pool in self.pools:
+            for connection in pool.connections:
+                if connection.is_closed():
+                    continue
+                origin, created = self._connections.get(connection, ("unknown", None))
+                yield connection, origin, created
+
+    def stats(self) -> PoolStats:
+        now = time.monotonic()
+        origins: dict[str, OriginPoolStats] = {}
+        for connection, origin, created in self._open_connections():
+            stats = origins.get(origin)
+            if stats is None:
+                stats = origins[origin] = OriginPoolStats(origin)
+            stats.open += 1
+            if connection.is_idle():
+                stats.idle += 1
+            else:
+                stats.in_use += 1
+            if created is not None:
+                stats.ages.append(now - created)
+            version = _http_version(connection)
+            if version is not None:
+                stats.http_versions[version] = stats.http_versions.get(version, 0) + 1
+        for stats in origins.values():
+            stats.ages.sort(reverse=True)
+        # httpcore keeps requests waiting for a connection in _requests.
+        queued = sum(
+            request.is_queued() for pool in self.pools for request in pool._requests
+        )
+        return PoolStats(origins, queued)
+
+    async def close_idle(
+        self, *, older_than: float | None = None, expired: bool = True
+    ) -> int:
+        """
+        Closes idle connections created more than ``older_than`` seconds ago,
+        and, with ``expired``, those past their keep-alive expiry.
+
+        Like httpcore's own clean-up, connections are taken out of the pool
+        under its lock, so none can be handed to a request while it closes.
+        Returns the number of connections closed.
+        """
+        now = time.monotonic()
+        closed = 0
+        for pool in self.pools:
+            with pool._optional_thread_lock:
+                closing = []
+                for connection in list(pool._connections):
+                    created = self._connections.get(connection, (None, None))[1]
+                    if (
+                        connection.is_idle()
+                        and not connection.is_closed()
+                        and (
+                            (expired and connection.has_expired())
+                            or (
+                                older_than is not None
+                                and created is not None
+                                and now - created >= older_than
+                            )
+                        )
+                    ):
+                        pool._connections.remove(connection)
+                        closing.append(connection)
+            await pool._close_connections(closing)
+            closed += len(closing)
+        return closed
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Collection, Hashable, Mapping
+
+import httpx
+
+from .models import AreqResponse
+from .retry import get_retry_after
+
+_monotonic = time.monotonic
+_sleep = asyncio.sleep
+
+DEFAULT_SLOW_DOWN_STATUSES = frozenset([429, 503])
+
+
+class TokenBucket:
+    """
+    A token bucket refilled at ``rate`` tokens per second, holding up to ``burst``.
+
+    Implemented as a virtual-scheduling (GCRA) bucket: every acquire() reserves
+    the next free slot and then sleeps until it comes up. Callers are therefore
+    served strictly in arrival order, and the bucket admits exactly ``rate``
+    requests per second under sustained load without polling.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.paused_until = 0.0
+        # Theoretical arrival time of the next request.
+        self._tat = 0.0
+        # Total time pauses have pushed the schedule back by.
+        self._shift = 0.0
+
+    @property
+    def _interval(self) -> float:
+        return 1.0 / self.rate
+
+    def _reserve(self, now: float) -> tuple[float, float]:
+        interval = self._interval
+        tat = max(self._tat, now, self.paused_until)
+        admit_at = max(tat - (self.burst - 1) * interval, self.paused_until)
+        self._tat = tat + interval
+        return admit_at, tat
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        now = _monotonic()
+        shift = self._shift
+        admit_at, tat = self._reserve(now)
+        while admit_at > now:
+            try:
+                await _sleep(admit_at - now)
+            except asyncio.CancelledError:
+                # Hand the slot back if nobody reserved after us.
+                tat += self._shift - shift
+                if self._tat == tat + self._interval:
+                    self._tat = tat
+                raise
+            # A pause that started while we slept pushed our slot back by its
+            # length; the slots queued after ours keep their spacing.
+            now = _monotonic()
+            admit_at = max(admit_at + self._shift - shift, self.paused_until)
+            tat += self._shift - shift
+            shift = self._shift
+
+    def pause(self, seconds: float) -> None:
+        """Admits nothing for the next ``seconds``."""
+        now = _monotonic()
+        until = now + seconds
+        start = max(self.paused_until, now)
+        if until <= start:
+            return
+        self.paused_until = until
+        if self._tat > now:
+            # Reserved slots move back by the added pause.
+            self._tat += until - start
+            self._shift += until - start
+
+    def slow_down(self, factor: float, min_rate: float) -> None:
+        self.rate = max(min_rate, self.rate * factor)
+
+    def recover(self, step: float) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + step)
+
+
+class RateLimiter:
+    """
+    Per-host (or per-key) client-side rate limiting with token buckets.
+
+    Every request attempt takes a token from the bucket of its key before it is
+    sent. When the upstream answers 429 or 503, its bucket slows down: it
+    pauses for the duration of a Retry-After header, or halves its rate when
+    there is none, and recovers gradually as successful responses come back.
+
+    Usage:
+        limiter = areq.RateLimiter(10, burst=20, limits={"api.github.com": (5, 5)})
+        async with areq.Session(rate_limit=limiter) as session:
+            ...
+        await areq.get(url, rate_limit=limiter)
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        burst: int | None = None,
+        *,
+        limits: Mapping[Hashable, float | tuple[float, int]] | None = None,
+        key: Callable[[httpx.Request], Hashable] | None = None,
+        slow_down_statuses: Collection[int] = DEFAULT_SLOW_DOWN_STATUSES,
+        slow_down_factor: float = 0.5,
+        min_rate_ratio: float = 0.05,
+        recovery: float = 0.05,
+        max_retry_after: float | None = 300.0,
+    ):
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            rate: Requests per second allowed for each key. None leaves keys
+                without an entry in ``limits`` unlimited.
+            burst: Requests allowed at once after a quiet period. Defaults to
+                max(1, rate).
+            limits: Per-key overrides, each a rate or a (rate, burst) tuple.
+            key: Returns the bucket key of a request. Defaults to its host.
+            slow_down_statuses: Response status codes that slow a bucket down.
+            slow_down_factor: Rate multiplier applied on a slow-down response
+                without a Retry-After header.
+            min_rate_ratio: Slow-downs never take a bucket below this fraction
+                of its configured rate.
+            recovery: Fraction of the configured rate regained per successful
+                response after a slow-down.
+            max_retry_after: Upper bound, in seconds, on a Retry-After pause.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.limits = dict(limits or {})
+        self.key = key or (lambda request: request.url.host)
+        self.slow_down_statuses = frozenset(slow_down_statuses)
+        self.slow_down_factor = slow_down_factor
+        self.min_rate_ratio = min_rate_ratio
+        self.recovery = recovery
+        self.max_retry_after = max_retry_after
+        self._buckets: dict[Hashable, TokenBucket | None] = {}
+
+    def bucket(self, key: Hashable) -> TokenBucket | None:
+        """Returns the bucket of a key, or None if the key is unlimited."""
+        try:
+            return self._buckets[key]
+        except KeyError:
+            pass
+        limit = self.limits.get(key, self.rate)
+        if limit is None:
+            bucket = None
+        else:
+            rate, burst = limit if isinstance(limit, tuple) else (limit, self.burst)
+            bucket = TokenBucket(rate, burst or max(1, int(rate)))
+        self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, request: httpx.Request) -> None:
+        bucket = self.bucket(self.key(request))
+        if bucket is not None:
+            await bucket.acquire()
+
+    def feedback(self, request: httpx.Request, response: AreqResponse) -> None:
+        """Adapts the request's bucket to the upstream's response."""
+        bucket = self.bucket(self.key(request))
+        if bucket is None:
+            return
+        if response.status_code in self.slow_down_statuses:
+            retry_after = get_retry_after(response)
+            if retry_after is not None:
+                if self.max_retry_after is not None:
+                    retry_after = min(retry_after, self.max_retry_after)
+                bucket.pause(retry_after)
+            else:
+                bucket.slow_down(
+                    self.slow_down_factor, bucket.max_rate * self.min_rate_ratio
+                )
+        elif response.status_code < 400:
+            bucket.recover(bucket.max_rate * self.recovery)
+
+    async def call(
+        self, request: httpx.Request, send: Callable[[], Awaitable[AreqResponse]]
+    ) -> AreqResponse:
+        """Sends ``request`` through ``send`` once a token is available."""
+        await self.acquire(request)
+        response = await send()
+        self.feedback(request, response)
+        return response
@@ -0,0 +1,290 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Hashable
+
+import httpx
+
+CASSETTE_VERSION = 1
+
+
+class UnmatchedRequestError(LookupError):
+    """Raised by ReplayTransport for a request the cassette has no answer for."""
+
+    def __init__(self, request: httpx.Request):
+        super().__init__(f"No recorded response for {request.method} {request.url}")
+        self.request = request
+
+
+def _body_hash(content: bytes) -> str | None:
+    if not content:
+        return None
+    return hashlib.sha256(content).hexdigest()[:32]
+
+
+@dataclass
+class Exchange:
+    """One recorded request and its response, body as sent on the wire."""
+
+    method: str
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    #: Seconds from sending the request to the end of the response body.
+    elapsed: float = 0.0
+    http_version: str = "HTTP/1.1"
+    #: Truncated SHA-256 of the request body, None when it was empty.
+    request_body_hash: str | None = None
+
+    def to_json(self) -> str:
+        data = {
+            "method": self.method,
+            "url": self.url,
+            "status": self.status_code,
+            "headers": self.headers,
+            "elapsed": self.elapsed,
+            "http_version": self.http_version,
+        }
+        if self.request_body_hash is not None:
+            data["request_body_hash"] = self.request_body_hash
+        # Text bodies stay readable (and diffable); anything else is base64.
+        try:
+            data["text"] = self.content.decode("utf-8")
+        except UnicodeDecodeError:
+            data["base64"] = base64.b64encode(self.content).decode("ascii")
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> "Exchange":
+        data = json.loads(line)
+        if "text" in data:
+            content = data["text"].encode("utf-8")
+        else:
+            content = base64.b64decode(data.get("base64", ""))
+        return cls(
+            method=data["method"],
+            url=data["url"],
+            status_code=data["status"],
+            headers=[(name, value) for name, value in data["headers"]],
+            content=content,
+            elapsed=data.get("elapsed", 0.0),
+            http_version=data.get("http_version", "HTTP/1.1"),
+            request_body_hash=data.get("request_body_hash"),
+        )
+
+
+def _open(path: Path, mode: str, compressed: bool) -> IO[str]:
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+@dataclass
+class Cassette:
+    """
+    Recorded exchanges stored as JSON Lines, gzipped when the path ends in
+    ``.gz``. The first line is a header carrying the format version.
+
+    Request headers are deliberately not recorded, so that credentials never
+    end up in a cassette.
+    """
+
+    path: Path
+    exchanges: list[Exchange] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "Cassette":
+        path = Path(path)
+        exchanges = []
+        with _open(path, "r", path.suffix == ".gz") as f:
+            header = json.loads(next(f, "{}"))
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version in {path}")
+            for line in f:
+                if line.strip():
+                    exchanges.append(Exchange.from_json(line))
+        return cls(path, exchanges)
+
+    def save(self) -> None:
+        """Writes the cassette atomically."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with _open(tmp, "w", self.path.suffix == ".gz") as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+            for exchange in self.exchanges:
+                f.write(exchange.to_json() + "\n")
+        os.replace(tmp, self.path)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Forwards requests to a real transport and records every exchange.
+
+    Response bodies are read in full, so streamed responses are buffered while
+    recording. The cassette is written when the transport (i.e. the Session)
+    is closed, or explicitly with ``save()``.
+
+    Usage:
+        recorder = areq.RecordingTransport("tests/cassettes/api.jsonl.gz")
+        async with areq.Session(transport=recorder) as session:
+            await session.get("https://api.example.com/users")
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initializes the RecordingTransport.
+
+        Args:
+            path: Cassette file to write. Existing content is replaced.
+            transport: Transport that reaches the network. Defaults to an
+                httpx.AsyncHTTPTransport.
+        """
+        self.cassette = Cassette(Path(path))
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body_hash = _body_hash(await request.aread())
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            # The raw stream: bodies are recorded still content-encoded, and
+            # decoded by the client on replay as they were on the wire.
+            content = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        # Microseconds are all a cassette keeps.
+        elapsed = round(time.perf_counter() - start, 6)
+        http_version = response.extensions.get("http_version", b"HTTP/1.1")
+        self.cassette.exchanges.append(
+            Exchange(
+                method=request.method,
+                url=str(request.url),
+                status_code=response.status_code,
+                headers=[
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in response.headers.raw
+                ],
+                content=content,
+                elapsed=elapsed,
+                http_version=http_version.decode("ascii"),
+                request_body_hash=body_hash,
+            )
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers.raw,
+            stream=httpx.ByteStream(content),
+            extensions=response.extensions,
+        )
+
+    def save(self) -> None:
+        self.cassette.save()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+        self.save()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Answers requests from a cassette, without any network access.
+
+    Requests are matched on method and URL, plus the request body with
+    ``match_body=True``. Exchanges recorded for the same request are replayed
+    in order and, with ``repeat=True``, start over once exhausted, so a short
+    recording can drive a long load test.
+
+    Usage:
+        replay = areq.ReplayTransport("tests/cassettes/api.jsonl.gz", latency=1.0)
+        async with areq.Session(transport=replay) as session:
+            await session.get("https://api.example.com/users")
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette | str | os.PathLike,
+        *,
+        latency: float = 0.0,
+        match_body: bool = False,
+        repeat: bool = True,
+    ):
+        """
+        Initializes the ReplayTransport.
+
+        Args:
+            cassette: A Cassette or the path of a cassette file.
+            latency: Multiplier of the recorded response times: 0 answers
+                immediately, 1.0 reproduces the recorded latency.
+            match_body: Also match requests on their body.
+            repeat: Replay exchanges again once every recording of a request
+                was used. Otherwise further requests raise
+                UnmatchedRequestError.
+        """
+        if not isinstance(cassette, Cassette):
+            cassette = Cassette.load(cassette)
+        self.cassette = cassette
+        self.latency = latency
+        self.match_body = match_body
+        self.repeat = repeat
+        self.replayed = 0
+        self._exchanges: dict[Hashable, list[Exchange]] = {}
+        self._positions: dict[Hashable, int] = {}
+        for exchange in cassette.exchanges:
+            self._exchanges.setdefault(self._key(exchange), []).append(exchange)
+        # Responses are rebuilt from these on every replay; precomputing them
+        # keeps the per-request cost to a dict lookup and a Response().
+        self._prepared = {
+            id(exchange): (
+                [
+                    (name.encode("latin-1"), value.encode("latin-1"))
+                    for name, value in exchange.headers
+                ],
+                {"http_version": exchange.http_version.encode("ascii")},
+            )
+            for exchange in cassette.exchanges
+        }
+
+    def _key(self, exchange: Exchange) -> Hashable:
+        body = exchange.request_body_hash if self.match_body else None
+        return exchange.method, exchange.url, body
+
+    async def _request_key(self, request: httpx.Request) -> Hashable:
+        body = _body_hash(await request.aread()) if self.match_body else None
+        return request.method, str(request.url), body
+
+    def _next(self, key: Hashable) -> Exchange | None:
+        exchanges = self._exchanges.get(key)
+        if not exchanges:
+            return None
+        position = self._positions.get(key, 0)
+        if position >= len(exchanges):
+            if not self.repeat:
+                return None
+            position = 0
+        self._positions[key] = position + 1
+        return exchanges[position]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        exchange = self._next(await self._request_key(request))
+        if exchange is None:
+            raise UnmatchedRequestError(request)
+        if self.latency > 0 and exchange.elapsed > 0:
+            await asyncio.sleep(exchange.elapsed * self.latency)
+        self.replayed += 1
+        headers, extensions = self._prepared[id(exchange)]
+        return httpx.Response(
+            exchange.status_code,
+            headers=headers,
+            stream=httpx.ByteStream(exchange.content),
+            extensions=dict(extensions),
+        )
@@ -0,0 +1,261 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Collection, Type
+
+import httpx
+
+from .deadlines import current_deadline
+from .exceptions import (
+    AreqCircuitOpen,
+    AreqConnectionError,
+    AreqDeadlineExceeded,
+    AreqException,
+    AreqSSLError,
+    AreqTimeout,
+)
+from .models import AreqResponse
+
+# Errors raised before any byte of the request reached the server. Retrying
+# these is safe whatever the method.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _within_deadline(delay: float) -> bool:
+    # No point waiting to retry past the end of the areq.deadline() scope.
+    deadline = current_deadline()
+    return deadline is None or delay < deadline.remaining()
+
+
+def get_retry_after(response: AreqResponse) -> float | None:
+    """Returns the Retry-After delay of a response in seconds, if any."""
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent traffic so that retries cannot multiply
+    the load on an upstream that is already failing.
+
+    Within a sliding ``window`` of seconds, retries are allowed while they stay
+    below ``min_retries`` plus ``ratio`` times the number of requests made. Share
+    one budget (through one Retry instance) between every caller of an upstream.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10.0):
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+    def deposit(self) -> None:
+        """Records a first attempt."""
+        now = time.monotonic()
+        self._expire(now)
+        self._requests.append(now)
+
+    def withdraw(self) -> bool:
+        """Records a retry if the budget allows it. Returns False otherwise."""
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+            return False
+        self._retries.append(now)
+        return True
+
+
+class Retry:
+    """
+    Retry policy for areq requests, modelled on urllib3's Retry.
+
+    Failures are classified with the Areq exception hierarchy. Errors raised
+    before the request was sent (connection refused, connect and pool timeouts)
+    are retried for every method; other errors and retryable status codes only
+    for ``allowed_methods``, which defaults to the idempotent methods.
+
+    Usage:
+        retry = areq.Retry(total=3, backoff_factor=0.2, budget=areq.RetryBudget())
+        async with areq.Session(retries=retry) as session:
+            ...
+        await areq.get(url, retries=5)
+    """
+
+    DEFAULT_ALLOWED_METHODS = frozenset(
+        ["DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"]
+    )
+    DEFAULT_STATUS_FORCELIST = frozenset([429, 502, 503, 504])
+    DEFAULT_RETRY_ON: tuple[Type[AreqException], ...] = (
+        AreqConnectionError,
+        AreqTimeout,
+    )
+    # Certificate problems do not go away by trying again, retrying into an
+    # open circuit defeats it, and a spent deadline stays spent.
+    NEVER_RETRY_ON: tuple[Type[AreqException], ...] = (
+        AreqSSLError,
+        AreqCircuitOpen,
+        AreqDeadlineExceeded,
+    )
+    RETRY_AFTER_STATUS_CODES = frozenset([413, 429, 503])
+
+    def __init__(
+        self,
+        total: int = 3,
+        *,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        status_forcelist: Collection[int] = DEFAULT_STATUS_FORCELIST,
+        allowed_methods: Collection[str] | None = DEFAULT_ALLOWED_METHODS,
+        retry_on: tuple[Type[AreqException], ...] = DEFAULT_RETRY_ON,
+        respect_retry_after_header: bool = True,
+        max_retry_after: float | None = 120.0,
+        budget: RetryBudget | None = None,
+    ):
+        """
+        Initializes the Retry policy.
+
+        Args:
+            total: Maximum number of retries; a request is attempted at most
+                total + 1 times.
+            backoff_factor: Base delay. The n-th retry waits up to
+                backoff_factor * 2 ** (n - 1) seconds.
+            backoff_max: Upper bound for the computed backoff.
+            jitter: Pick the delay uniformly between 0 and the computed backoff
+                ("full jitter") so that clients do not retry in lockstep.
+            status_forcelist: Response status codes that trigger a retry.
+            allowed_methods: Methods retried after the request was sent. None
+                retries every method.
+            retry_on: Areq exception classes that trigger a retry.
+            respect_retry_after_header: Wait for the duration of a Retry-After
+                header on 413, 429 and 503 responses instead of backing off.
+            max_retry_after: Give up rather than honour a Retry-After longer than
+                this many seconds. None honours any value.
+            budget: Shared RetryBudget limiting retries across requests.
+        """
+        if total < 0:
+            raise ValueError("total must not be negative")
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = (
+            None
+            if allowed_methods is None
+            else frozenset(method.upper() for method in allowed_methods)
+        )
+        self.retry_on = retry_on
+        self.respect_retry_after_header = respect_retry_after_header
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    @classmethod
+    def from_value(cls, retries: "Retry | int | None") -> "Retry | None":
+        """Builds a Retry from the value of a ``retries=`` argument."""
+        if retries is None or isinstance(retries, Retry):
+            return retries
+        return cls(total=retries)
+
+    def is_method_retryable(self, method: str) -> bool:
+        return self.allowed_methods is None or method.upper() in self.allowed_methods
+
+    def is_retryable_exception(self, method: str, error: AreqException) -> bool:
+        if isinstance(error, self.NEVER_RETRY_ON) or not isinstance(
+            error, self.retry_on
+        ):
+            return False
+        if isinstance(error.underlying_exception, _NOT_SENT_ERRORS):
+            return True
+        return self.is_method_retryable(method)
+
+    def is_retryable_response(self, method: str, response: AreqResponse) -> bool:
+        return (
+            response.status_code in self.status_forcelist
+            and self.is_method_retryable(method)
+        )
+
+    def get_backoff_time(self, retry_number: int) -> float:
+        """Returns the delay before the given retry (1 for the first retry)."""
+        backoff = min(self.backoff_max, self.backoff_factor * (2 ** (retry_number - 1)))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def get_retry_after(self, response: AreqResponse) -> float | None:
+        """Returns the Retry-After delay of a response in seconds, if any."""
+        return get_retry_after(response)
+
+    def _response_delay(self, method: str, response: AreqResponse, retry_number: int):
+        if not self.is_retryable_response(method, response):
+            return None
+        if (
+            self.respect_retry_after_header
+            and response.status_code in self.RETRY_AFTER_STATUS_CODES
+        ):
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                if (
+                    self.max_retry_after is not None
+                    and retry_after > self.max_retry_after
+                ):
+                    return None
+                return retry_after
+        return self.get_backoff_time(retry_number)
+
+    def _withdraw(self) -> bool:
+        return self.budget is None or self.budget.withdraw()
+
+    async def call(
+        self, method: str, send: Callable[[], Awaitable[AreqResponse]]
+    ) -> AreqResponse:
+        """
+        Calls ``send`` until it succeeds or the policy gives up.
+
+        Returns the last response when retryable status codes persist, and
+        re-raises the last AreqException when retryable errors persist.
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+        retries = 0
+        while True:
+            try:
+                response = await send()
+            except AreqException as e:
+                if not (
+                    retries < self.total and self.is_retryable_exception(method, e)
+                ):
+                    raise
+                delay = self.get_backoff_time(retries + 1)
+                if not (_within_deadline(delay) and self._withdraw()):
+                    raise
+                retries += 1
+            else:
+                if retries >= self.total:
+                    return response
+                delay = self._response_delay(method, response, retries + 1)
+                if delay is None or not _within_deadline(delay) or not self._withdraw():
+                    return response
+                retries += 1
+                await response.aclose()
+            await asyncio.sleep(delay)
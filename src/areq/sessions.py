@@ -0,0 +1,539 @@
+import asyncio
+import time
+from typing import Any, Iterable, Mapping
+from urllib.parse import urlencode
+
+from httpx import AsyncClient, HTTPError, InvalidURL, Limits
+from httpx import Request as HttpxRequest
+from httpx import Response as HttpxResponse
+
+from .cache import HTTPCache
+from .circuit import CircuitBreaker
+from .coalesce import RequestCoalescer
+from .dns import DNSCache, default_dns_cache, install
+from .deadlines import current_deadline
+from .exceptions import AreqException, AreqTimeout, convert_httpx_to_areq_exception
+from .hedge import Hedge
+from .hooks import Hooks, RequestTracer, merge_hooks, normalize_hooks
+from .models import AreqResponse, create_areq_response
+from .pool import POOL_SWEEP_INTERVAL, PoolMonitor, PoolStats
+from .ratelimit import RateLimiter
+from .retry import Retry
+from .uploads import attach_upload, encode_upload, is_form_pairs, is_streaming_body
+
+# Same pool sizing httpx uses by default, spelled out so callers can see and
+# tweak what a Session keeps alive.
+DEFAULT_POOL_CONNECTIONS = 100
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+
+
+def _convert_send_error(
+    error: HTTPError | InvalidURL, request: HttpxRequest
+) -> AreqException:
+    converted = convert_httpx_to_areq_exception(error)
+    deadline = current_deadline()
+    if (
+        deadline is None
+        or not isinstance(converted, AreqTimeout)
+        or not deadline.expired
+    ):
+        return converted
+    # The timeout was cut to the deadline's remaining budget.
+    exceeded = deadline.exceeded(request)
+    exceeded.__cause__ = converted
+    return exceeded
+
+
+class Session:
+    """
+    An async, requests-style session backed by one long-lived httpx.AsyncClient.
+
+    Connections are kept alive and pooled between calls, so repeated requests to
+    the same origin skip the TCP and TLS handshakes. Default headers, auth,
+    cookies and params are applied to every request made through the session.
+
+    Usage:
+        async with areq.Session(headers={"User-Agent": "bot"}) as session:
+            response = await session.get("https://example.com")
+    """
+
+    def __init__(
+        self,
+        *,
+        headers: Any = None,
+        auth: Any = None,
+        cookies: Any = None,
+        params: Any = None,
+        limits: Limits | None = None,
+        max_connections: int | None = DEFAULT_POOL_CONNECTIONS,
+        max_keepalive_connections: int | None = DEFAULT_POOL_MAXSIZE,
+        keepalive_expiry: float | None = DEFAULT_KEEPALIVE_EXPIRY,
+        retries: Retry | int | None = None,
+        cache: HTTPCache | None = None,
+        coalesce: RequestCoalescer | bool = False,
+        hooks: Mapping[str, Any] | None = None,
+        rate_limit: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge: Hedge | float | None = None,
+        dns_cache: DNSCache | bool | None = None,
+        max_connection_lifetime: float | None = None,
+        max_content_size: int | None = None,
+        spill_threshold: int | None = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Initializes the Session.
+
+        Args:
+            headers: Headers sent with every request.
+            auth: Default authentication, e.g. a (user, password) tuple.
+            cookies: Cookies sent with every request.
+            params: Query parameters added to every request.
+            limits: An httpx.Limits instance. Overrides the individual pool
+                arguments below when given.
+            max_connections: Maximum number of concurrent connections.
+            max_keepalive_connections: Maximum number of idle connections kept
+                in the pool.
+            keepalive_expiry: Seconds an idle connection is kept before closing.
+            retries: Default retry policy, a Retry or a number of retries.
+            cache: HTTPCache answering GET requests before they hit the network.
+            coalesce: Share one call between identical concurrent idempotent
+                requests. True uses a default RequestCoalescer.
+            hooks: Lifecycle hooks, a mapping of event name (see
+                ``areq.HOOK_EVENTS``) to a callable or a list of callables. Hooks
+                receive an ``areq.RequestEvent`` and may be coroutine functions.
+            rate_limit: RateLimiter every request attempt takes a token from.
+            circuit_breaker: CircuitBreaker failing requests to unhealthy hosts
+                fast with AreqCircuitOpen.
+            hedge: Hedging policy for slow idempotent requests, a Hedge or a
+                delay in seconds.
+            dns_cache: DNSCache resolving the hosts of new connections, which
+                then race the resolved addresses (happy eyeballs). True uses
+                the shared default_dns_cache().
+            max_connection_lifetime: Seconds after which an idle connection is
+                closed however recently it was used, e.g. to follow DNS
+                changes or rebalance across a load balancer. Idle connections
+                past ``keepalive_expiry`` are closed proactively too.
+            max_content_size: Largest response body, in bytes after
+                decompression, that requests read. Larger bodies fail with
+                AreqContentTooLarge.
+            spill_threshold: Response bodies larger than this many bytes are
+                written to a temporary file and exposed as a memory-mapped
+                ``content`` instead of being held in memory.
+            **client_kwargs: Passed through to httpx.AsyncClient, e.g.
+                ``http2=True`` to multiplex requests to an origin over one
+                HTTP/2 connection (requires the ``h2`` package).
+        """
+        if limits is None:
+            limits = Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        self._client = AsyncClient(
+            headers=headers,
+            auth=auth,
+            cookies=cookies,
+            params=params,
+            limits=limits,
+            **client_kwargs,
+        )
+        if dns_cache is True:
+            dns_cache = default_dns_cache()
+        self.dns_cache: DNSCache | None = dns_cache or None
+        if self.dns_cache is not None:
+            install(self._client, self.dns_cache)
+        self.max_connection_lifetime = max_connection_lifetime
+        self._pool = PoolMonitor(self._client)
+        self._next_sweep = 0.0
+        self.max_content_size = max_content_size
+        self.spill_threshold = spill_threshold
+        self.retries = Retry.from_value(retries)
+        self.cache = cache
+        self.coalescer = RequestCoalescer() if coalesce is True else coalesce or None
+        # Shared by calls that opt in with coalesce=True, leaving the session's
+        # own setting alone.
+        self._adhoc_coalescer: RequestCoalescer | None = None
+        self.hooks: Hooks = normalize_hooks(hooks)
+        self.rate_limit = rate_limit
+        self.circuit_breaker = circuit_breaker
+        self.hedge = Hedge.from_value(hedge)
+
+    @property
+    def client(self) -> AsyncClient:
+        return self._client
+
+    @property
+    def headers(self):
+        return self._client.headers
+
+    @headers.setter
+    def headers(self, headers) -> None:
+        self._client.headers = headers
+
+    @property
+    def cookies(self):
+        return self._client.cookies
+
+    @cookies.setter
+    def cookies(self, cookies) -> None:
+        self._client.cookies = cookies
+
+    @property
+    def auth(self):
+        return self._client.auth
+
+    @auth.setter
+    def auth(self, auth) -> None:
+        self._client.auth = auth
+
+    @property
+    def params(self):
+        return self._client.params
+
+    @params.setter
+    def params(self, params) -> None:
+        self._client.params = params
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def __aenter__(self) -> "Session":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes every pooled connection. The session cannot be reused afterwards."""
+        await self._client.aclose()
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Returns a snapshot of the connection pool: open, idle and in-use
+        connections and their ages per origin, and the number of requests
+        waiting for a connection.
+        """
+        return self._pool.stats()
+
+    async def close_idle_connections(self, older_than: float | None = None) -> int:
+        """
+        Closes idle connections past their keep-alive expiry or, with
+        ``older_than``, created more than that many seconds ago.
+
+        Returns:
+            The number of connections closed.
+        """
+        return await self._pool.close_idle(older_than=older_than)
+
+    async def warm_up(
+        self,
+        urls: str | Iterable[str],
+        connections: int = 1,
+        *,
+        method: str = "HEAD",
+        **kwargs: Any,
+    ) -> int:
+        """
+        Opens connections (TCP and TLS handshakes included) to the origins of
+        ``urls`` before traffic arrives.
+
+        ``connections`` concurrent ``method`` requests are sent to each URL, so
+        the pool holds at least that many connections to its origin
+        afterwards. HTTP/2 origins multiplex them over a single connection.
+        Warm-up requests skip retries, caching, rate limits and hooks.
+
+        Args:
+            urls: URL or URLs whose origins to connect to. The path is
+                requested, so pick a cheap one.
+            connections: Connections to open per URL.
+            method: Method of the warm-up requests.
+            **kwargs: Keyword arguments for the requests, e.g. headers.
+
+        Returns:
+            The number of connections opened.
+        """
+        if isinstance(urls, str):
+            urls = [urls]
+        if "allow_redirects" in kwargs:
+            kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+        send_kwargs = {
+            key: kwargs.pop(key)
+            for key in ("auth", "follow_redirects")
+            if key in kwargs
+        }
+        try:
+            requests = [
+                self._client.build_request(method, url, **kwargs)
+                for url in urls
+                for _ in range(connections)
+            ]
+        except (HTTPError, InvalidURL) as e:
+            raise convert_httpx_to_areq_exception(e)
+        opened_before = self._pool.stats().open
+        results = await asyncio.gather(
+            *[self._send(request, stream=False, **send_kwargs) for request in requests],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return self._pool.stats().open - opened_before
+
+    async def _sweep_pool(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + POOL_SWEEP_INTERVAL
+        await self._pool.close_idle(older_than=self.max_connection_lifetime)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        stream: bool = False,
+        retries: Retry | int | None = None,
+        cache: HTTPCache | None = None,
+        coalesce: bool | None = None,
+        hooks: Mapping[str, Any] | None = None,
+        rate_limit: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge: Hedge | float | None = None,
+        max_content_size: int | None = None,
+        spill_threshold: int | None = None,
+        **kwargs: Any,
+    ) -> AreqResponse:
+        """
+        Sends a request through the session's pooled client.
+
+        Inside ``async with areq.deadline(...)``, every attempt is bounded by the
+        budget left in the scope (see areq.Deadline).
+
+        Args:
+            method: HTTP method.
+            url: URL to request.
+            stream: Return as soon as the headers arrive, leaving the body to be
+                consumed with ``iter_content()``/``aread()``. The caller must
+                release the connection with ``aclose()``.
+            retries: Retry policy for this request, a Retry or a number of
+                retries. Defaults to the session's policy; 0 disables retries.
+            cache: HTTPCache for this request. Defaults to the session's cache.
+                Streamed requests bypass the cache.
+            coalesce: Share the call with identical requests in flight. Defaults
+                to whether the session coalesces. Streamed requests are never
+                coalesced.
+            hooks: Lifecycle hooks for this request, run after the session's.
+            rate_limit: RateLimiter for this request. Defaults to the session's.
+                Every attempt, including retries, waits for a token; cached and
+                coalesced answers do not.
+            circuit_breaker: CircuitBreaker for this request. Defaults to the
+                session's. Each attempt is checked and recorded separately.
+            hedge: Hedging policy for this request, a Hedge or a delay in
+                seconds. Defaults to the session's.
+            max_content_size: Largest body to read, in bytes after
+                decompression. Defaults to the session's. Raises
+                AreqContentTooLarge once exceeded, before reading when the
+                Content-Length already does; streamed bodies are checked as
+                they are consumed.
+            spill_threshold: Bodies larger than this many bytes are read into a
+                temporary file and ``content`` is a memoryview of its memory
+                mapping. Defaults to the session's.
+            **kwargs: requests-style keyword arguments forwarded to httpx.
+                File objects and (async) iterables passed as ``data=``, and
+                ``files=``, are streamed in constant memory. Bodies that cannot
+                be rewound, such as generators, are not retried; uploads are
+                never hedged.
+        """
+        if self.max_connection_lifetime is not None:
+            await self._sweep_pool()
+        if "allow_redirects" in kwargs:
+            kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+        send_kwargs = {
+            key: kwargs.pop(key)
+            for key in ("auth", "follow_redirects")
+            if key in kwargs
+        }
+        retry = self.retries if retries is None else Retry.from_value(retries)
+        cache = self.cache if cache is None else cache
+        rate_limit = self.rate_limit if rate_limit is None else rate_limit
+        breaker = self.circuit_breaker if circuit_breaker is None else circuit_breaker
+        hedge = self.hedge if hedge is None else Hedge.from_value(hedge)
+        send_kwargs["hooks"] = merge_hooks(self.hooks, normalize_hooks(hooks))
+        send_kwargs["max_content_size"] = (
+            self.max_content_size if max_content_size is None else max_content_size
+        )
+        send_kwargs["spill_threshold"] = (
+            self.spill_threshold if spill_threshold is None else spill_threshold
+        )
+
+        upload = None
+        form = False
+        data = kwargs.get("data")
+        if kwargs.get("files") or is_streaming_body(data):
+            upload = encode_upload(kwargs.pop("data", None), kwargs.pop("files", None))
+            kwargs["content"] = upload
+            # Attempts racing over one file would interleave its reads.
+            hedge = None
+            if not upload.replayable:
+                retry = None
+        elif isinstance(data, (bytes, str)):
+            # Raw bodies are content= to httpx, which warns about data=.
+            kwargs["content"] = kwargs.pop("data")
+        elif isinstance(data, (bytearray, memoryview)):
+            kwargs["content"] = bytes(kwargs.pop("data"))
+        elif is_form_pairs(data):
+            # httpx only form-encodes mappings; pairs keep their order.
+            kwargs["content"] = urlencode(kwargs.pop("data"), doseq=True)
+            form = True
+
+        try:
+            httpx_request = self._client.build_request(method, url, **kwargs)
+        except (HTTPError, InvalidURL) as e:
+            raise convert_httpx_to_areq_exception(e)
+        if upload is not None:
+            attach_upload(httpx_request, upload)
+        if form:
+            httpx_request.headers.setdefault(
+                "Content-Type", "application/x-www-form-urlencoded"
+            )
+
+        async def send(request: HttpxRequest) -> AreqResponse:
+            async def transmit(request: HttpxRequest, stream: bool) -> AreqResponse:
+                if rate_limit is None:
+                    return await self._send(request, stream=stream, **send_kwargs)
+                return await rate_limit.call(
+                    request, lambda: self._send(request, stream=stream, **send_kwargs)
+                )
+
+            async def attempt(
+                request: HttpxRequest = request, stream: bool = stream
+            ) -> AreqResponse:
+                if breaker is None:
+                    return await transmit(request, stream)
+                return await breaker.call(request, lambda: transmit(request, stream))
+
+            async def hedged_attempt() -> AreqResponse:
+                # Attempts race on the response headers; only the winner's
+                # body is read.
+                response = await hedge.call(
+                    request, lambda fork: attempt(fork, stream=True)
+                )
+                if not stream:
+                    await response.aread()
+                return response
+
+            call = attempt if hedge is None else hedged_attempt
+            if retry is None:
+                return await call()
+            return await retry.call(method, call)
+
+        async def fetch() -> AreqResponse:
+            if cache is None or stream:
+                return await send(httpx_request)
+            return await cache.fetch(httpx_request, send)
+
+        coalescer = self._get_coalescer(coalesce)
+        if coalescer is None or stream:
+            call = fetch()
+        else:
+            call = coalescer.run(httpx_request, fetch)
+        deadline = current_deadline()
+        if deadline is None:
+            return await call
+        return await deadline.watch(httpx_request, call)
+
+    def _get_coalescer(self, coalesce: bool | None) -> RequestCoalescer | None:
+        if coalesce is False:
+            return None
+        if coalesce is True and self.coalescer is None:
+            if self._adhoc_coalescer is None:
+                self._adhoc_coalescer = RequestCoalescer()
+            return self._adhoc_coalescer
+        return self.coalescer
+
+    async def _send(
+        self,
+        httpx_request: HttpxRequest,
+        *,
+        stream: bool,
+        hooks: Hooks | None = None,
+        max_content_size: int | None = None,
+        spill_threshold: int | None = None,
+        **send_kwargs: Any,
+    ) -> AreqResponse:
+        deadline = current_deadline()
+        if deadline is not None:
+            # Every attempt, retries and hedges included, gets what is left.
+            deadline.limit_timeouts(httpx_request)
+        # Bounded bodies are streamed from httpx and read by AreqResponse.aread().
+        limited = max_content_size is not None or spill_threshold is not None
+        if not hooks:
+            try:
+                httpx_response: HttpxResponse = await self._client.send(
+                    httpx_request, stream=stream or limited, **send_kwargs
+                )
+            except (HTTPError, InvalidURL) as e:
+                raise _convert_send_error(e, httpx_request)
+            response = create_areq_response(httpx_response)
+            assert response is not None  # create_areq_response never returns None
+            if limited:
+                response._max_content_size = max_content_size
+                response._spill_threshold = spill_threshold
+                if not stream:
+                    await response.aread()
+            return response
+
+        tracer = RequestTracer(httpx_request, hooks)
+        await tracer.started()
+        try:
+            httpx_response = await self._client.send(
+                httpx_request, stream=stream or limited, **send_kwargs
+            )
+        except (HTTPError, InvalidURL) as e:
+            error = _convert_send_error(e, httpx_request)
+            await tracer.failed(error)
+            raise error
+        finally:
+            tracer.detach()
+        response = create_areq_response(httpx_response)
+        assert response is not None  # create_areq_response never returns None
+        if limited:
+            response._max_content_size = max_content_size
+            response._spill_threshold = spill_threshold
+        if stream:
+            response._on_close = tracer.completed
+        elif limited:
+            try:
+                await response.aread()
+            except AreqException as error:
+                await tracer.failed(error)
+                raise
+            await tracer.completed(response)
+        else:
+            await tracer.completed(response)
+        return response
+
+    async def get(self, url, params=None, **kwargs):
+        return await self.request("get", url, params=params, **kwargs)
+
+    async def options(self, url, **kwargs):
+        return await self.request("options", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return await self.request("head", url, **kwargs)
+
+    async def post(self, url, data=None, json=None, **kwargs):
+        return await self.request("post", url, data=data, json=json, **kwargs)
+
+    async def put(self, url, data=None, **kwargs):
+        return await self.request("put", url, data=data, **kwargs)
+
+    async def patch(self, url, data=None, **kwargs):
+        return await self.request("patch", url, data=data, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("delete", url, **kwargs)
@@ -0,0 +1,364 @@
+"""
+Blocking, requests-style API for synchronous code.
+
+Every call is dispatched onto one background thread running an event loop, so
+sync callers share a pooled client (and its keep-alive connections) instead of
+paying for a new loop and client per ``asyncio.run()``. Batches run
+concurrently on that loop.
+
+Usage:
+    import areq.sync as requests
+
+    response = requests.get("https://example.com")
+    with requests.Session(headers={"User-Agent": "bot"}) as session:
+        results = session.map(urls, concurrency=20)
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from typing import Any, AsyncIterator, Awaitable, Coroutine, Iterable, Iterator, TypeVar
+
+from requests import Response as RequestsResponse
+
+from . import api, batch, eventsource
+from .batch import DEFAULT_CONCURRENCY, RequestLike
+from .eventsource import ServerSentEvent
+from .exceptions import AreqException
+from .models import ITER_CHUNK_SIZE, MAX_LINE_SIZE, AreqResponse
+from .sessions import Session as AsyncSession
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="areq-sync-loop", daemon=True
+            )
+            thread.start()
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def _forget_loop() -> None:
+    # The loop thread does not survive fork(): the child starts its own.
+    global _loop, _thread, _lock
+    _loop = _thread = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_loop)
+
+
+@atexit.register
+def _shutdown() -> None:
+    loop, thread = _loop, _thread
+    if loop is None or thread is None or not thread.is_alive():
+        return
+
+    try:
+        asyncio.run_coroutine_threadsafe(api.aclose(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine on the background loop and blocks until it finishes.
+
+    Raises:
+        RuntimeError: When called from the background loop itself (e.g. from
+            a hook), which would deadlock.
+    """
+    loop = _get_loop()
+    if threading.current_thread() is _thread:
+        coroutine.close()
+        raise RuntimeError("areq.sync cannot be called from its own event loop")
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    try:
+        return future.result()
+    except BaseException:
+        # E.g. KeyboardInterrupt: do not leave the request running.
+        future.cancel()
+        raise
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+def _iterate(iterator: AsyncIterator[T]) -> Iterator[T]:
+    """Iterates over an async iterator living on the background loop."""
+    try:
+        while True:
+            try:
+                yield run(_await(iterator.__anext__()))
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            run(aclose())
+
+
+class SyncResponse(AreqResponse):
+    """
+    An AreqResponse whose body iteration and closing block, as in requests.
+
+    Bodies of streamed responses are pulled from the background loop one
+    chunk at a time; buffered bodies are iterated without leaving the thread.
+    """
+
+    @classmethod
+    def from_response(cls, response: AreqResponse) -> "SyncResponse":
+        sync_response = cls.__new__(cls, response.httpx_response)
+        sync_response.__dict__.update(response.__dict__)
+        return sync_response
+
+    def iter_content(  # type: ignore[override]
+        self, chunk_size: int | None = 1, decode_unicode: bool = False
+    ) -> Iterator[Any]:
+        if self._content is not False:
+            return RequestsResponse.iter_content(self, chunk_size, decode_unicode)
+        return _iterate(AreqResponse.iter_content(self, chunk_size, decode_unicode))
+
+    def iter_lines(  # type: ignore[override]
+        self,
+        chunk_size: int | None = ITER_CHUNK_SIZE,
+        decode_unicode: bool = False,
+        delimiter: Any = None,
+    ) -> Iterator[Any]:
+        # requests' implementation, over the blocking iter_content() above.
+        return RequestsResponse.iter_lines(self, chunk_size, decode_unicode, delimiter)
+
+    def iter_ndjson(  # type: ignore[override]
+        self, max_line_size: int = MAX_LINE_SIZE, **kwargs: Any
+    ) -> Iterator[Any]:
+        return _iterate(AreqResponse.iter_ndjson(self, max_line_size, **kwargs))
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.iter_content(128)
+
+    def read(self) -> bytes:
+        """Reads the whole body of a streamed response."""
+        return run(self.aread())
+
+    def close(self) -> None:
+        """Releases the connection held by a streamed response."""
+        if self._content is False:
+            run(self.aclose())
+
+    def __enter__(self) -> "SyncResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _wrap(result: Any) -> Any:
+    if isinstance(result, AreqResponse):
+        return SyncResponse.from_response(result)
+    return result
+
+
+def request(method: str, url: str, **kwargs: Any) -> SyncResponse:
+    return _wrap(run(api.request(method, url, **kwargs)))
+
+
+def get(url, params=None, **kwargs):
+    return request("get", url, params=params, **kwargs)
+
+
+def options(url, **kwargs):
+    return request("options", url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault("allow_redirects", False)
+    return request("head", url, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request("post", url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return request("put", url, data=data, **kwargs)
+
+
+def patch(url, data=None, **kwargs):
+    return request("patch", url, data=data, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("delete", url, **kwargs)
+
+
+def map(
+    requests: Iterable[RequestLike],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int | None = None,
+    session: "Session | None" = None,
+    **kwargs: Any,
+) -> list[SyncResponse | AreqException]:
+    """
+    Sends a batch of requests concurrently and returns the results in input
+    order. Takes the same arguments as areq.map().
+    """
+    results = run(
+        batch.map(
+            requests,
+            concurrency=concurrency,
+            per_host=per_host,
+            session=None if session is None else session.async_session,
+            **kwargs,
+        )
+    )
+    return [_wrap(result) for result in results]
+
+
+def as_completed(
+    requests: Iterable[RequestLike],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int | None = None,
+    session: "Session | None" = None,
+    **kwargs: Any,
+) -> Iterator[tuple[int, SyncResponse | AreqException]]:
+    """
+    Sends a batch of requests concurrently, yielding (index, result) pairs as
+    they finish. Takes the same arguments as areq.as_completed().
+    """
+    results = batch.as_completed(
+        requests,
+        concurrency=concurrency,
+        per_host=per_host,
+        session=None if session is None else session.async_session,
+        **kwargs,
+    )
+    for index, result in _iterate(results):
+        yield index, _wrap(result)
+
+
+def sse(
+    url: str, *, session: "Session | None" = None, **kwargs: Any
+) -> Iterator[ServerSentEvent]:
+    """
+    Subscribes to a Server-Sent Events stream, yielding events as they arrive.
+    Takes the same arguments as areq.sse().
+    """
+    return _iterate(
+        eventsource.sse(
+            url, session=None if session is None else session.async_session, **kwargs
+        )
+    )
+
+
+class Session:
+    """
+    A blocking, requests-style session over an areq.Session.
+
+    Takes the same arguments as areq.Session. The underlying session lives on
+    the background loop and keeps its connections alive between calls.
+
+    Usage:
+        with areq.sync.Session(retries=3) as session:
+            response = session.get("https://example.com")
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._session = AsyncSession(**kwargs)
+
+    @property
+    def async_session(self) -> AsyncSession:
+        """The wrapped areq.Session; use it only on the background loop."""
+        return self._session
+
+    @property
+    def headers(self):
+        return self._session.headers
+
+    @headers.setter
+    def headers(self, headers) -> None:
+        self._session.headers = headers
+
+    @property
+    def cookies(self):
+        return self._session.cookies
+
+    @cookies.setter
+    def cookies(self, cookies) -> None:
+        self._session.cookies = cookies
+
+    @property
+    def auth(self):
+        return self._session.auth
+
+    @auth.setter
+    def auth(self, auth) -> None:
+        self._session.auth = auth
+
+    @property
+    def params(self):
+        return self._session.params
+
+    @params.setter
+    def params(self, params) -> None:
+        self._session.params = params
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        if not self._session.is_closed:
+            run(self._session.close())
+
+    def request(self, method: str, url: str, **kwargs: Any) -> SyncResponse:
+        return _wrap(run(self._session.request(method, url, **kwargs)))
+
+    def get(self, url, params=None, **kwargs):
+        return self.request("get", url, params=params, **kwargs)
+
+    def options(self, url, **kwargs):
+        return self.request("options", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("head", url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request("post", url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request("put", url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request("patch", url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("delete", url, **kwargs)
+
+    def map(self, requests: Iterable[RequestLike], **kwargs: Any):
+        """Like areq.sync.map(), through this session."""
+        return map(requests, session=self, **kwargs)
+
+    def as_completed(self, requests: Iterable[RequestLike], **kwargs: Any):
+        """Like areq.sync.as_completed(), through this session."""
+        return as_completed(requests, session=self, **kwargs)
@@ -0,0 +1,271 @@
+import asyncio
+import mimetypes
+import os
+from collections.abc import AsyncIterable, Iterable, Mapping
+from typing import Any
+
+import httpx
+
+# Large enough that the thread hop of each read is negligible next to the
+# socket write, small enough to keep uploads in constant memory.
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+class UploadStream(httpx.AsyncByteStream):
+    """Base class of the request bodies areq streams itself."""
+
+    #: Body length in bytes, or None if it is only known once sent.
+    size: int | None = None
+    #: Whether the body can be sent again, e.g. by a retry.
+    replayable: bool = True
+    content_type: str | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {}
+        if self.size is None:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            headers["Content-Length"] = str(self.size)
+        if self.content_type is not None:
+            headers["Content-Type"] = self.content_type
+        return headers
+
+
+class FileStream(UploadStream):
+    """
+    Streams a binary file object from its current position.
+
+    Reads run in a worker thread so a slow disk never blocks the event loop.
+    Seekable files are rewound before every send and can be retried.
+    """
+
+    def __init__(self, file: Any, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        try:
+            self._start: int | None = file.tell() if file.seekable() else None
+        except (AttributeError, OSError):
+            self._start = None
+        self.replayable = self._start is not None
+        self.size = self._remaining_size()
+        self._consumed = False
+
+    def _remaining_size(self) -> int | None:
+        if self._start is None:
+            return None
+        try:
+            # fstat is exact for regular files and avoids moving the position.
+            return os.fstat(self.file.fileno()).st_size - self._start
+        except (AttributeError, OSError, ValueError):
+            pass
+        try:
+            end = self.file.seek(0, os.SEEK_END)
+            self.file.seek(self._start)
+            return end - self._start
+        except OSError:
+            return None
+
+    async def __aiter__(self):
+        if self._start is not None:
+            self.file.seek(self._start)
+        elif self._consumed:
+            raise httpx.StreamConsumed()
+        self._consumed = True
+        read = self.file.read
+        while True:
+            chunk = await asyncio.to_thread(read, self.chunk_size)
+            if not chunk:
+                return
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+class IterableStream(UploadStream):
+    """
+    Streams a sync or async iterable of bytes, e.g. a generator.
+
+    Sync iterators are advanced in a worker thread, since generators commonly
+    read from files or sockets. Iterators can only be sent once.
+    """
+
+    def __init__(self, iterable: Iterable | AsyncIterable):
+        self.iterable = iterable
+        self.replayable = not (
+            isinstance(iterable, AsyncIterable) or iter(iterable) is iterable
+        )
+        self._consumed = False
+
+    async def __aiter__(self):
+        if self._consumed and not self.replayable:
+            raise httpx.StreamConsumed()
+        self._consumed = True
+        if isinstance(self.iterable, AsyncIterable):
+            async for chunk in self.iterable:
+                yield chunk.encode() if isinstance(chunk, str) else chunk
+            return
+        iterator = iter(self.iterable)
+        done = object()
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, done)
+            if chunk is done:
+                return
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def _quote(value: str) -> str:
+    # Percent-encodes what would break out of a quoted parameter (as browsers do).
+    return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _primitive(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, bool):
+        return b"true" if value else b"false"
+    if value is None:
+        return b""
+    return str(value).encode()
+
+
+def _body(value: Any, chunk_size: int) -> "bytes | UploadStream":
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, str):
+        return value.encode()
+    if hasattr(value, "read"):
+        return FileStream(value, chunk_size)
+    if isinstance(value, (Iterable, AsyncIterable)):
+        return IterableStream(value)
+    raise TypeError(f"Unsupported upload value: {type(value).__name__}")
+
+
+class MultipartStream(UploadStream):
+    """
+    Encodes multipart/form-data without loading the files into memory.
+
+    ``files`` takes what requests accepts: a mapping or a list of pairs, whose
+    values are a file object, bytes, a (sync or async) iterable of bytes, or a
+    ``(filename, value[, content_type[, headers]])`` tuple. The Content-Length
+    is computed up front when every part has a known size.
+    """
+
+    def __init__(
+        self,
+        data: Mapping[str, Any] | Iterable[tuple[str, Any]] | None,
+        files: Mapping[str, Any] | Iterable[tuple[str, Any]],
+        boundary: bytes | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.boundary = boundary or os.urandom(16).hex().encode()
+        self.content_type = f"multipart/form-data; boundary={self.boundary.decode()}"
+        self._parts: list[tuple[bytes, bytes | UploadStream]] = []
+        fields = data.items() if isinstance(data, Mapping) else data or ()
+        for name, value in fields:
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                self._add(name, None, None, None, _primitive(item))
+        items = files.items() if isinstance(files, Mapping) else files
+        for name, value in items:
+            if isinstance(value, tuple):
+                filename, content, content_type, headers = (tuple(value) + (None,) * 2)[
+                    :4
+                ]
+            else:
+                filename = getattr(value, "name", None)
+                if not isinstance(filename, str):
+                    filename = name
+                filename = os.path.basename(filename)
+                content, content_type, headers = value, None, None
+            if content_type is None and filename:
+                content_type = (
+                    mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                )
+            self._add(name, filename, content_type, headers, _body(content, chunk_size))
+        self.size = self._compute_size()
+        self.replayable = all(
+            isinstance(body, bytes) or body.replayable for _, body in self._parts
+        )
+
+    def _add(
+        self,
+        name: str,
+        filename: str | None,
+        content_type: str | None,
+        headers: Mapping[str, str] | None,
+        body: "bytes | UploadStream",
+    ) -> None:
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+        lines = [f"Content-Disposition: {disposition}"]
+        if content_type is not None:
+            lines.append(f"Content-Type: {content_type}")
+        lines.extend(f"{key}: {value}" for key, value in (headers or {}).items())
+        header = b"--%s\r\n%s\r\n\r\n" % (self.boundary, "\r\n".join(lines).encode())
+        self._parts.append((header, body))
+
+    def _compute_size(self) -> int | None:
+        size = len(self.boundary) + 6  # b"--%s--\r\n"
+        for header, body in self._parts:
+            body_size = len(body) if isinstance(body, bytes) else body.size
+            if body_size is None:
+                return None
+            size += len(header) + body_size + 2
+        return size
+
+    async def __aiter__(self):
+        for header, body in self._parts:
+            yield header
+            if isinstance(body, bytes):
+                yield body
+            else:
+                async for chunk in body:
+                    yield chunk
+            yield b"\r\n"
+        yield b"--%s--\r\n" % self.boundary
+
+
+def is_form_pairs(data: Any) -> bool:
+    """Whether ``data=`` is a list or tuple of (name, value) form fields."""
+    return isinstance(data, (list, tuple)) and all(
+        isinstance(item, (list, tuple)) and len(item) == 2 for item in data
+    )
+
+
+def is_streaming_body(data: Any) -> bool:
+    """Whether ``data=`` is a raw body areq streams itself rather than form fields."""
+    if data is None or isinstance(data, (Mapping, bytes, bytearray, memoryview, str)):
+        return False
+    if is_form_pairs(data):
+        return False
+    return hasattr(data, "read") or isinstance(data, (Iterable, AsyncIterable))
+
+
+def encode_upload(
+    data: Any, files: Any, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> UploadStream:
+    """Builds the streamed body for ``data=`` and ``files=`` arguments."""
+    if files:
+        return MultipartStream(data, files, chunk_size=chunk_size)
+    body = _body(data, chunk_size)
+    if not isinstance(body, UploadStream):
+        raise TypeError(
+            f"Cannot stream a {type(data).__name__} body; send it as content instead"
+        )
+    return body
+
+
+def attach_upload(request: httpx.Request, upload: UploadStream) -> None:
+    """
+    Makes ``upload`` the body of a request built with ``content=upload``.
+
+    httpx treats any async iterable as a chunked body of unknown length; this
+    restores the upload's own stream and framing headers.
+    """
+    request.stream = upload
+    headers = request.headers
+    headers.pop("Content-Length", None)
+    headers.pop("Transfer-Encoding", None)
+    for name, value in upload.headers.items():
+        # Like requests, an explicit Content-Type is left alone.
+        if name != "Content-Type" or name not in headers:
+            headers[name] = value
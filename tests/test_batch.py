@@ -0,0 +1,148 @@
+import asyncio
+
+import httpx
+import pytest
+
+import areq
+
+TEST_URL = "https://example.com"
+
+
+def _tracking_callback(state, delay=0.01):
+    async def callback(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        state["active"][host] = state["active"].get(host, 0) + 1
+        state["total"] += 1
+        state["peak"] = max(state["peak"], state["total"])
+        state["peak_host"][host] = max(
+            state["peak_host"].get(host, 0), state["active"][host]
+        )
+        await asyncio.sleep(delay)
+        state["active"][host] -= 1
+        state["total"] -= 1
+        return httpx.Response(200, text=str(request.url))
+
+    return callback
+
+
+def _new_state():
+    return {"active": {}, "peak_host": {}, "total": 0, "peak": 0}
+
+
+@pytest.mark.asyncio
+async def test_map_preserves_order_and_limits_concurrency(httpx_mock):
+    state = _new_state()
+    httpx_mock.add_callback(_tracking_callback(state), is_reusable=True)
+
+    urls = [f"{TEST_URL}/{i}" for i in range(20)]
+    results = await areq.map(urls, concurrency=4)
+
+    assert [r.text for r in results] == urls
+    assert state["peak"] == 4
+
+
+@pytest.mark.asyncio
+async def test_map_per_host_limit(httpx_mock):
+    state = _new_state()
+    httpx_mock.add_callback(_tracking_callback(state), is_reusable=True)
+
+    urls = [f"https://a.example.com/{i}" for i in range(6)]
+    urls += [f"https://b.example.com/{i}" for i in range(6)]
+    await areq.map(urls, concurrency=10, per_host=2)
+
+    assert state["peak_host"] == {"a.example.com": 2, "b.example.com": 2}
+
+
+@pytest.mark.asyncio
+async def test_invalid_url_does_not_abort_per_host_batch(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+
+    results = await areq.map(
+        ["https://a.example.com/1", "http://[::1/bad", "https://b.example.com/2"],
+        per_host=2,
+    )
+
+    assert results[0].status_code == 200
+    assert isinstance(results[1], areq.AreqInvalidURL)
+    assert results[2].status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_busy_host_does_not_hold_global_slots(httpx_mock):
+    finished = []
+
+    async def callback(request):
+        await asyncio.sleep(0.2 if request.url.host == "slow.example.com" else 0)
+        finished.append(request.url.host)
+        return httpx.Response(200)
+
+    httpx_mock.add_callback(callback, is_reusable=True)
+
+    urls = [f"https://slow.example.com/{i}" for i in range(3)]
+    urls += [f"https://fast.example.com/{i}" for i in range(3)]
+    await areq.map(urls, concurrency=2, per_host=1)
+
+    # Waiting slow-host items leave the second slot to the fast host.
+    assert finished[:3] == ["fast.example.com"] * 3
+
+
+@pytest.mark.asyncio
+async def test_map_returns_exceptions_without_aborting(httpx_mock):
+    httpx_mock.add_response(url=f"{TEST_URL}/ok")
+    httpx_mock.add_exception(httpx.ConnectError("refused"), url=f"{TEST_URL}/down")
+    httpx_mock.add_response(url=f"{TEST_URL}/created", method="POST", status_code=201)
+
+    results = await areq.map(
+        [
+            f"{TEST_URL}/ok",
+            ("GET", f"{TEST_URL}/down"),
+            ("POST", f"{TEST_URL}/created", {"json": {"a": 1}}),
+        ]
+    )
+
+    assert results[0].status_code == 200
+    assert isinstance(results[1], areq.AreqConnectionError)
+    assert results[2].status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_as_completed_streams_lazily(httpx_mock):
+    httpx_mock.add_callback(_tracking_callback(_new_state()), is_reusable=True)
+    pulled = []
+
+    async def generate():
+        for i in range(10):
+            pulled.append(i)
+            yield f"{TEST_URL}/{i}"
+
+    async with areq.Session() as session:
+        seen = []
+        async for index, response in areq.as_completed(
+            generate(), concurrency=2, session=session
+        ):
+            # Never more than `concurrency` items pulled ahead of what was yielded.
+            assert len(pulled) - len(seen) <= 2
+            seen.append(index)
+            assert response.text == f"{TEST_URL}/{index}"
+
+    assert sorted(seen) == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_as_completed_cancels_pending_on_early_exit(httpx_mock):
+    httpx_mock.add_callback(
+        _tracking_callback(_new_state(), delay=0.05), is_reusable=True
+    )
+
+    batch = areq.as_completed([f"{TEST_URL}/{i}" for i in range(5)], concurrency=3)
+    async for _ in batch:
+        break
+    await batch.aclose()
+
+
+@pytest.mark.asyncio
+async def test_map_rejects_bad_items():
+    with pytest.raises(TypeError):
+        await areq.map([42])
+    with pytest.raises(ValueError):
+        await areq.map([TEST_URL], concurrency=0)
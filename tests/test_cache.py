@@ -0,0 +1,199 @@
+import email.utils
+import time
+
+import pytest
+
+import areq
+from areq.cache import CacheEntry
+
+TEST_URL = "https://example.com/resource"
+
+
+@pytest.mark.asyncio
+async def test_fresh_response_is_served_without_network(httpx_mock):
+    httpx_mock.add_response(json={"v": 1}, headers={"cache-control": "max-age=60"})
+    cache = areq.HTTPCache()
+
+    async with areq.Session(cache=cache) as session:
+        first = await session.get(TEST_URL)
+        second = await session.get(TEST_URL)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.json() == {"v": 1}
+    assert len(httpx_mock.get_requests()) == 1
+    assert cache.stats == areq.CacheStats(hits=1, misses=1, revalidations=0)
+
+
+@pytest.mark.asyncio
+async def test_stale_response_is_revalidated(httpx_mock):
+    httpx_mock.add_response(
+        content=b"body", headers={"cache-control": "max-age=0", "etag": '"v1"'}
+    )
+    httpx_mock.add_response(status_code=304, headers={"etag": '"v1"'})
+    cache = areq.HTTPCache()
+
+    async with areq.Session(cache=cache) as session:
+        await session.get(TEST_URL)
+        response = await session.get(TEST_URL)
+
+    assert response.status_code == 200
+    assert response.content == b"body"
+    assert response.from_cache
+    assert httpx_mock.get_requests()[1].headers["if-none-match"] == '"v1"'
+    assert cache.stats.revalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_response_replaces_entry(httpx_mock):
+    httpx_mock.add_response(
+        content=b"old", headers={"etag": '"v1"', "cache-control": "no-cache"}
+    )
+    httpx_mock.add_response(
+        content=b"new", headers={"etag": '"v2"', "cache-control": "max-age=60"}
+    )
+    cache = areq.HTTPCache()
+
+    async with areq.Session(cache=cache) as session:
+        await session.get(TEST_URL)
+        assert (await session.get(TEST_URL)).content == b"new"
+        assert (await session.get(TEST_URL)).content == b"new"
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_store_and_uncacheable_responses(httpx_mock):
+    httpx_mock.add_response(headers={"cache-control": "no-store, max-age=60"})
+    httpx_mock.add_response()
+    httpx_mock.add_response(headers={"cache-control": "max-age=60", "vary": "*"})
+    cache = areq.HTTPCache()
+
+    for _ in range(3):
+        await areq.get(TEST_URL, cache=cache)
+
+    assert cache.stats.hits == 0
+    assert len(cache.backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_vary_header_is_respected(httpx_mock):
+    httpx_mock.add_response(
+        headers={"cache-control": "max-age=60", "vary": "Accept"}, is_reusable=True
+    )
+    cache = areq.HTTPCache()
+
+    await areq.get(TEST_URL, cache=cache, headers={"accept": "text/html"})
+    await areq.get(TEST_URL, cache=cache, headers={"accept": "application/json"})
+    await areq.get(TEST_URL, cache=cache, headers={"accept": "application/json"})
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_request_no_cache_forces_revalidation(httpx_mock):
+    httpx_mock.add_response(headers={"cache-control": "max-age=60", "etag": '"a"'})
+    httpx_mock.add_response(status_code=304)
+    cache = areq.HTTPCache()
+
+    await areq.get(TEST_URL, cache=cache)
+    await areq.get(TEST_URL, cache=cache, headers={"cache-control": "no-cache"})
+
+    assert cache.stats.revalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_unsafe_methods_invalidate(httpx_mock):
+    httpx_mock.add_response(
+        method="GET", headers={"cache-control": "max-age=60"}, is_reusable=True
+    )
+    httpx_mock.add_response(method="POST")
+    cache = areq.HTTPCache()
+
+    await areq.get(TEST_URL, cache=cache)
+    await areq.post(TEST_URL, json={}, cache=cache)
+    response = await areq.get(TEST_URL, cache=cache)
+
+    assert not response.from_cache
+
+
+@pytest.mark.asyncio
+async def test_stream_requests_bypass_cache(httpx_mock):
+    httpx_mock.add_response(headers={"cache-control": "max-age=60"}, is_reusable=True)
+    cache = areq.HTTPCache()
+
+    response = await areq.get(TEST_URL, cache=cache, stream=True)
+    await response.aclose()
+
+    assert cache.stats == areq.CacheStats()
+
+
+def _entry(url, size, **kwargs):
+    return CacheEntry(
+        url=url,
+        status_code=200,
+        headers=[],
+        content=b"x" * size,
+        stored_at=time.time(),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_is_bounded_lru():
+    backend = areq.MemoryCacheBackend(max_bytes=250)
+    await backend.set("a", _entry("a", 100))
+    await backend.set("b", _entry("b", 100))
+    await backend.get("a")
+    await backend.set("c", _entry("c", 100))
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") is not None
+    assert backend.size == 200
+
+    await backend.set("huge", _entry("huge", 1000))
+    assert await backend.get("huge") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_shares_entries(tmp_path, httpx_mock):
+    httpx_mock.add_response(content=b"disk", headers={"cache-control": "max-age=60"})
+    path = str(tmp_path / "cache.db")
+
+    await areq.get(TEST_URL, cache=areq.HTTPCache(areq.SQLiteCacheBackend(path)))
+    # A second backend on the same file, as another worker process would have.
+    other = areq.HTTPCache(areq.SQLiteCacheBackend(path))
+    response = await areq.get(TEST_URL, cache=other)
+
+    assert response.from_cache
+    assert response.content == b"disk"
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_eviction(tmp_path):
+    backend = areq.SQLiteCacheBackend(str(tmp_path / "cache.db"), max_bytes=250)
+    await backend.set("a", _entry("a", 100))
+    await backend.set("b", _entry("b", 100))
+    await backend.set("c", _entry("c", 100))
+
+    assert await backend.get("a") is None
+    assert (await backend.get("c")).content == b"x" * 100
+    backend.close()
+
+
+def test_freshness_lifetime():
+    now = time.time()
+    date = email.utils.formatdate(now, usegmt=True)
+    expires = email.utils.formatdate(now + 100, usegmt=True)
+    last_modified = email.utils.formatdate(now - 1000, usegmt=True)
+
+    entry = _entry(TEST_URL, 0)
+    entry.headers = [("date", date), ("expires", expires)]
+    assert 99 <= entry.freshness_lifetime() <= 101
+
+    entry.headers = [("date", date), ("last-modified", last_modified)]
+    assert 99 <= entry.freshness_lifetime() <= 101
+
+    entry.headers = [("cache-control", "max-age=5"), ("expires", expires)]
+    assert entry.freshness_lifetime() == 5
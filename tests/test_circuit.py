@@ -0,0 +1,161 @@
+import httpx
+import pytest
+import requests
+
+import areq
+from utils import FakeClock
+
+TEST_URL = "https://example.com"
+OTHER_URL = "https://other.example.com"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    return FakeClock.install(monkeypatch, areq.circuit)
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures_and_fails_fast(httpx_mock, clock):
+    httpx_mock.add_exception(
+        httpx.ConnectTimeout("timed out"), url=TEST_URL, is_reusable=True
+    )
+    httpx_mock.add_response(url=OTHER_URL, is_reusable=True)
+    transitions = []
+    breaker = areq.CircuitBreaker(
+        failure_threshold=3,
+        recovery_timeout=10,
+        on_state_change=lambda *change: transitions.append(change),
+    )
+
+    async with areq.Session(circuit_breaker=breaker) as session:
+        for _ in range(3):
+            with pytest.raises(areq.AreqConnectTimeout):
+                await session.get(TEST_URL)
+        clock.now += 4
+        with pytest.raises(areq.AreqCircuitOpen) as excinfo:
+            await session.get(TEST_URL)
+        # Other hosts are unaffected.
+        assert (await session.get(OTHER_URL)).status_code == 200
+
+    assert len(httpx_mock.get_requests(url=TEST_URL)) == 3
+    assert isinstance(excinfo.value, requests.exceptions.ConnectionError)
+    assert excinfo.value.key == "example.com"
+    assert excinfo.value.retry_after == pytest.approx(6)
+    assert excinfo.value.request.url == TEST_URL
+    assert transitions == [("example.com", "closed", "open")]
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens(httpx_mock, clock):
+    httpx_mock.add_exception(httpx.ReadTimeout("slow"))
+    httpx_mock.add_exception(httpx.ReadTimeout("slow"))
+    httpx_mock.add_response()
+    transitions = []
+    breaker = areq.CircuitBreaker(
+        failure_threshold=1,
+        recovery_timeout=5,
+        on_state_change=lambda key, old, new: transitions.append(new),
+    )
+
+    async with areq.Session(circuit_breaker=breaker) as session:
+        with pytest.raises(areq.AreqReadTimeout):
+            await session.get(TEST_URL)
+        clock.now += 5
+        with pytest.raises(areq.AreqReadTimeout):
+            await session.get(TEST_URL)  # failed probe
+        with pytest.raises(areq.AreqCircuitOpen):
+            await session.get(TEST_URL)
+        clock.now += 5
+        assert (await session.get(TEST_URL)).status_code == 200
+
+    assert transitions == ["open", "half_open", "open", "half_open", "closed"]
+    assert breaker.state("example.com") == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_allows_limited_probes(clock):
+    breaker = areq.CircuitBreaker(failure_threshold=1, recovery_timeout=1)
+    request = httpx.Request("GET", TEST_URL)
+    circuit = breaker.before_request(request)
+    breaker.record(circuit, failed=True)
+    clock.now += 1
+
+    breaker.before_request(request)
+    with pytest.raises(areq.AreqCircuitOpen):
+        breaker.before_request(request)
+
+
+@pytest.mark.asyncio
+async def test_opens_on_error_rate(httpx_mock, clock):
+    for _ in range(4):
+        httpx_mock.add_response()
+    for _ in range(3):
+        httpx_mock.add_exception(httpx.ReadError("reset"))
+        httpx_mock.add_response()
+    httpx_mock.add_exception(httpx.ReadError("reset"))
+    breaker = areq.CircuitBreaker(
+        failure_threshold=None, failure_rate=0.3, minimum_requests=10
+    )
+
+    async with areq.Session(circuit_breaker=breaker) as session:
+        for _ in range(4):
+            await session.get(TEST_URL)
+        for _ in range(3):
+            with pytest.raises(areq.AreqConnectionError):
+                await session.get(TEST_URL)
+            await session.get(TEST_URL)
+        assert breaker.state("example.com") == "closed"
+        with pytest.raises(areq.AreqConnectionError):
+            await session.get(TEST_URL)  # 4 failures out of 11
+        with pytest.raises(areq.AreqCircuitOpen):
+            await session.get(TEST_URL)
+
+
+@pytest.mark.asyncio
+async def test_failure_statuses_and_ignored_errors(httpx_mock, clock):
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_exception(httpx.DecodingError("bad gzip"))
+    breaker = areq.CircuitBreaker(failure_threshold=2, failure_statuses=[503])
+
+    async with areq.Session(circuit_breaker=breaker) as session:
+        await session.get(TEST_URL)
+        with pytest.raises(areq.AreqContentDecodingError):
+            await session.get(TEST_URL)
+
+    circuit = breaker.circuit("example.com")
+    assert circuit.state == "closed"
+    assert circuit.consecutive_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_not_retried(httpx_mock, clock, monkeypatch):
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    breaker = areq.CircuitBreaker(failure_threshold=1)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("areq.retry.asyncio.sleep", fake_sleep)
+    async with areq.Session(circuit_breaker=breaker) as session:
+        with pytest.raises(areq.AreqCircuitOpen):
+            await session.get(TEST_URL, retries=3)
+
+    assert len(sleeps) == 1
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_state_listener(clock):
+    seen = []
+
+    async def alert(key, old, new):
+        seen.append((key, new))
+
+    breaker = areq.CircuitBreaker(failure_threshold=1, on_state_change=[alert])
+    circuit = breaker.before_request(httpx.Request("GET", TEST_URL))
+    breaker.record(circuit, failed=True)
+    for future in list(breaker._notifications):
+        await future
+
+    assert seen == [("example.com", "open")]
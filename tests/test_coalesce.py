@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+import pytest
+
+import areq
+
+TEST_URL = "https://example.com/hot"
+
+
+def _slow_callback(calls, delay=0.02, **response_kwargs):
+    async def callback(request):
+        calls.append(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(**{"status_code": 200, **response_kwargs})
+
+    return callback
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call(httpx_mock):
+    calls = []
+    httpx_mock.add_callback(_slow_callback(calls, json={"v": 1}))
+
+    async with areq.Session(coalesce=True) as session:
+        responses = await asyncio.gather(*[session.get(TEST_URL) for _ in range(50)])
+
+    assert len(calls) == 1
+    assert all(r.json() == {"v": 1} for r in responses)
+    assert len({id(r) for r in responses}) == 50
+    assert session.coalescer.coalesced == 49
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_coalesced(httpx_mock):
+    calls = []
+    httpx_mock.add_callback(_slow_callback(calls), is_reusable=True)
+
+    async with areq.Session(coalesce=True) as session:
+        await asyncio.gather(
+            session.get(TEST_URL),
+            session.get(TEST_URL, headers={"accept": "text/plain"}),
+            session.get(f"{TEST_URL}?page=2"),
+            session.post(TEST_URL),
+        )
+
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_key_headers_limit_what_distinguishes_requests(httpx_mock):
+    calls = []
+    httpx_mock.add_callback(_slow_callback(calls), is_reusable=True)
+    coalescer = areq.RequestCoalescer(key_headers=["accept"])
+
+    async with areq.Session(coalesce=coalescer) as session:
+        await asyncio.gather(
+            session.get(TEST_URL, headers={"x-request-id": "1"}),
+            session.get(TEST_URL, headers={"x-request-id": "2"}),
+        )
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared(httpx_mock):
+    async def fail(request):
+        await asyncio.sleep(0.02)
+        raise httpx.ConnectError("refused", request=request)
+
+    httpx_mock.add_callback(fail)
+
+    results = await asyncio.gather(
+        *[areq.get(TEST_URL, coalesce=True) for _ in range(3)], return_exceptions=True
+    )
+
+    assert all(isinstance(r, areq.AreqConnectionError) for r in results)
+    assert results[0] is results[1] is results[2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others(httpx_mock):
+    calls = []
+    httpx_mock.add_callback(_slow_callback(calls, delay=0.05))
+
+    async with areq.Session(coalesce=True) as session:
+        first = asyncio.ensure_future(session.get(TEST_URL))
+        second = asyncio.ensure_future(session.get(TEST_URL))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        response = await second
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalescing_is_opt_in(httpx_mock):
+    calls = []
+    httpx_mock.add_callback(_slow_callback(calls), is_reusable=True)
+
+    async with areq.Session() as session:
+        await asyncio.gather(session.get(TEST_URL), session.get(TEST_URL))
+        assert len(calls) == 2
+        await asyncio.gather(
+            session.get(TEST_URL, coalesce=True), session.get(TEST_URL, coalesce=True)
+        )
+        assert len(calls) == 3
+        await asyncio.gather(*[session.get(TEST_URL) for _ in range(5)])
+        assert len(calls) == 8
+        assert session.coalescer is None
+
+
+@pytest.mark.asyncio
+async def test_callers_keep_their_own_deadlines(httpx_mock):
+    calls = []
+
+    async def flaky(request):
+        calls.append(request)
+        await asyncio.sleep(0.1)
+        return httpx.Response(503 if len(calls) == 1 else 200)
+
+    httpx_mock.add_callback(flaky, is_reusable=True)
+    retry = areq.Retry(total=1, backoff_factor=0, status_forcelist=[503])
+
+    async def get(budget):
+        async with areq.deadline(budget):
+            return await session.get(TEST_URL)
+
+    async with areq.Session(coalesce=True, retries=retry) as session:
+        first = asyncio.ensure_future(get(0.05))
+        await asyncio.sleep(0)
+        second = await get(5)
+
+        with pytest.raises(areq.AreqDeadlineExceeded):
+            await first
+
+    # The retry runs on, bounded by neither caller's deadline.
+    assert second.status_code == 200
+    assert len(calls) == 2
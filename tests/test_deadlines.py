@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import requests
+
+import areq
+
+TEST_URL = "https://example.com/slow"
+
+
+def slow(seconds):
+    async def respond(request):
+        await asyncio.sleep(seconds)
+        return httpx.Response(200, text="late")
+
+    return respond
+
+
+def test_deadline_exceeded_is_a_timeout():
+    assert issubclass(areq.AreqDeadlineExceeded, areq.AreqTimeout)
+    assert issubclass(areq.AreqDeadlineExceeded, requests.exceptions.Timeout)
+
+
+@pytest.mark.asyncio
+async def test_spent_budget_fails_without_sending(httpx_mock):
+    async with areq.deadline(0):
+        with pytest.raises(areq.AreqDeadlineExceeded) as info:
+            await areq.get(TEST_URL)
+
+    assert info.value.timeout == 0
+    assert str(info.value.request.url) == TEST_URL
+    assert httpx_mock.get_requests() == []
+    assert areq.current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_cut_to_the_remaining_budget(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+
+    async with areq.deadline(10) as deadline:
+        assert areq.current_deadline() is deadline
+        await areq.get(TEST_URL, timeout=30)
+        await areq.get(TEST_URL, timeout=httpx.Timeout(1.0, read=None))
+
+    first, second = (
+        request.extensions["timeout"] for request in httpx_mock.get_requests()
+    )
+    assert all(5 < value <= 10 for value in first.values())
+    assert second["connect"] == 1.0
+    assert 5 < second["read"] <= 10
+
+
+@pytest.mark.asyncio
+async def test_in_flight_request_is_cancelled_at_the_deadline(httpx_mock):
+    httpx_mock.add_callback(slow(5))
+
+    start = time.monotonic()
+    with pytest.raises(areq.AreqDeadlineExceeded):
+        async with areq.deadline(0.05):
+            await areq.get(TEST_URL)
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_the_budget(httpx_mock):
+    httpx_mock.add_callback(slow(5), is_reusable=True)
+    outcomes = []
+
+    async def detached():
+        try:
+            await areq.get(TEST_URL)
+        except areq.AreqDeadlineExceeded as e:
+            outcomes.append(e)
+
+    start = time.monotonic()
+    with pytest.raises(areq.AreqDeadlineExceeded):
+        async with areq.deadline(0.05):
+            task = asyncio.ensure_future(detached())
+            await asyncio.gather(areq.get(TEST_URL), areq.get(TEST_URL))
+    await task
+
+    assert time.monotonic() - start < 1
+    assert len(outcomes) == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_inside_the_block_can_handle_the_error(httpx_mock):
+    httpx_mock.add_callback(slow(5))
+
+    async with areq.deadline(0.05):
+        with pytest.raises(areq.AreqDeadlineExceeded):
+            await areq.get(TEST_URL)
+
+
+@pytest.mark.asyncio
+async def test_nested_deadlines_only_shorten_the_budget(httpx_mock):
+    httpx_mock.add_callback(slow(5))
+    httpx_mock.add_response()
+
+    async with areq.deadline(10):
+        with pytest.raises(areq.AreqDeadlineExceeded):
+            async with areq.deadline(0.05):
+                await areq.get(TEST_URL)
+        response = await areq.get(TEST_URL)
+        assert response.status_code == 200
+
+        async with areq.deadline(60) as inner:
+            assert inner.remaining() <= 10
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_the_backoff_outlasts_the_budget(httpx_mock):
+    httpx_mock.add_response(status_code=503, is_reusable=True)
+    retry = areq.Retry(total=5, backoff_factor=10, jitter=False)
+
+    async with areq.deadline(1):
+        response = await areq.get(TEST_URL, retries=retry)
+
+    assert response.status_code == 503
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_is_not_retried_or_counted_by_the_breaker(httpx_mock):
+    httpx_mock.add_callback(slow(5))
+    breaker = areq.CircuitBreaker(failure_threshold=1)
+
+    async with areq.Session(retries=3, circuit_breaker=breaker) as session:
+        async with areq.deadline(0.05):
+            with pytest.raises(areq.AreqDeadlineExceeded):
+                await session.get(TEST_URL)
+
+    assert len(httpx_mock.get_requests()) == 1
+    assert breaker.state("example.com") == "closed"
+
+
+@pytest.mark.asyncio
+async def test_event_streams_stop_reconnecting_at_the_deadline(httpx_mock):
+    httpx_mock.add_callback(slow(5), is_reusable=True)
+
+    start = time.monotonic()
+    with pytest.raises(areq.AreqDeadlineExceeded):
+        async with areq.deadline(0.1):
+            async for _ in areq.sse(TEST_URL, reconnect_delay=0):
+                pass
+    assert time.monotonic() - start < 1
@@ -0,0 +1,202 @@
+import asyncio
+import socket
+
+import httpcore
+import pytest
+
+import areq
+from areq.dns import DNSCacheBackend
+from utils import FakeClock, LocalServer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    return FakeClock.install(monkeypatch, areq.dns)
+
+
+class FakeResolver(areq.BaseResolver):
+    """Answers from a dict; unknown names fail like getaddrinfo()."""
+
+    def __init__(self, records, ttl=None, delay=0):
+        self.records = records
+        self.ttl = ttl
+        self.delay = delay
+        self.queries = []
+
+    async def resolve(self, host):
+        self.queries.append(host)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if host not in self.records:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return areq.DNSAnswer(tuple(self.records[host]), ttl=self.ttl)
+
+
+class FakeStream(httpcore.AsyncNetworkStream):
+    def __init__(self, address):
+        self.address = address
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):
+    """Connects after a per-address delay, or fails for addresses mapped to None."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.attempts = []
+        self.streams = []
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ):
+        self.attempts.append(host)
+        delay = self.delays[host]
+        if delay is None:
+            raise httpcore.ConnectError(f"{host} refused")
+        await asyncio.sleep(delay)
+        stream = FakeStream(host)
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.mark.asyncio
+async def test_answers_are_cached_for_their_ttl(clock):
+    resolver = FakeResolver({"example.com": ["192.0.2.1"]}, ttl=30)
+    cache = areq.DNSCache(resolver, stale_ttl=0)
+
+    assert await cache.resolve("example.com") == ("192.0.2.1",)
+    clock.now += 29
+    assert await cache.resolve("example.com") == ("192.0.2.1",)
+    assert resolver.queries == ["example.com"]
+    clock.now += 1
+    await cache.resolve("example.com")
+    assert resolver.queries == ["example.com"] * 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_ttl_is_clamped(clock):
+    resolver = FakeResolver({"example.com": ["192.0.2.1"]}, ttl=0)
+    cache = areq.DNSCache(resolver, min_ttl=10, stale_ttl=0)
+
+    await cache.resolve("example.com")
+    clock.now += 9
+    await cache.resolve("example.com")
+    assert len(resolver.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_cached(clock):
+    resolver = FakeResolver({})
+    cache = areq.DNSCache(resolver, negative_ttl=5)
+
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            await cache.resolve("missing.test")
+    assert len(resolver.queries) == 1
+    clock.now += 5
+    with pytest.raises(socket.gaierror):
+        await cache.resolve("missing.test")
+    assert len(resolver.queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_answers_are_served_while_refreshing(clock):
+    resolver = FakeResolver({"example.com": ["192.0.2.1"]}, ttl=10)
+    cache = areq.DNSCache(resolver, stale_ttl=30)
+    await cache.resolve("example.com")
+
+    resolver.records["example.com"] = ["192.0.2.2"]
+    clock.now += 20
+    assert await cache.resolve("example.com") == ("192.0.2.1",)
+    await asyncio.sleep(0)
+    assert await cache.resolve("example.com") == ("192.0.2.2",)
+    assert len(resolver.queries) == 2
+
+    # A failed refresh keeps serving the stale answer.
+    del resolver.records["example.com"]
+    clock.now += 20
+    assert await cache.resolve("example.com") == ("192.0.2.2",)
+    await asyncio.sleep(0)
+    assert await cache.resolve("example.com") == ("192.0.2.2",)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query():
+    resolver = FakeResolver({"example.com": ["192.0.2.1"]}, delay=0.01)
+    cache = areq.DNSCache(resolver)
+
+    results = await asyncio.gather(*[cache.resolve("example.com") for _ in range(10)])
+
+    assert results == [("192.0.2.1",)] * 10
+    assert resolver.queries == ["example.com"]
+
+
+@pytest.mark.asyncio
+async def test_ip_addresses_are_not_resolved():
+    resolver = FakeResolver({})
+    cache = areq.DNSCache(resolver)
+
+    assert await cache.resolve("::1") == ("::1",)
+    assert resolver.queries == []
+
+
+@pytest.mark.asyncio
+async def test_happy_eyeballs_races_addresses():
+    cache = areq.DNSCache(
+        FakeResolver({"example.com": ["2001:db8::1", "2001:db8::2", "192.0.2.1"]}),
+        happy_eyeballs_delay=0.02,
+    )
+    # The first IPv6 address hangs; the IPv4 one, tried second, connects.
+    backend = FakeBackend({"2001:db8::1": 1.0, "192.0.2.1": 0.0, "2001:db8::2": 0.0})
+
+    stream = await DNSCacheBackend(cache, backend).connect_tcp("example.com", 443)
+
+    assert stream.address == "192.0.2.1"
+    assert backend.attempts == ["2001:db8::1", "192.0.2.1"]
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_start_the_next_one_immediately():
+    cache = areq.DNSCache(
+        FakeResolver({"example.com": ["192.0.2.1", "192.0.2.2"]}),
+        happy_eyeballs_delay=10,
+    )
+    backend = FakeBackend({"192.0.2.1": None, "192.0.2.2": 0.0})
+
+    stream = await asyncio.wait_for(
+        DNSCacheBackend(cache, backend).connect_tcp("example.com", 443), 1
+    )
+
+    assert stream.address == "192.0.2.2"
+
+
+@pytest.mark.asyncio
+async def test_connect_error_when_every_address_fails():
+    cache = areq.DNSCache(FakeResolver({"example.com": ["192.0.2.1", "192.0.2.2"]}))
+    backend = FakeBackend({"192.0.2.1": None, "192.0.2.2": None})
+
+    with pytest.raises(httpcore.ConnectError, match="192.0.2.1 refused"):
+        await DNSCacheBackend(cache, backend).connect_tcp("example.com", 443)
+    with pytest.raises(httpcore.ConnectError, match="Name or service not known"):
+        await DNSCacheBackend(cache, backend).connect_tcp("missing.test", 443)
+
+
+@pytest.mark.asyncio
+async def test_session_resolves_through_the_cache():
+    resolver = FakeResolver({"service.test": ["::1", "127.0.0.1"]})
+    cache = areq.DNSCache(resolver, happy_eyeballs_delay=0.05)
+
+    async with LocalServer(body=b"resolved") as server:
+        url = server.url.replace("127.0.0.1", "service.test")
+        async with areq.Session(dns_cache=cache) as session:
+            response = await session.get(url)
+
+    assert response.content == b"resolved"
+    assert resolver.queries == ["service.test"]
+
+    with pytest.raises(areq.AreqConnectionError):
+        await areq.get("http://missing.test/", dns_cache=cache)
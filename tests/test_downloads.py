@@ -0,0 +1,214 @@
+import json
+import re
+
+import httpx
+import pytest
+import requests
+from pytest_httpx import IteratorStream
+
+import areq
+
+TEST_URL = "https://example.com/artifact.bin"
+MIRROR_URL = "https://mirror.example.com/artifact.bin"
+BLOB = bytes(range(256)) * 400  # 102400 bytes
+
+
+class RangeServer:
+    """httpx_mock callback serving BLOB with optional byte-range support."""
+
+    def __init__(
+        self,
+        accept_ranges=True,
+        honour_ranges=True,
+        fail_range_at=None,
+        redirect=False,
+        etag='"v1"',
+    ):
+        self.accept_ranges = accept_ranges
+        self.honour_ranges = honour_ranges
+        self.fail_range_at = fail_range_at
+        self.redirect = redirect
+        self.etag = etag
+        self.ranges = []
+
+    def __call__(self, request):
+        if self.redirect and request.url == TEST_URL:
+            return httpx.Response(
+                302, headers={"location": MIRROR_URL}, content=b"moved"
+            )
+        headers = {"etag": self.etag} if self.etag else {}
+        if self.accept_ranges:
+            headers["accept-ranges"] = "bytes"
+        if request.method == "HEAD":
+            return httpx.Response(
+                200, headers={**headers, "content-length": str(len(BLOB))}
+            )
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", request.headers.get("range", ""))
+        if not match or not self.honour_ranges:
+            return httpx.Response(200, headers=headers, content=BLOB)
+        assert request.headers.get("if-range") == self.etag
+        assert request.headers["accept-encoding"] == "identity"
+        start, end = int(match[1]), int(match[2])
+        self.ranges.append((start, end))
+        body = BLOB[start : end + 1]
+        headers["content-range"] = f"bytes {start}-{end}/{len(BLOB)}"
+        if self.fail_range_at is not None and start <= self.fail_range_at <= end:
+            cut = self.fail_range_at - start
+
+            def chunks():
+                yield body[:cut]
+                raise httpx.ReadError("connection reset")
+
+            return httpx.Response(206, headers=headers, stream=IteratorStream(chunks()))
+        return httpx.Response(206, headers=headers, content=body)
+
+
+@pytest.mark.asyncio
+async def test_ranged_download(httpx_mock, tmp_path):
+    server = RangeServer()
+    httpx_mock.add_callback(server, is_reusable=True)
+    target = tmp_path / "artifact.bin"
+
+    result = await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+
+    assert target.read_bytes() == BLOB
+    assert result == areq.DownloadResult(path=target, size=len(BLOB), parts=4)
+    assert sorted(server.ranges) == [
+        (0, 25599),
+        (25600, 51199),
+        (51200, 76799),
+        (76800, 102399),
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["artifact.bin"]
+
+
+@pytest.mark.asyncio
+async def test_small_files_are_not_split(httpx_mock, tmp_path):
+    server = RangeServer()
+    httpx_mock.add_callback(server, is_reusable=True)
+
+    result = await areq.download(TEST_URL, tmp_path / "a.bin", parts=8)
+
+    assert result.parts == 1
+    assert server.ranges == [(0, len(BLOB) - 1)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "server", [RangeServer(accept_ranges=False), RangeServer(honour_ranges=False)]
+)
+async def test_falls_back_to_single_stream(httpx_mock, tmp_path, server):
+    httpx_mock.add_callback(server, is_reusable=True)
+    target = tmp_path / "artifact.bin"
+
+    result = await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+
+    assert target.read_bytes() == BLOB
+    assert result.parts == 1
+    assert not (tmp_path / "artifact.bin.part.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_head_is_not_allowed(httpx_mock, tmp_path):
+    httpx_mock.add_response(method="HEAD", status_code=405)
+    httpx_mock.add_response(method="GET", content=BLOB)
+    target = tmp_path / "artifact.bin"
+
+    result = await areq.download(TEST_URL, target)
+
+    assert target.read_bytes() == BLOB
+    assert result.size == len(BLOB)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept_ranges", [True, False])
+async def test_follows_redirects(httpx_mock, tmp_path, accept_ranges):
+    server = RangeServer(accept_ranges=accept_ranges, redirect=True)
+    httpx_mock.add_callback(server, is_reusable=True)
+    target = tmp_path / "artifact.bin"
+
+    result = await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+
+    assert target.read_bytes() == BLOB
+    assert result.parts == (4 if accept_ranges else 1)
+    range_requests = [r for r in httpx_mock.get_requests() if "range" in r.headers]
+    assert all(r.url == MIRROR_URL for r in range_requests)
+
+
+@pytest.mark.asyncio
+async def test_redirects_are_not_saved_when_disabled(httpx_mock, tmp_path):
+    httpx_mock.add_callback(RangeServer(redirect=True), is_reusable=True)
+    target = tmp_path / "artifact.bin"
+
+    with pytest.raises(requests.exceptions.HTTPError, match="302"):
+        await areq.download(TEST_URL, target, allow_redirects=False)
+    assert not target.exists()
+
+
+@pytest.mark.asyncio
+async def test_mismatched_content_range_is_rejected(httpx_mock, tmp_path):
+    def wrong_range(request):
+        if request.method == "HEAD":
+            headers = {"accept-ranges": "bytes", "content-length": str(len(BLOB))}
+            return httpx.Response(200, headers=headers)
+        headers = {"content-range": f"bytes 0-99/{len(BLOB)}"}
+        return httpx.Response(206, headers=headers, content=BLOB[:100])
+
+    httpx_mock.add_callback(wrong_range, is_reusable=True)
+
+    with pytest.raises(ValueError, match="Server sent range"):
+        await areq.download(TEST_URL, tmp_path / "a.bin", parts=2, min_part_size=1024)
+
+
+@pytest.mark.asyncio
+async def test_resumes_interrupted_download(httpx_mock, tmp_path):
+    failing = RangeServer(fail_range_at=60000)
+    httpx_mock.add_callback(failing, is_reusable=True)
+    target = tmp_path / "artifact.bin"
+
+    with pytest.raises(areq.AreqConnectionError):
+        await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+
+    state = json.loads((tmp_path / "artifact.bin.part.json").read_text())
+    assert [start + written for start, _, written in state["ranges"]][2] == 60000
+    assert not target.exists()
+
+    httpx_mock.reset()
+    server = RangeServer()
+    httpx_mock.add_callback(server, is_reusable=True)
+    result = await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+
+    assert target.read_bytes() == BLOB
+    assert (60000, 76799) in server.ranges
+    assert result.resumed_bytes >= 60000 - 51200
+    assert not (tmp_path / "artifact.bin.part.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_http_errors_are_raised(httpx_mock, tmp_path):
+    httpx_mock.add_response(method="HEAD", status_code=404)
+    httpx_mock.add_response(method="GET", status_code=404)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        await areq.download(TEST_URL, tmp_path / "missing.bin")
+
+
+@pytest.mark.asyncio
+async def test_does_not_resume_without_a_validator(httpx_mock, tmp_path):
+    httpx_mock.add_callback(
+        RangeServer(fail_range_at=60000, etag=None), is_reusable=True
+    )
+    target = tmp_path / "artifact.bin"
+
+    with pytest.raises(areq.AreqConnectionError):
+        await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+    assert not (tmp_path / "artifact.bin.part.json").exists()
+
+    httpx_mock.reset()
+    server = RangeServer(etag=None)
+    httpx_mock.add_callback(server, is_reusable=True)
+    result = await areq.download(TEST_URL, target, parts=4, min_part_size=1024)
+
+    assert target.read_bytes() == BLOB
+    assert result.resumed_bytes == 0
+    assert sorted(server.ranges)[0] == (0, 25599)
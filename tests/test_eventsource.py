@@ -0,0 +1,104 @@
+import httpx
+import pytest
+import requests
+from pytest_httpx import IteratorStream
+
+import areq
+import areq.sync
+from areq.eventsource import SSEDecoder
+from areq.models import LineBuffer
+
+TEST_URL = "https://example.com/events"
+
+
+def event_stream(*chunks):
+    return IteratorStream(list(chunks))
+
+
+@pytest.mark.asyncio
+async def test_events_are_parsed_across_chunk_boundaries(httpx_mock):
+    httpx_mock.add_response(
+        stream=event_stream(
+            b": comment\r\nevent: update\r",
+            b"\ndata: first line\rdata:second",
+            b' line\n\nid: 7\ndata: {"n"',
+            b": 1}\n\n",
+        ),
+        headers={"Content-Type": "text/event-stream"},
+    )
+
+    events = []
+    async for event in areq.sse(TEST_URL, reconnect=False):
+        events.append(event)
+
+    assert events == [
+        areq.ServerSentEvent("first line\nsecond line", event="update"),
+        areq.ServerSentEvent('{"n": 1}', id="7"),
+    ]
+    assert events[1].json() == {"n": 1}
+    request = httpx_mock.get_requests()[0]
+    assert request.headers["Accept"] == "text/event-stream"
+
+
+@pytest.mark.asyncio
+async def test_reconnects_with_last_event_id(httpx_mock):
+    httpx_mock.add_response(
+        stream=event_stream(b"retry: 0\nid: 1\ndata: a\n\ndata: cut")
+    )
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    httpx_mock.add_response(stream=event_stream(b"id: 2\ndata: b\n\n"))
+    httpx_mock.add_response(status_code=204)
+
+    events = [event async for event in areq.sse(TEST_URL)]
+
+    assert [(event.id, event.data) for event in events] == [("1", "a"), ("2", "b")]
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 4
+    assert "last-event-id" not in requests[0].headers
+    assert [r.headers["Last-Event-ID"] for r in requests[1:]] == ["1", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_reconnects(httpx_mock):
+    httpx_mock.add_exception(httpx.ConnectError("refused"), is_reusable=True)
+
+    with pytest.raises(areq.AreqConnectionError):
+        async for _ in areq.sse(TEST_URL, max_reconnects=2, reconnect_delay=0):
+            pass
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_error_status_raises(httpx_mock):
+    httpx_mock.add_response(status_code=503)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        async for _ in areq.sse(TEST_URL):
+            pass
+
+
+def test_decoder_ignores_unknown_fields_and_ids_with_nul():
+    decoder = SSEDecoder(last_event_id="0")
+    for line in ["foo: bar", "id: a\0b", "retry: soon", "data"]:
+        assert decoder.decode(line) is None
+
+    event = decoder.decode("")
+
+    assert event == areq.ServerSentEvent("", id="0")
+    assert decoder.retry is None
+
+
+def test_line_buffer_bounds_incomplete_lines():
+    lines = LineBuffer(max_line_size=8)
+    assert lines.feed(b"ab\r\ncd") == [b"ab"]
+    assert lines.feed(b"ef\n\n") == [b"cdef", b""]
+    with pytest.raises(ValueError, match="max_line_size"):
+        lines.feed(b"x" * 9)
+
+
+def test_sync_sse(httpx_mock):
+    httpx_mock.add_response(stream=event_stream(b"data: hello\n\n"))
+
+    events = list(areq.sync.sse(TEST_URL, reconnect=False))
+
+    assert [event.data for event in events] == ["hello"]
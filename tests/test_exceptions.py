@@ -0,0 +1,70 @@
+import httpx
+import pytest
+import requests
+
+import areq
+from areq import exceptions
+
+TEST_URL = "https://example.com"
+
+
+def _linear_lookup(error):
+    for error_type, converter in exceptions.mapper.items():
+        if isinstance(error, error_type):
+            return converter
+    return areq.AreqException
+
+
+@pytest.mark.parametrize("error_type", list(exceptions.mapper))
+def test_dispatch_matches_mapper_order(error_type):
+    assert exceptions._converter_for(error_type) is _linear_lookup(
+        error_type.__new__(error_type)
+    )
+
+
+def test_dispatch_of_unmapped_subclass():
+    class CustomReadError(httpx.ReadError):
+        pass
+
+    error = CustomReadError("boom", request=httpx.Request("GET", TEST_URL))
+    converted = areq.convert_httpx_to_areq_exception(error)
+
+    assert type(converted) is areq.AreqConnectionError
+    assert converted.underlying_exception is error
+
+
+def test_request_and_response_are_wrapped_lazily(monkeypatch):
+    request = httpx.Request("GET", TEST_URL)
+    response = httpx.Response(503, request=request)
+    error = httpx.HTTPStatusError("unavailable", request=request, response=response)
+
+    built = []
+    original = exceptions.create_areq_response
+    monkeypatch.setattr(
+        exceptions,
+        "create_areq_response",
+        lambda r: built.append(r) or original(r),
+    )
+    converted = areq.convert_httpx_to_areq_exception(error)
+
+    assert isinstance(converted, requests.exceptions.HTTPError)
+    assert built == []
+    assert converted.response.status_code == 503
+    assert converted.response is converted.response
+    assert len(built) == 1
+    assert converted.request.url == TEST_URL
+
+
+def test_error_without_request():
+    converted = areq.convert_httpx_to_areq_exception(httpx.ReadTimeout("timed out"))
+
+    assert isinstance(converted, requests.exceptions.ReadTimeout)
+    assert converted.request is None
+    assert converted.response is None
+
+
+def test_explicit_request_is_kept():
+    marker = areq.AreqRequest(httpx.Request("POST", TEST_URL))
+    converted = areq.AreqException(httpx.ReadError("reset"), request=marker)
+
+    assert converted.request is marker
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import areq
+
+TEST_URL = "https://example.com"
+
+
+def slow_then_fast(slow_delay=1.0):
+    calls = []
+
+    async def respond(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(slow_delay)
+            return httpx.Response(200, text="slow")
+        return httpx.Response(200, text="fast")
+
+    return calls, respond
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged(httpx_mock):
+    calls, respond = slow_then_fast()
+    httpx_mock.add_callback(respond, is_reusable=True)
+    hedge = areq.Hedge(delay=0.05)
+
+    async with areq.Session(hedge=hedge) as session:
+        start = time.monotonic()
+        response = await session.get(TEST_URL)
+        elapsed = time.monotonic() - start
+
+    assert response.text == "fast"
+    assert response.content == b"fast"
+    assert elapsed < 0.5
+    assert len(calls) == 2
+    assert (hedge.requests, hedge.hedges, hedge.hedge_wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged(httpx_mock):
+    httpx_mock.add_response(text="ok")
+
+    response = await areq.get(TEST_URL, hedge=0.5)
+
+    assert response.text == "ok"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_methods_are_not_hedged(httpx_mock):
+    calls, respond = slow_then_fast(slow_delay=0.2)
+    httpx_mock.add_callback(respond)
+
+    response = await areq.post(TEST_URL, json={"a": 1}, hedge=0.01)
+
+    assert response.text == "slow"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_by_the_budget(httpx_mock):
+    calls, respond = slow_then_fast(slow_delay=0.2)
+    httpx_mock.add_callback(respond)
+    hedge = areq.Hedge(delay=0.01, budget=areq.RetryBudget(ratio=0, min_retries=0))
+
+    response = await areq.get(TEST_URL, hedge=hedge)
+
+    assert response.text == "slow"
+    assert len(calls) == 1
+    assert hedge.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_races_on_headers(httpx_mock):
+    calls, respond = slow_then_fast()
+    httpx_mock.add_callback(respond, is_reusable=True)
+
+    async with areq.Session(hedge=0.05) as session:
+        response = await session.get(TEST_URL, stream=True)
+        assert await response.aread() == b"fast"
+
+
+@pytest.mark.asyncio
+async def test_attempts_do_not_share_request_state(httpx_mock):
+    calls, respond = slow_then_fast(slow_delay=0.2)
+    traces = []
+
+    def record(request):
+        traces.append(request.extensions["trace"])
+        # The first attempt, still in flight, keeps its own tracer.
+        assert calls == [] or calls[0].extensions["trace"] is traces[0]
+        return respond(request)
+
+    httpx_mock.add_callback(record, is_reusable=True)
+    events = []
+
+    async with areq.Session(
+        hedge=0.05, hooks={"request_start": events.append}
+    ) as session:
+        await session.get(TEST_URL)
+
+    assert len(calls) == 2 and calls[0] is not calls[1]
+    assert traces[0] is not traces[1]
+    assert len(events) == 2
+
+
+@pytest.mark.asyncio
+async def test_first_error_is_raised_when_every_attempt_fails(httpx_mock):
+    async def fail(request):
+        await asyncio.sleep(0.05)
+        raise httpx.ReadError("reset")
+
+    httpx_mock.add_callback(fail, is_reusable=True)
+
+    with pytest.raises(areq.AreqConnectionError):
+        await areq.get(TEST_URL, hedge=0.01)
+
+
+def test_delay_from_percentile():
+    hedge = areq.Hedge(0.2, percentile=0.9, min_samples=10, sample_size=100)
+
+    assert hedge.get_delay("example.com") == 0.2
+    for i in range(100):
+        hedge.record("example.com", i / 1000)
+    assert hedge.get_delay("example.com") == pytest.approx(0.09)
+    # Refreshed only after a tenth of the window is new.
+    for _ in range(9):
+        hedge.record("example.com", 1.0)
+    assert hedge.get_delay("example.com") == pytest.approx(0.09)
+    hedge.record("example.com", 1.0)
+    assert hedge.get_delay("example.com") == 1.0
+
+
+def test_hedge_requires_a_delay():
+    with pytest.raises(ValueError):
+        areq.Hedge()
@@ -0,0 +1,173 @@
+import httpx
+import pytest
+import requests
+
+import areq
+from utils import LocalServer
+
+TEST_URL = "https://example.com"
+
+
+@pytest.mark.asyncio
+async def test_hooks_observe_request_lifecycle():
+    events = []
+
+    async def async_hook(event):
+        events.append(event)
+
+    hooks = {name: [events.append] for name in areq.HOOK_EVENTS}
+    hooks["response_complete"] = async_hook
+
+    async with LocalServer(body=b"x" * 1000) as server:
+        async with areq.Session(hooks=hooks) as session:
+            response = await session.post(server.url, content=b"payload")
+            await session.get(server.url)
+
+    names = [event.name for event in events]
+    assert (
+        names
+        == [
+            "request_start",
+            "connection_acquired",
+            "headers_received",
+            "response_complete",
+        ]
+        * 2
+    )
+    complete = events[3]
+    assert complete.response is response
+    assert complete.status_code == 200
+    assert complete.method == "POST"
+    assert complete.host == "127.0.0.1"
+    assert complete.bytes_sent == 7
+    assert complete.bytes_received == 1000
+
+    timings = complete.timings
+    assert timings.connect is not None and timings.connect >= 0
+    assert timings.tls is None
+    assert 0 <= timings.pool_wait <= timings.time_to_first_byte <= timings.total
+    assert timings.server is not None
+    # The second request reuses the pooled connection.
+    assert events[7].timings.connect is None
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_exception_hook(httpx_mock):
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    errors = []
+
+    async with areq.Session(hooks={"exception": errors.append}) as session:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            await session.get(TEST_URL)
+
+    assert len(errors) == 1
+    assert isinstance(errors[0].exception, areq.AreqConnectionError)
+    assert errors[0].timings.total is not None
+
+
+@pytest.mark.asyncio
+async def test_request_hooks_run_after_session_hooks(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+    calls = []
+
+    async with areq.Session(
+        hooks={"response_complete": lambda e: calls.append("session")}
+    ) as session:
+        await session.get(
+            TEST_URL, hooks={"response_complete": lambda e: calls.append("request")}
+        )
+        await session.get(TEST_URL)
+
+    assert calls == ["session", "request", "session"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_completes_on_close(httpx_mock):
+    httpx_mock.add_response(content=b"abc")
+    completed = []
+
+    async with areq.Session(hooks={"response_complete": completed.append}) as session:
+        response = await session.get(TEST_URL, stream=True)
+        assert completed == []
+        assert await response.aread() == b"abc"
+        await response.aclose()
+
+    assert len(completed) == 1
+    assert completed[0].bytes_received == 3
+
+
+@pytest.mark.asyncio
+async def test_hooks_preserve_user_trace():
+    traced = []
+
+    async def trace(name, info):
+        traced.append(name)
+
+    async with LocalServer() as server:
+        async with areq.Session(hooks={"request_start": lambda e: None}) as session:
+            await session.get(server.url, extensions={"trace": trace})
+
+    assert "http11.receive_response_headers.complete" in traced
+
+
+def test_unknown_hook_event():
+    with pytest.raises(ValueError, match="Unknown hook event"):
+        areq.Session(hooks={"response": print})
+
+
+@pytest.mark.asyncio
+async def test_metrics_collector():
+    metrics = areq.MetricsCollector()
+
+    async with LocalServer(body=b"hello") as server:
+        async with areq.Session(hooks=metrics.hooks) as session:
+            for _ in range(3):
+                await session.get(server.url)
+        closed_url = server.url
+    async with areq.Session(hooks=metrics.hooks) as session:
+        with pytest.raises(areq.AreqConnectionError):
+            await session.get(closed_url)
+
+    snapshot = metrics.snapshot()
+    [durations] = snapshot["request_duration_seconds"]
+    assert durations["labels"] == ["127.0.0.1", "GET", 200]
+    assert durations["count"] == 3
+    assert durations["p50"] is not None
+    assert snapshot["bytes_received"] == {"127.0.0.1": 15}
+    assert snapshot["errors"] == [
+        {"labels": ["127.0.0.1", "GET", "AreqConnectionError"], "count": 1}
+    ]
+
+    text = metrics.to_prometheus()
+    assert "# TYPE areq_request_duration_seconds histogram" in text
+    assert (
+        'areq_request_duration_seconds_count{host="127.0.0.1",method="GET",status="200"} 3'
+        in text
+    )
+    assert (
+        'areq_errors_total{host="127.0.0.1",method="GET",exception="AreqConnectionError"} 1'
+        in text
+    )
+
+
+def test_histogram_quantiles():
+    histogram = areq.metrics.Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+
+
+@pytest.mark.asyncio
+async def test_module_functions_accept_hooks(httpx_mock):
+    httpx_mock.add_response(json={"ok": True})
+    completed = []
+
+    await areq.get(TEST_URL, hooks={"response_complete": completed.append})
+
+    assert completed[0].status_code == 200
+    assert not areq.get_default_session().hooks
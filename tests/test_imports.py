@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import pytest
+
+import areq
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, areq; "
+        "print(','.join(m for m in ('httpx', 'requests', 'urllib3') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_every_public_name_resolves():
+    assert set(areq._LAZY_ATTRIBUTES) == set(areq.__all__)
+    for name in areq.__all__:
+        assert getattr(areq, name) is not None
+    assert areq.Session is areq.sessions.Session
+    assert set(areq.__all__) <= set(dir(areq))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="does_not_exist"):
+        areq.does_not_exist
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+from pytest_httpx import IteratorStream
+
+import areq
+from utils import LocalServer
+
+TEST_URL = "https://example.com/large"
+
+
+@pytest.mark.asyncio
+async def test_content_length_above_the_limit_fails_before_reading(httpx_mock):
+    httpx_mock.add_response(content=b"x" * 100)
+
+    with pytest.raises(areq.AreqContentTooLarge) as info:
+        await areq.get(TEST_URL, max_content_size=99)
+
+    assert info.value.max_content_size == 99
+    assert info.value.response.status_code == 200
+    assert str(info.value.request.url) == TEST_URL
+
+
+@pytest.mark.asyncio
+async def test_chunked_body_above_the_limit_fails_while_reading(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"x" * 60, b"x" * 60]))
+
+    with pytest.raises(areq.AreqContentTooLarge):
+        await areq.get(TEST_URL, max_content_size=100)
+
+
+@pytest.mark.asyncio
+async def test_body_within_the_limit_is_read(httpx_mock):
+    httpx_mock.add_response(content=b"x" * 100)
+
+    response = await areq.get(TEST_URL, max_content_size=100)
+
+    assert response.content == b"x" * 100
+    assert response.httpx_response.content == b"x" * 100
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_checked_as_it_is_consumed(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"x" * 60, b"x" * 60]))
+
+    response = await areq.get(TEST_URL, stream=True, max_content_size=100)
+    chunks = []
+    with pytest.raises(areq.AreqContentTooLarge):
+        async for chunk in response.iter_content(chunk_size=None):
+            chunks.append(chunk)
+    assert chunks == [b"x" * 60]
+
+
+@pytest.mark.asyncio
+async def test_session_limit_and_per_request_override(httpx_mock):
+    httpx_mock.add_response(content=b"x" * 100, is_reusable=True)
+
+    async with areq.Session(max_content_size=10) as session:
+        with pytest.raises(areq.AreqContentTooLarge):
+            await session.get(TEST_URL)
+        response = await session.get(TEST_URL, max_content_size=1000)
+    assert len(response.content) == 100
+
+
+@pytest.mark.asyncio
+async def test_too_large_is_not_retried(httpx_mock):
+    httpx_mock.add_response(content=b"x" * 100, is_reusable=True)
+
+    with pytest.raises(areq.AreqContentTooLarge):
+        await areq.get(TEST_URL, max_content_size=10, retries=3)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_too_large_body_closes_the_connection():
+    async with LocalServer(body=b"x" * 100_000) as server:
+        async with areq.Session() as session:
+            with pytest.raises(areq.AreqContentTooLarge):
+                await session.get(server.url, max_content_size=1000)
+            response = await session.get(server.url)
+    assert len(response.content) == 100_000
+    assert server.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_large_body_spills_to_a_memory_mapped_file(httpx_mock):
+    document = {"items": list(range(1000))}
+    body = json.dumps(document).encode()
+    httpx_mock.add_response(stream=IteratorStream([body[:1000], body[1000:]]))
+
+    response = await areq.get(TEST_URL, spill_threshold=1024)
+
+    assert isinstance(response.content, memoryview)
+    assert response.content == body
+    assert response.json() == document
+    assert response.text == body.decode()
+    chunks = [chunk async for chunk in response.iter_content(chunk_size=None)]
+    assert b"".join(chunks) == body
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_small_body_stays_in_memory(httpx_mock):
+    httpx_mock.add_response(content=b"small")
+
+    response = await areq.get(TEST_URL, spill_threshold=1024)
+
+    assert response.content == b"small"
+    assert isinstance(response.content, bytes)
+
+
+@pytest.mark.asyncio
+async def test_streamed_aread_spills_too(httpx_mock):
+    httpx_mock.add_response(content=b"x" * 5000)
+
+    async with areq.Session(spill_threshold=1024) as session:
+        response = await session.get(TEST_URL, stream=True)
+        content = await response.aread()
+
+    assert isinstance(content, memoryview)
+    assert bytes(content) == b"x" * 5000
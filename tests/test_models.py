@@ -1,3 +1,8 @@
+import codecs
+import json
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
 import httpx
 import pytest
 import requests
@@ -5,10 +10,28 @@ from requests.structures import CaseInsensitiveDict
 from urllib3 import HTTPResponse
 
 import areq
+from areq import models
 
 TEST_URL = "https://httpbin.org/get"
 
 
+def make_response(content, headers=None):
+    request = httpx.Request("GET", "https://example.com")
+    return areq.AreqResponse(
+        httpx.Response(200, content=content, headers=headers, request=request)
+    )
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.calls = 0
+
+    def submit(self, *args, **kwargs):
+        self.calls += 1
+        return super().submit(*args, **kwargs)
+
+
 @pytest.mark.asyncio
 async def test_areq_response_creation():
     async with httpx.AsyncClient() as client:
@@ -158,3 +181,94 @@ def test_response_raise_for_status():
     response = areq.AreqResponse(httpx_response)
     with pytest.raises(requests.exceptions.HTTPError):
         response.raise_for_status()
+
+
+def test_response_raw_and_headers_are_lazy():
+    httpx_response = httpx.Response(
+        status_code=200,
+        content=b"lazy",
+        headers={"content-type": "text/plain", "set-cookie": "a=1; Path=/"},
+        request=httpx.Request("GET", httpx.URL("https://example.com")),
+    )
+    response = areq.AreqResponse(httpx_response)
+    assert "_raw" not in vars(response)
+    assert "_headers" not in vars(response)
+
+    assert isinstance(response.headers, CaseInsensitiveDict)
+    assert response.headers["Content-Type"] == "text/plain"
+    assert response.headers is response.headers
+
+    assert isinstance(response.raw, HTTPResponse)
+    assert response.raw.data == b"lazy"
+    assert response.raw is response.raw
+
+    assert response.cookies["a"] == "1"
+
+
+def test_json_is_parsed_from_bytes():
+    document = {"name": "世界", "values": [1, 2.5, None, True]}
+    content = json.dumps(document, ensure_ascii=False).encode()
+
+    assert make_response(content).json() == document
+    assert make_response(codecs.BOM_UTF8 + content).json() == document
+    assert make_response(b"1.5").json(parse_float=Decimal) == Decimal("1.5")
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b"[NaN, Infinity]", [float("nan"), float("inf")]),
+        (b"18446744073709551616", 2**64),
+    ],
+)
+def test_json_accepts_what_the_standard_library_does(content, expected):
+    result = make_response(content).json()
+
+    assert json.dumps(result) == json.dumps(expected)
+
+
+def test_long_numbers_are_found_across_spill_slices():
+    boundary = models.SPILL_CHUNK_SIZE
+    content = b" " * (boundary - 10) + b"1" * 19 + b" "
+
+    assert models._has_long_number(content)
+    assert models._has_long_number(memoryview(content))
+    assert not models._has_long_number(
+        memoryview(content.replace(b"1" * 19, b"1" * 18))
+    )
+
+
+def test_json_in_other_encodings():
+    content = json.dumps({"name": "café"}, ensure_ascii=False).encode("latin-1")
+    headers = {"content-type": "application/json; charset=latin-1"}
+
+    assert make_response(content, headers).json() == {"name": "café"}
+
+
+@pytest.mark.parametrize("content", [b"invalid json", b"", b'{"a": "\xff"'])
+def test_invalid_json(content):
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        make_response(content).json()
+
+
+@pytest.mark.asyncio
+async def test_ajson_offloads_large_documents(monkeypatch):
+    monkeypatch.setattr(models, "JSON_OFFLOAD_THRESHOLD", 16)
+    executor = CountingExecutor()
+
+    small = await make_response(b"[1, 2]").ajson(executor=executor)
+    large = await make_response(b'{"items": [1, 2, 3, 4, 5]}').ajson(executor=executor)
+
+    assert (small, large) == ([1, 2], {"items": [1, 2, 3, 4, 5]})
+    assert executor.calls == 1
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        await make_response(b'{"items": [1, 2, 3, 4, 5').ajson(executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_ajson_reads_streamed_responses():
+    stream = httpx.ByteStream(b'{"streamed": true}')
+    request = httpx.Request("GET", "https://example.com")
+    response = areq.AreqResponse(httpx.Response(200, stream=stream, request=request))
+
+    assert await response.ajson() == {"streamed": True}
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+import areq
+from utils import LocalServer
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connections_that_requests_reuse():
+    async with LocalServer() as server:
+        async with areq.Session() as session:
+            assert await session.warm_up(server.url, connections=3) == 3
+            assert server.connections == 3
+
+            await asyncio.gather(*[session.get(server.url) for _ in range(3)])
+            assert server.connections == 3
+
+            # Already warm: nothing more to open.
+            assert await session.warm_up(server.url, connections=2) == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_raises_when_an_origin_is_unreachable():
+    async with LocalServer() as server:
+        url = server.url
+    async with areq.Session() as session:
+        with pytest.raises(areq.AreqConnectionError):
+            await session.warm_up(url)
+
+
+@pytest.mark.asyncio
+async def test_module_level_warm_up_uses_the_default_session():
+    async with LocalServer() as server:
+        assert await areq.warm_up(server.url, connections=2) == 2
+        await areq.get(server.url)
+        assert server.connections == 2
+        await areq.get_default_session().close_idle_connections(older_than=0)
+
+
+@pytest.mark.asyncio
+async def test_pool_stats():
+    async with LocalServer() as server:
+        async with areq.Session() as session:
+            assert session.pool_stats().open == 0
+            await session.warm_up(server.url, connections=2)
+
+            stats = session.pool_stats()
+            assert (stats.open, stats.idle, stats.in_use, stats.queued) == (2, 2, 0, 0)
+            [origin] = stats.origins.values()
+            assert origin.origin == server.url.rstrip("/")
+            assert origin.http_versions == {"HTTP/1.1": 2}
+            assert len(origin.ages) == 2
+            assert origin.ages[0] >= origin.ages[1] >= 0
+
+            async with await session.get(server.url, stream=True):
+                assert session.pool_stats().in_use == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_counts_queued_requests():
+    async with LocalServer() as server:
+        async with areq.Session(max_connections=1) as session:
+            async with await session.get(server.url, stream=True):
+                waiting = asyncio.ensure_future(session.get(server.url))
+                await asyncio.sleep(0.01)
+                assert session.pool_stats().queued == 1
+            await waiting
+            assert session.pool_stats().queued == 0
+
+
+@pytest.mark.asyncio
+async def test_close_idle_connections():
+    async with LocalServer() as server:
+        async with areq.Session(keepalive_expiry=60) as session:
+            await session.warm_up(server.url, connections=2)
+            assert await session.close_idle_connections() == 0
+            assert await session.close_idle_connections(older_than=0) == 2
+            assert session.pool_stats().open == 0
+
+            await session.get(server.url)
+            assert server.connections == 3
+
+
+@pytest.mark.asyncio
+async def test_close_idle_leaves_connections_in_use():
+    async with LocalServer(body=b"x" * 100) as server:
+        async with areq.Session() as session:
+            await session.warm_up(server.url, connections=2)
+            response = await session.get(server.url, stream=True)
+
+            assert await session.close_idle_connections(older_than=0) == 1
+            assert await response.aread() == b"x" * 100
+            await response.aclose()
+            assert session.pool_stats().open == 1
+
+
+@pytest.mark.asyncio
+async def test_max_connection_lifetime_retires_old_connections():
+    async with LocalServer() as server:
+        async with areq.Session(max_connection_lifetime=0.05) as session:
+            await session.get(server.url)
+            await session.get(server.url)
+            assert server.connections == 1
+
+            await asyncio.sleep(0.06)
+            session._next_sweep = 0.0  # Skip the wait for the next sweep.
+            await session.get(server.url)
+            assert server.connections == 2
@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import areq
+from utils import FakeClock
+
+TEST_URL = "https://example.com"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    return FakeClock.install(monkeypatch, areq.ratelimit)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_burst_then_rate(clock):
+    bucket = areq.TokenBucket(rate=10, burst=3)
+
+    for _ in range(5):
+        await bucket.acquire()
+
+    assert clock.sleeps == [0.1, 0.1]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_while_idle(clock):
+    bucket = areq.TokenBucket(rate=10, burst=2)
+    for _ in range(2):
+        await bucket.acquire()
+    clock.now += 1.0
+
+    await bucket.acquire()
+    await bucket.acquire()
+
+    assert clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_is_fair_and_holds_the_rate():
+    bucket = areq.TokenBucket(rate=200, burst=1)
+    order = []
+
+    async def worker(index):
+        await bucket.acquire()
+        order.append(index)
+
+    start = time.monotonic()
+    await asyncio.gather(*[worker(i) for i in range(20)])
+
+    assert order == list(range(20))
+    assert time.monotonic() - start >= 19 / 200 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_its_slot(clock, monkeypatch):
+    bucket = areq.TokenBucket(rate=1, burst=1)
+    await bucket.acquire()
+    tat = bucket._tat
+
+    async def never_wakes(delay):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(areq.ratelimit, "_sleep", never_wakes)
+    with pytest.raises(asyncio.CancelledError):
+        await bucket.acquire()
+
+    assert bucket._tat == tat
+
+
+@pytest.mark.asyncio
+async def test_waiter_keeps_its_token_across_a_pause(clock, monkeypatch):
+    bucket = areq.TokenBucket(rate=1, burst=1)
+    await bucket.acquire()
+    tat = bucket._tat
+
+    async def paused_while_asleep(delay):
+        if not clock.sleeps:
+            bucket.pause(5)
+        await clock.sleep(delay)
+
+    monkeypatch.setattr(areq.ratelimit, "_sleep", paused_while_asleep)
+    await bucket.acquire()
+
+    # The slot reserved at +1s moves back by the 5s pause.
+    assert clock.sleeps == [1.0, 5.0]
+    assert bucket._tat == tat + 1 + 5
+
+
+@pytest.mark.asyncio
+async def test_waiters_keep_their_spacing_across_a_pause(clock, monkeypatch):
+    monkeypatch.setattr(areq.ratelimit, "_sleep", clock.park)
+    bucket = areq.TokenBucket(rate=10, burst=1)
+    admitted = []
+
+    async def worker():
+        await bucket.acquire()
+        admitted.append(clock.now)
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(20)]
+    await asyncio.sleep(0)
+    bucket.pause(1.0)
+    while await clock.advance():
+        pass
+    await asyncio.gather(*tasks)
+
+    assert admitted[0] == 1000.0
+    assert admitted[1] >= 1001.0
+    gaps = {round(b - a, 6) for a, b in zip(admitted[1:], admitted[2:])}
+    assert gaps == {0.1}
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_the_host(httpx_mock, clock):
+    httpx_mock.add_response(status_code=429, headers={"retry-after": "2"})
+    httpx_mock.add_response(is_reusable=True)
+    limiter = areq.RateLimiter(100, burst=10)
+
+    async with areq.Session(rate_limit=limiter) as session:
+        assert (await session.get(TEST_URL)).status_code == 429
+        assert (await session.get(TEST_URL)).status_code == 200
+
+    assert clock.sleeps == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_slow_down_without_retry_after_and_recovery(httpx_mock):
+    httpx_mock.add_response(status_code=503)
+    httpx_mock.add_response(is_reusable=True)
+    limiter = areq.RateLimiter(100, recovery=0.25)
+
+    async with areq.Session() as session:
+        await session.get(TEST_URL, rate_limit=limiter)
+        bucket = limiter.bucket("example.com")
+        assert bucket.rate == 50
+        await session.get(TEST_URL, rate_limit=limiter)
+        assert bucket.rate == 75
+        await session.get(TEST_URL, rate_limit=limiter)
+        await session.get(TEST_URL, rate_limit=limiter)
+        assert bucket.rate == 100
+
+
+def test_per_key_limits():
+    limiter = areq.RateLimiter(
+        None, limits={"api.example.com": (5, 2), "cdn.example.com": 50}
+    )
+
+    assert limiter.bucket("other.example.com") is None
+    assert (
+        limiter.bucket("api.example.com").rate,
+        limiter.bucket("api.example.com").burst,
+    ) == (5, 2)
+    assert limiter.bucket("cdn.example.com").burst == 50
+
+
+def test_custom_key():
+    limiter = areq.RateLimiter(1, key=lambda request: request.headers.get("x-api-key"))
+    request = httpx.Request("GET", TEST_URL, headers={"x-api-key": "k1"})
+
+    assert limiter.key(request) == "k1"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_applies_to_each_retry(httpx_mock, clock):
+    # clock also replaces the sleep used by Retry; asyncio is one shared module.
+    httpx_mock.add_response(status_code=502)
+    httpx_mock.add_response()
+    limiter = areq.RateLimiter(100)
+    acquired = []
+    original = limiter.acquire
+
+    async def acquire(request):
+        acquired.append(request.url)
+        await original(request)
+
+    limiter.acquire = acquire
+
+    response = await areq.get(TEST_URL, rate_limit=limiter, retries=1)
+
+    assert response.status_code == 200
+    assert len(acquired) == 2
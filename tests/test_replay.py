@@ -0,0 +1,126 @@
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+
+import areq
+from areq.replay import UnmatchedRequestError
+
+TEST_URL = "https://api.example.com"
+
+
+def upstream(request):
+    if request.url.path == "/binary":
+        return httpx.Response(200, content=bytes(range(256)))
+    if request.url.path == "/gzip":
+        return httpx.Response(
+            200,
+            headers={"content-encoding": "gzip"},
+            content=gzip.compress(b"compressed body"),
+        )
+    if request.method == "POST":
+        return httpx.Response(201, json={"echo": json.loads(request.content)})
+    return httpx.Response(200, json={"path": request.url.path})
+
+
+async def record(path):
+    recorder = areq.RecordingTransport(path, transport=httpx.MockTransport(upstream))
+    async with areq.Session(transport=recorder) as session:
+        await session.get(f"{TEST_URL}/users")
+        await session.get(f"{TEST_URL}/binary")
+        await session.get(f"{TEST_URL}/gzip")
+        await session.post(f"{TEST_URL}/users", json={"name": "a"})
+        await session.post(f"{TEST_URL}/users", json={"name": "b"})
+    return recorder
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["api.jsonl", "api.jsonl.gz"])
+async def test_record_then_replay(tmp_path, name):
+    path = tmp_path / name
+    await record(path)
+
+    async with areq.Session(transport=areq.ReplayTransport(path)) as session:
+        users = await session.get(f"{TEST_URL}/users")
+        binary = await session.get(f"{TEST_URL}/binary")
+        compressed = await session.get(f"{TEST_URL}/gzip")
+        created = await session.post(f"{TEST_URL}/users", json={"name": "a"})
+
+    assert users.json() == {"path": "/users"}
+    assert binary.content == bytes(range(256))
+    assert compressed.content == b"compressed body"
+    assert created.status_code == 201
+    assert created.json() == {"echo": {"name": "a"}}
+    assert sorted(p.name for p in tmp_path.iterdir()) == [name]
+
+
+@pytest.mark.asyncio
+async def test_cassette_format(tmp_path):
+    recorder = await record(tmp_path / "api.jsonl")
+
+    lines = (tmp_path / "api.jsonl").read_text().splitlines()
+    assert json.loads(lines[0]) == {"version": 1}
+    first = json.loads(lines[1])
+    assert first["method"] == "GET"
+    assert first["url"] == f"{TEST_URL}/users"
+    assert json.loads(first["text"]) == {"path": "/users"}
+    assert "base64" in json.loads(lines[2])
+    assert areq.Cassette.load(tmp_path / "api.jsonl") == recorder.cassette
+
+
+@pytest.mark.asyncio
+async def test_requests_are_matched_on_body(tmp_path):
+    path = tmp_path / "api.jsonl"
+    await record(path)
+    replay = areq.ReplayTransport(path, match_body=True)
+
+    async with areq.Session(transport=replay) as session:
+        b = await session.post(f"{TEST_URL}/users", json={"name": "b"})
+        a = await session.post(f"{TEST_URL}/users", json={"name": "a"})
+        with pytest.raises(UnmatchedRequestError):
+            await session.post(f"{TEST_URL}/users", json={"name": "c"})
+
+    assert (a.json(), b.json()) == ({"echo": {"name": "a"}}, {"echo": {"name": "b"}})
+
+
+@pytest.mark.asyncio
+async def test_exchanges_are_replayed_in_order(tmp_path):
+    path = tmp_path / "api.jsonl"
+    await record(path)
+
+    async with areq.Session(transport=areq.ReplayTransport(path)) as session:
+        names = [
+            (await session.post(f"{TEST_URL}/users", json={})).json()["echo"]["name"]
+            for _ in range(3)
+        ]
+    assert names == ["a", "b", "a"]
+
+    replay = areq.ReplayTransport(path, repeat=False)
+    async with areq.Session(transport=replay) as session:
+        await session.get(f"{TEST_URL}/users")
+        with pytest.raises(
+            UnmatchedRequestError, match="GET https://api.example.com/users"
+        ):
+            await session.get(f"{TEST_URL}/users")
+    assert replay.replayed == 1
+
+
+@pytest.mark.asyncio
+async def test_latency_simulation(tmp_path):
+    cassette = areq.Cassette(
+        tmp_path / "api.jsonl",
+        [areq.Exchange("GET", f"{TEST_URL}/slow", 200, [], b"ok", elapsed=0.1)],
+    )
+
+    async with areq.Session(transport=areq.ReplayTransport(cassette)) as session:
+        start = time.monotonic()
+        await session.get(f"{TEST_URL}/slow")
+        assert time.monotonic() - start < 0.05
+
+    replay = areq.ReplayTransport(cassette, latency=0.5)
+    async with areq.Session(transport=replay) as session:
+        start = time.monotonic()
+        await session.get(f"{TEST_URL}/slow")
+        assert time.monotonic() - start >= 0.05
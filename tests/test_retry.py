@@ -0,0 +1,128 @@
+import email.utils
+import time
+
+import httpx
+import pytest
+
+import areq
+
+TEST_URL = "https://example.com"
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("areq.retry.asyncio.sleep", fake_sleep)
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors(httpx_mock, no_sleep):
+    httpx_mock.add_exception(httpx.ReadTimeout("slow"))
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    httpx_mock.add_response(json={"ok": True})
+
+    response = await areq.get(TEST_URL, retries=areq.Retry(3, jitter=False))
+
+    assert response.json() == {"ok": True}
+    assert no_sleep == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_total(httpx_mock, no_sleep):
+    httpx_mock.add_exception(httpx.ReadTimeout("slow"), is_reusable=True)
+
+    with pytest.raises(areq.AreqReadTimeout):
+        await areq.get(TEST_URL, retries=2)
+
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_methods_only_retry_unsent_requests(httpx_mock, no_sleep):
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    httpx_mock.add_exception(httpx.ReadTimeout("slow"))
+
+    with pytest.raises(areq.AreqReadTimeout):
+        await areq.post(TEST_URL, json={}, retries=3)
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_ssl_errors_are_not_retried(httpx_mock, no_sleep):
+    httpx_mock.add_exception(httpx.ConnectError("[SSL: CERTIFICATE_VERIFY_FAILED]"))
+
+    with pytest.raises(areq.AreqSSLError):
+        await areq.get(TEST_URL, retries=3)
+
+
+@pytest.mark.asyncio
+async def test_retries_status_codes_and_returns_last_response(httpx_mock, no_sleep):
+    httpx_mock.add_response(status_code=502, is_reusable=True)
+
+    response = await areq.get(TEST_URL, retries=areq.Retry(2, backoff_factor=0))
+
+    assert response.status_code == 502
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after(httpx_mock, no_sleep):
+    httpx_mock.add_response(status_code=429, headers={"retry-after": "7"})
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    httpx_mock.add_response(status_code=503, headers={"retry-after": retry_at})
+    httpx_mock.add_response(status_code=200)
+
+    response = await areq.get(TEST_URL, retries=3)
+
+    assert response.status_code == 200
+    assert no_sleep[0] == 7
+    assert 25 < no_sleep[1] <= 30
+
+
+@pytest.mark.asyncio
+async def test_too_long_retry_after_is_not_honoured(httpx_mock, no_sleep):
+    httpx_mock.add_response(status_code=503, headers={"retry-after": "3600"})
+
+    response = await areq.get(TEST_URL, retries=3)
+
+    assert response.status_code == 503
+    assert no_sleep == []
+
+
+@pytest.mark.asyncio
+async def test_session_default_and_per_request_override(httpx_mock, no_sleep):
+    httpx_mock.add_response(status_code=503, is_reusable=True)
+
+    async with areq.Session(retries=areq.Retry(2, backoff_factor=0)) as session:
+        await session.get(TEST_URL)
+        assert len(httpx_mock.get_requests()) == 3
+        await session.get(TEST_URL, retries=0)
+        assert len(httpx_mock.get_requests()) == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_retries(httpx_mock, no_sleep):
+    httpx_mock.add_response(status_code=503, is_reusable=True)
+    retry = areq.Retry(
+        5, backoff_factor=0, budget=areq.RetryBudget(ratio=0, min_retries=3)
+    )
+
+    await areq.get(TEST_URL, retries=retry)
+    await areq.get(TEST_URL, retries=retry)
+
+    # 2 first attempts + 3 retries allowed by the budget.
+    assert len(httpx_mock.get_requests()) == 5
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    retry = areq.Retry(backoff_factor=1, backoff_max=5, jitter=False)
+    assert [retry.get_backoff_time(n) for n in range(1, 5)] == [1, 2, 4, 5]
+
+    retry = areq.Retry(backoff_factor=1, backoff_max=5)
+    assert all(0 <= retry.get_backoff_time(3) <= 4 for _ in range(100))
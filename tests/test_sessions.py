@@ -0,0 +1,161 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+import areq
+
+TEST_URL = "https://example.com"
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_one_client(httpx_mock):
+    httpx_mock.add_response(url=f"{TEST_URL}/a", json={"a": 1})
+    httpx_mock.add_response(url=f"{TEST_URL}/b", json={"b": 2})
+
+    async with areq.Session() as session:
+        client = session.client
+        first = await session.get(f"{TEST_URL}/a")
+        second = await session.get(f"{TEST_URL}/b")
+        assert session.client is client
+
+    assert isinstance(first, areq.AreqResponse)
+    assert first.json() == {"a": 1}
+    assert second.json() == {"b": 2}
+    assert session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_session_default_headers_auth_and_params(httpx_mock):
+    httpx_mock.add_response()
+
+    async with areq.Session(
+        headers={"X-Default": "yes"}, auth=("user", "pass"), params={"k": "v"}
+    ) as session:
+        await session.get(TEST_URL, headers={"X-Extra": "1"})
+
+    sent = httpx_mock.get_request()
+    assert sent.headers["x-default"] == "yes"
+    assert sent.headers["x-extra"] == "1"
+    assert sent.headers["authorization"].startswith("Basic ")
+    assert sent.url.params["k"] == "v"
+
+
+@pytest.mark.asyncio
+async def test_session_persists_cookies(httpx_mock):
+    httpx_mock.add_response(headers={"set-cookie": "token=abc; Path=/"})
+    httpx_mock.add_response()
+
+    async with areq.Session() as session:
+        await session.get(f"{TEST_URL}/login")
+        await session.get(f"{TEST_URL}/me")
+        assert session.cookies["token"] == "abc"
+
+    assert httpx_mock.get_requests()[1].headers["cookie"] == "token=abc"
+
+
+def test_session_pool_limits():
+    session = areq.Session(max_connections=7, max_keepalive_connections=3)
+    pool = session.client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+
+    limits = httpx.Limits(max_connections=2)
+    session = areq.Session(limits=limits)
+    assert session.client._transport._pool._max_connections == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "method", ["get", "options", "head", "post", "put", "patch", "delete"]
+)
+async def test_session_method_wrappers(httpx_mock, method):
+    httpx_mock.add_response(method=method.upper())
+
+    async with areq.Session() as session:
+        response = await getattr(session, method)(TEST_URL)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_session_allow_redirects(httpx_mock):
+    httpx_mock.add_response(
+        url=f"{TEST_URL}/old", status_code=302, headers={"location": f"{TEST_URL}/new"}
+    )
+
+    async with areq.Session() as session:
+        response = await session.get(f"{TEST_URL}/old", allow_redirects=False)
+
+    assert response.status_code == 302
+
+
+@pytest.mark.asyncio
+async def test_session_converts_exceptions(httpx_mock):
+    httpx_mock.add_exception(httpx.ReadTimeout("timed out"))
+
+    async with areq.Session() as session:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            await session.get(TEST_URL)
+
+
+@pytest.mark.asyncio
+async def test_default_session_is_shared(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+
+    session = areq.get_default_session()
+    await asyncio.gather(areq.get(TEST_URL), areq.post(TEST_URL))
+
+    assert areq.get_default_session() is session
+
+
+def test_default_sessions_are_closed_with_their_loop(httpx_mock):
+    httpx_mock.add_response()
+
+    async def main():
+        await areq.get(TEST_URL)
+        return areq.get_default_session()
+
+    assert asyncio.run(main()).is_closed
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_the_default_sessions(httpx_mock):
+    session = areq.get_default_session()
+
+    await areq.aclose()
+
+    assert session.is_closed
+    assert areq.get_default_session() is not session
+
+
+@pytest.mark.asyncio
+async def test_default_session_does_not_keep_cookies(httpx_mock):
+    httpx_mock.add_response(headers={"set-cookie": "token=abc; Path=/"})
+    httpx_mock.add_response()
+
+    await areq.get(f"{TEST_URL}/login")
+    await areq.get(f"{TEST_URL}/me", cookies={"explicit": "1"})
+
+    assert httpx_mock.get_requests()[1].headers["cookie"] == "explicit=1"
+
+
+@pytest.mark.asyncio
+async def test_http2_default_session(httpx_mock):
+    pytest.importorskip("h2")
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(200, extensions={"http_version": b"HTTP/2"})
+    )
+
+    response = await areq.get(TEST_URL, http2=True)
+
+    assert response.http_version == "HTTP/2"
+    session = areq.get_default_session(http2=True)
+    assert session is not areq.get_default_session()
+    assert session.client._transport._pool._http2 is True
+
+
+def test_http_version_of_response():
+    httpx_response = httpx.Response(200, request=httpx.Request("GET", TEST_URL))
+    assert areq.AreqResponse(httpx_response).http_version == "HTTP/1.1"
@@ -0,0 +1,130 @@
+import httpx
+import pytest
+import requests
+from pytest_httpx import IteratorStream
+
+import areq
+
+TEST_URL = "https://example.com/stream"
+
+
+@pytest.mark.asyncio
+async def test_stream_is_not_buffered(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"abc", b"def"]))
+
+    response = await areq.get(TEST_URL, stream=True)
+    assert response.status_code == 200
+    with pytest.raises(RuntimeError):
+        response.content
+
+    chunks = [chunk async for chunk in response.iter_content(chunk_size=None)]
+    assert b"".join(chunks) == b"abcdef"
+    assert response.httpx_response.is_closed
+
+    with pytest.raises(RuntimeError, match="already consumed"):
+        response.content
+
+
+@pytest.mark.asyncio
+async def test_stream_iter_content_chunk_size(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"abcde", b"fgh"]))
+
+    async with areq.Session() as session:
+        async with await session.get(TEST_URL, stream=True) as response:
+            chunks = [chunk async for chunk in response.iter_content(chunk_size=3)]
+
+    assert chunks == [b"abc", b"def", b"gh"]
+
+
+@pytest.mark.asyncio
+async def test_stream_iter_lines(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"one\ntw", b"o\nthree"]))
+
+    response = await areq.get(TEST_URL, stream=True)
+    lines = [line async for line in response.iter_lines()]
+
+    assert lines == [b"one", b"two", b"three"]
+
+
+@pytest.mark.asyncio
+async def test_stream_iter_content_decode_unicode(httpx_mock):
+    data = "héllo wörld".encode("utf-8")
+    httpx_mock.add_response(
+        stream=IteratorStream([data[:2], data[2:]]),
+        headers={"content-type": "text/plain; charset=utf-8"},
+    )
+
+    response = await areq.get(TEST_URL, stream=True)
+    text = "".join(
+        [chunk async for chunk in response.iter_content(decode_unicode=True)]
+    )
+
+    assert text == "héllo wörld"
+
+
+@pytest.mark.asyncio
+async def test_stream_aread(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b'{"a": ', b"1}"]))
+
+    response = await areq.get(TEST_URL, stream=True)
+    assert await response.aread() == b'{"a": 1}'
+    assert response.json() == {"a": 1}
+    assert [chunk async for chunk in response.iter_content(4)] == [b'{"a"', b": 1}"]
+
+
+@pytest.mark.asyncio
+async def test_stream_aclose_releases_connection(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"abc"]))
+
+    response = await areq.get(TEST_URL, stream=True)
+    await response.aclose()
+    assert response.httpx_response.is_closed
+    response.close()  # no-op for streamed responses
+
+
+@pytest.mark.asyncio
+async def test_buffered_response_iter_content():
+    httpx_response = httpx.Response(
+        status_code=200,
+        content=b"line1\nline2",
+        request=httpx.Request("GET", TEST_URL),
+    )
+    response = areq.AreqResponse(httpx_response)
+
+    assert [c async for c in response.iter_content(6)] == [b"line1\n", b"line2"]
+    assert [line async for line in response.iter_lines()] == [b"line1", b"line2"]
+    assert [c async for c in response] == [b"line1\nline2"]
+
+
+@pytest.mark.asyncio
+async def test_stream_iter_ndjson(httpx_mock):
+    httpx_mock.add_response(
+        stream=IteratorStream([b'{"id": 1}\n{"id"', b": 2}\r\n\n[3", b"]"])
+    )
+
+    response = await areq.get(TEST_URL, stream=True)
+    documents = [document async for document in response.iter_ndjson()]
+
+    assert documents == [{"id": 1}, {"id": 2}, [3]]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_accepts_what_the_standard_library_does(httpx_mock):
+    httpx_mock.add_response(content=b'{"id": 18446744073709551616}\n[Infinity]\n')
+
+    response = await areq.get(TEST_URL)
+    documents = [document async for document in response.iter_ndjson()]
+
+    assert documents == [{"id": 2**64}, [float("inf")]]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_invalid_line(httpx_mock):
+    httpx_mock.add_response(content=b'{"id": 1}\nnot json\n')
+
+    response = await areq.get(TEST_URL)
+    documents = []
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        async for document in response.iter_ndjson():
+            documents.append(document)
+    assert documents == [{"id": 1}]
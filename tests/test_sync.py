@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from pytest_httpx import IteratorStream
+
+import areq
+import areq.sync
+from utils import LocalServer
+
+TEST_URL = "https://example.com"
+
+
+@pytest.fixture
+def local_server():
+    # The server must live on the loop the sync API dispatches to.
+    server = areq.sync.run(LocalServer(body=b"hello").__aenter__())
+    yield server
+    areq.sync.run(server.__aexit__(None, None, None))
+
+
+def test_get(httpx_mock):
+    httpx_mock.add_response(json={"ok": True})
+
+    response = areq.sync.get(TEST_URL, params={"q": 1})
+
+    assert isinstance(response, areq.AreqResponse)
+    assert response.json() == {"ok": True}
+    assert httpx_mock.get_requests()[0].url == "https://example.com?q=1"
+
+
+def test_connections_are_reused(local_server):
+    for _ in range(3):
+        assert areq.sync.get(local_server.url).content == b"hello"
+
+    assert local_server.connections == 1
+
+
+def test_session(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+
+    with areq.sync.Session(headers={"X-Token": "t"}) as session:
+        session.headers["X-Extra"] = "e"
+        session.post(TEST_URL, json={"a": 1})
+        session.delete(TEST_URL)
+
+    assert session.async_session.is_closed
+    for request in httpx_mock.get_requests():
+        assert request.headers["x-token"] == "t"
+        assert request.headers["x-extra"] == "e"
+
+
+def test_streamed_response_iterates_synchronously(httpx_mock):
+    httpx_mock.add_response(stream=IteratorStream([b"line 1\nli", b"ne 2\n"]))
+
+    with areq.sync.get(TEST_URL, stream=True) as response:
+        assert list(response.iter_lines()) == [b"line 1", b"line 2"]
+
+
+def test_buffered_response_iterates_synchronously(httpx_mock):
+    httpx_mock.add_response(content=b"abcdef")
+
+    response = areq.sync.get(TEST_URL)
+
+    assert list(response.iter_content(4)) == [b"abcd", b"ef"]
+    assert list(response) == [b"abcdef"]
+
+
+def test_map_runs_concurrently(httpx_mock):
+    in_flight = peak = 0
+
+    async def respond(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, text=request.url.path)
+
+    httpx_mock.add_callback(respond, is_reusable=True)
+
+    results = areq.sync.map([f"{TEST_URL}/{i}" for i in range(10)], concurrency=5)
+
+    assert [result.text for result in results] == [f"/{i}" for i in range(10)]
+    assert peak == 5
+
+
+def test_errors_are_raised(httpx_mock):
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+
+    with pytest.raises(areq.AreqConnectionError):
+        areq.sync.get(TEST_URL)
+
+
+def test_calls_from_the_loop_are_rejected():
+    async def nested():
+        areq.sync.get(TEST_URL)
+
+    with pytest.raises(RuntimeError, match="own event loop"):
+        areq.sync.run(nested())
+
+
+def test_calls_from_many_threads(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+    statuses = []
+
+    def worker():
+        statuses.append(areq.sync.get(TEST_URL).status_code)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * 8
@@ -0,0 +1,176 @@
+import email.parser
+import io
+
+import httpx
+import pytest
+
+import areq
+from areq.uploads import FileStream, MultipartStream
+
+TEST_URL = "https://example.com/upload"
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+def parse_multipart(request):
+    message = email.parser.BytesParser().parsebytes(
+        b"Content-Type: "
+        + request.headers["content-type"].encode()
+        + b"\r\n\r\n"
+        + request.content
+    )
+    return {
+        part.get_param("name", header="content-disposition"): (
+            part.get_filename(),
+            part.get_content_type(),
+            part.get_payload(decode=True),
+        )
+        for part in message.get_payload()
+    }
+
+
+@pytest.mark.asyncio
+async def test_file_is_streamed_with_content_length(httpx_mock, tmp_path):
+    httpx_mock.add_response()
+    path = tmp_path / "payload.bin"
+    path.write_bytes(PAYLOAD)
+
+    with open(path, "rb") as f:
+        await areq.put(TEST_URL, data=f)
+
+    request = httpx_mock.get_requests()[0]
+    assert request.content == PAYLOAD
+    assert request.headers["content-length"] == str(len(PAYLOAD))
+    assert "transfer-encoding" not in request.headers
+
+
+@pytest.mark.asyncio
+async def test_generators_are_sent_chunked(httpx_mock):
+    httpx_mock.add_response(is_reusable=True)
+
+    def chunks():
+        yield b"hello "
+        yield "world"
+
+    async def achunks():
+        yield b"hello "
+        yield b"world"
+
+    await areq.post(TEST_URL, data=chunks())
+    await areq.post(TEST_URL, data=achunks())
+
+    for request in httpx_mock.get_requests():
+        assert request.content == b"hello world"
+        assert request.headers["transfer-encoding"] == "chunked"
+        assert "content-length" not in request.headers
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [b"raw", bytearray(b"raw"), memoryview(b"raw")])
+async def test_raw_bytes_are_sent_as_content(httpx_mock, data):
+    httpx_mock.add_response()
+
+    await areq.post(TEST_URL, data=data)
+
+    request = httpx_mock.get_requests()[0]
+    assert request.content == b"raw"
+    assert request.headers["content-length"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_pairs_are_form_encoded_in_order(httpx_mock):
+    httpx_mock.add_response()
+
+    await areq.post(TEST_URL, data=[("a", "1"), ("b", "2"), ("a", "3")])
+
+    request = httpx_mock.get_requests()[0]
+    assert request.content == b"a=1&b=2&a=3"
+    assert request.headers["content-type"] == "application/x-www-form-urlencoded"
+
+
+def test_encode_upload_rejects_non_streams():
+    with pytest.raises(TypeError, match="Cannot stream a bytes body"):
+        areq.uploads.encode_upload(b"raw", None)
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload(httpx_mock, tmp_path):
+    httpx_mock.add_response()
+    path = tmp_path / "report.csv"
+    path.write_bytes(PAYLOAD)
+
+    with open(path, "rb") as f:
+        await areq.post(
+            TEST_URL,
+            data={"kind": "daily", "tags": ["a", "b"]},
+            files={"report": f, "notes": ("notes.txt", b"n", "text/plain")},
+        )
+
+    request = httpx_mock.get_requests()[0]
+    assert request.headers["content-length"] == str(len(request.content))
+    parts = parse_multipart(request)
+    assert parts["kind"] == (None, "text/plain", b"daily")
+    assert parts["report"] == ("report.csv", "text/csv", PAYLOAD)
+    assert parts["notes"] == ("notes.txt", "text/plain", b"n")
+
+
+@pytest.mark.asyncio
+async def test_multipart_with_generator_is_chunked(httpx_mock):
+    httpx_mock.add_response()
+
+    async def chunks():
+        yield b"x" * 10
+        yield b"y" * 10
+
+    await areq.post(TEST_URL, files={"blob": ("blob.bin", chunks())})
+
+    request = httpx_mock.get_requests()[0]
+    assert request.headers["transfer-encoding"] == "chunked"
+    assert parse_multipart(request)["blob"] == (
+        "blob.bin",
+        "application/octet-stream",
+        b"x" * 10 + b"y" * 10,
+    )
+
+
+@pytest.mark.asyncio
+async def test_explicit_content_type_is_kept(httpx_mock):
+    httpx_mock.add_response()
+
+    await areq.put(
+        TEST_URL, data=io.BytesIO(b"{}"), headers={"Content-Type": "application/json"}
+    )
+
+    request = httpx_mock.get_requests()[0]
+    assert request.headers["content-type"] == "application/json"
+    assert request.headers["content-length"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_generators_are_not_retried(httpx_mock):
+    httpx_mock.add_response(status_code=503)
+    retry = areq.Retry(total=2, backoff_factor=0, status_forcelist=[503])
+
+    response = await areq.put(TEST_URL, data=iter([b"once"]), retries=retry)
+
+    assert response.status_code == 503
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_seekable_files_are_replayed():
+    stream = FileStream(io.BytesIO(b"0123456789"), chunk_size=4)
+
+    assert stream.size == 10
+    assert [chunk async for chunk in stream] == [b"0123", b"4567", b"89"]
+    assert b"".join([chunk async for chunk in stream]) == b"0123456789"
+
+
+@pytest.mark.asyncio
+async def test_unseekable_stream_is_sent_once():
+    stream = MultipartStream(None, {"f": iter([b"a"])})
+
+    assert stream.size is None and not stream.replayable
+    assert b"a" in b"".join([chunk async for chunk in stream])
+    with pytest.raises(httpx.StreamConsumed):
+        async for _ in stream:
+            pass
@@ -1,3 +1,6 @@
+import asyncio
+
+
 def assert_headers_equal(headers1, headers2):
     assert len(headers1) == len(headers2)
 
@@ -16,3 +19,115 @@ def assert_headers_equal(headers1, headers2):
 
 def _normalize_headers(headers):
     return {key.lower(): value for key, value in headers.items()}
+
+
+class FakeClock:
+    """
+    Stands in for the ``_monotonic`` clock, and the ``_sleep`` where there is
+    one, of the given areq modules. Sleeping advances the clock at once; use
+    ``park`` as the sleep to run concurrent sleepers in virtual time instead.
+
+    Usage:
+        @pytest.fixture
+        def clock(monkeypatch):
+            return FakeClock.install(monkeypatch, areq.ratelimit)
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self._parked = []
+
+    @classmethod
+    def install(cls, monkeypatch, *modules):
+        clock = cls()
+        for module in modules:
+            monkeypatch.setattr(module, "_monotonic", clock.monotonic)
+            if hasattr(module, "_sleep"):
+                monkeypatch.setattr(module, "_sleep", clock.sleep)
+        return clock
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(round(delay, 6))
+        self.now += delay
+
+    async def park(self, delay):
+        """Sleeps until advance() moves the clock past ``delay``."""
+        self.sleeps.append(round(delay, 6))
+        wake = asyncio.get_running_loop().create_future()
+        self._parked.append((self.now + delay, len(self.sleeps), wake))
+        await wake
+
+    async def advance(self):
+        """
+        Lets runnable tasks settle, then wakes the earliest parked sleeper.
+        Returns False when nothing is parked.
+        """
+        for _ in range(5):
+            await asyncio.sleep(0)
+        if not self._parked:
+            return False
+        self._parked.sort(key=lambda parked: parked[:2])
+        when, _, wake = self._parked.pop(0)
+        self.now = max(self.now, when)
+        wake.set_result(None)
+        return True
+
+
+class LocalServer:
+    """
+    Minimal keep-alive HTTP/1.1 server for tests that need a real connection,
+    e.g. to observe httpcore's trace events, which the httpx mock bypasses.
+
+    Usage:
+        async with LocalServer(body=b"hello") as server:
+            await areq.get(server.url)
+    """
+
+    def __init__(self, status=200, body=b"ok", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.connections = 0
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._on_connection, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _on_connection(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                length = 0
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                headers = {"content-length": str(len(self.body)), **self.headers}
+                response = f"HTTP/1.1 {self.status} OK\r\n" + "".join(
+                    f"{name}: {value}\r\n" for name, value in headers.items()
+                )
+                body = b"" if lines[0].startswith("HEAD ") else self.body
+                writer.write(response.encode("latin-1") + b"\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()